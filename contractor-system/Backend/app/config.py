@@ -24,6 +24,43 @@ class Settings(BaseSettings):
     SUPABASE_KEY: str
     SUPABASE_SERVICE_KEY: str
     SUPABASE_JWT_SECRET: str = ""  # JWT Secret for local token validation (optional - falls back to remote validation if not set)
+    SUPABASE_JWKS_URL: str = ""  # JWKS for ES256/RS256 tokens (URL or file path; defaults to the project's Auth JWKS endpoint)
+    JWKS_CACHE_TTL: int = 600  # Seconds before the JWKS is refreshed in the background
+    TOKEN_CACHE_SIZE: int = 2048  # Max verified tokens kept in memory (LRU)
+    REMOTE_TOKEN_CACHE_TTL: int = 300  # Seconds a remotely validated token is trusted without re-checking
+    REJECTED_TOKEN_CACHE_TTL: int = 30  # Seconds a token rejected by Supabase Auth stays rejected
+
+    # Server-side sessions (opaque ids exchanged for a verified Supabase token)
+    SESSIONS_ENABLED: bool = True  # Set to false when running more than one worker
+    SESSION_TTL: int = 3600  # Max session lifetime in seconds (also capped at the token's exp)
+    SESSION_STORE_SIZE: int = 10000  # Max sessions kept in memory (LRU)
+    # Sessions are kept in process memory, so only one worker may issue them: the first to lock this file
+    # (default: <tempdir>/contractor-api-sessions-<hash of SUPABASE_URL and PORT>.lock, one per instance)
+    # does, any other worker logs a warning and refuses POST /api/auth/session with a 503
+    SESSION_LOCK_FILE: str = ""
+
+    # User profile cache (rows carry the whole pricebook, ~50KB each)
+    PROFILE_CACHE_SIZE: int = 500  # Max profiles kept in memory (LRU)
+    PROFILE_CACHE_TTL: int = 120  # Seconds before a cached profile is re-read
+
+    # Serve trusted database rows (quotes, pricebook) with orjson, skipping response_model re-validation.
+    # Off unless the deployment sets FAST_JSON_RESPONSES=true in its environment / .env; measure the
+    # difference with `python -m app.scripts.benchmark_json_responses`
+    FAST_JSON_RESPONSES: bool = False
+
+    # Background re-pricing of draft quotes after pricebook changes
+    REPRICE_BATCH_SIZE: int = 100  # Draft quotes read, re-priced and written back per round trip
+
+    # Quote PDFs (rendered in worker processes, cached by quote id + updated_at)
+    PDF_WORKERS: int = 2  # Render processes
+    PDF_CACHE_SIZE: int = 500  # Max cached PDFs
+    PDF_CACHE_MAX_BYTES: int = 67108864  # 64MB total
+    PDF_CACHE_TTL: int = 86400  # Seconds (entries for old versions age out)
+
+    # Response compression (brotli when installed, else gzip; negotiated via Accept-Encoding)
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Bodies smaller than this (bytes) are sent uncompressed
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11; 4 is close to gzip -6 in speed with a better ratio
 
     # JWT
     JWT_SECRET: str
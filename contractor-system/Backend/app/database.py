@@ -1,4 +1,5 @@
 from supabase import create_client, Client
+from postgrest import AsyncPostgrestClient
 from app.config import settings
 import httpx
 import os
@@ -97,6 +98,50 @@ http_async_client = httpx.AsyncClient(
 )
 
 
+class PooledAsyncPostgrestClient(AsyncPostgrestClient):
+    """Async PostgREST client backed by a pooled HTTP/1.1 httpx session
+
+    The stock client opens an HTTP/2 session with default limits. We need the same
+    HTTP/2 workaround as the sync clients above, and a pool large enough for a single
+    worker to keep many Supabase round trips in flight at once.
+    """
+
+    def create_session(self, base_url, headers, timeout, verify=True) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            verify=verify,
+            http2=False,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=50,
+                max_connections=100,
+                keepalive_expiry=30.0
+            )
+        )
+
+
+def _create_async_postgrest(api_key: str) -> PooledAsyncPostgrestClient:
+    """Create an async PostgREST client authenticated with the given Supabase key"""
+    return PooledAsyncPostgrestClient(
+        f"{settings.SUPABASE_URL}/rest/v1",
+        headers={
+            "apiKey": api_key,
+            "Authorization": f"Bearer {api_key}"
+        },
+        timeout=30.0
+    )
+
+
+# Async PostgREST clients used by the repository layer (app/repositories)
+# Routers await these so a slow query no longer blocks the event loop
+async_supabase = _create_async_postgrest(settings.SUPABASE_KEY)
+async_supabase_admin = _create_async_postgrest(settings.SUPABASE_SERVICE_KEY)
+
+logger.info("✅ Created pooled async PostgREST clients (http2=False)")
+
+
 def get_supabase() -> Client:
     """Dependency for getting Supabase client"""
     return supabase
@@ -107,6 +152,16 @@ def get_supabase_admin() -> Client:
     return supabase_admin
 
 
+def get_async_supabase() -> AsyncPostgrestClient:
+    """Dependency for getting the async PostgREST client"""
+    return async_supabase
+
+
+def get_async_supabase_admin() -> AsyncPostgrestClient:
+    """Dependency for getting the async PostgREST admin client (bypasses RLS)"""
+    return async_supabase_admin
+
+
 def get_http_client() -> httpx.Client:
     """Dependency for getting httpx sync client for external API calls"""
     return http_client
@@ -1,7 +1,10 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
+from app.middleware.compression import CompressionMiddleware, ENCODINGS
 from app.middleware.error_handler import setup_exception_handlers
+from app.middleware.sessions import session_store
+from app.repositories.defaults import default_pricebook
 import logging
 
 # Configure logging
@@ -40,6 +43,19 @@ for idx, origin in enumerate(cors_origins):
 logger.info("=" * 60)
 
 
+# Response compression - added BEFORE CORSMiddleware so it sits inside it:
+# the middleware added last wraps the others, so CORS stays the outer layer,
+# answers preflights without touching compression, and adds its headers to
+# compressed responses. HTTPException/validation handlers run inside both, so
+# error bodies are compressed (when large enough) and carry CORS headers.
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
+
 # CRITICAL: Add CORSMiddleware FIRST - before any routers or other middleware
 # This ensures OPTIONS/preflight requests are handled immediately
 logger.info(f"Adding CORSMiddleware with {len(cors_origins)} allowed origins")
@@ -49,8 +65,8 @@ app.add_middleware(
     allow_origins=cors_origins,  # Explicit list - NO wildcards when using credentials
     allow_credentials=True,  # Required for Authorization header
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],  # Explicit methods
-    allow_headers=["Authorization", "Content-Type", "Accept", "Origin", "X-Requested-With"],  # Explicit headers
-    expose_headers=["*"],
+    allow_headers=["Authorization", "Content-Type", "Accept", "Origin", "X-Requested-With", "If-None-Match"],  # Explicit headers
+    expose_headers=["*", "ETag"],  # "*" is not a wildcard for credentialed requests
     max_age=600,  # Cache preflight for 10 minutes
 )
 
@@ -70,7 +86,11 @@ async def startup_event():
     logger.info(f"  CORS Origins: {cors_origins}")
     logger.info(f"  Frontend Origin Check: https://calculatesmartil.netlify.app in list = {('https://calculatesmartil.netlify.app' in cors_origins)}")
     logger.info("  CORS Middleware Order: Added FIRST (runs before all routes)")
+    logger.info(f"  Response Compression: {', '.join(ENCODINGS)} (min {settings.COMPRESSION_MINIMUM_SIZE} bytes)")
     logger.info(f"  Trailing Slash Redirects: DISABLED (redirect_slashes=False)")
+    logger.info(f"  Default Pricebook: v{default_pricebook.version} (shared, loaded once)")
+    session_store.start()
+    logger.info(f"  Session Store: {type(session_store).__name__}{'' if session_store.enabled else ' (disabled)'}")
     logger.info("=" * 60)
 
 
@@ -79,20 +99,25 @@ async def shutdown_event():
     """Cleanup resources on shutdown"""
     logger.info("Shutting down application...")
     # Close httpx clients
-    from app.database import http_client, http_async_client
+    from app.database import http_client, http_async_client, async_supabase, async_supabase_admin
     try:
         http_client.close()
         await http_async_client.aclose()
+        await async_supabase.aclose()
+        await async_supabase_admin.aclose()
         logger.info("HTTP clients closed successfully")
     except Exception as e:
         logger.error(f"Error closing HTTP clients: {e}")
+    # Stop PDF render workers
+    from app.services.pdf_service import shutdown_pool
+    shutdown_pool()
     logger.info("Application shutdown complete")
 
 
 # Import Routers
 from app.routers import (
     auth, quotes, clients, catalog, projects,
-    templates, financial, contractor_pricing, inquiries, demolition
+    templates, financial, contractor_pricing, inquiries, demolition, pricebook, search
 )
 
 # Include Routers AFTER middleware setup
@@ -106,6 +131,8 @@ app.include_router(financial.router, prefix="/api/financial", tags=["Financial"]
 app.include_router(contractor_pricing.router, prefix="/api/contractor-pricing", tags=["Contractor Pricing"])
 app.include_router(inquiries.router, prefix="/api/inquiries", tags=["Inquiries"])
 app.include_router(demolition.router, prefix="/api/demolition", tags=["Demolition"])
+app.include_router(pricebook.router, prefix="/api/pricebook", tags=["Pricebook"])
+app.include_router(search.router, prefix="/api/search", tags=["Search"])
 
 
 @app.get("/")
@@ -127,6 +154,20 @@ async def health_check():
 
 
 
+@app.get("/api/debug/caches")
+async def debug_caches():
+    """In-process cache statistics (size, hits, misses, evictions)"""
+    from app.utils.cache import cache_stats
+    return cache_stats()
+
+
+@app.get("/api/debug/compression")
+async def debug_compression():
+    """Response compression statistics (raw vs compressed bytes per encoding, skips by reason)"""
+    from app.middleware.compression import compression_stats
+    return compression_stats.snapshot()
+
+
 @app.get("/api/debug/cors")
 async def debug_cors(request: Request):
     """Debug endpoint to check CORS configuration (for troubleshooting)
@@ -3,7 +3,13 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from app.config import settings
 from app.database import get_supabase
+from app.middleware.jwks import ASYMMETRIC_ALGORITHMS, jwks_cache
+from app.middleware.sessions import is_session_id, resolve_session
+from app.utils.cache import SingleFlight, TTLCache
+from gotrue.errors import AuthApiError
 from typing import Optional
+import hashlib
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,6 +17,24 @@ logger = logging.getLogger(__name__)
 # Create HTTPBearer instance for token extraction
 security = HTTPBearer(auto_error=False)
 
+# Verified claims by token digest, kept until the token's own `exp`
+# The frontend resends the same token many times a minute, so repeat requests
+# skip the HMAC signature and claim checks entirely
+verified_token_cache = TTLCache("verified_tokens", maxsize=settings.TOKEN_CACHE_SIZE)
+
+# Tokens rejected by Supabase Auth (remote validation only), by digest -> 401 detail
+rejected_token_cache = TTLCache(
+    "rejected_tokens",
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.REJECTED_TOKEN_CACHE_TTL
+)
+_remote_validation = SingleFlight()
+
+
+def _token_digest(token: str) -> bytes:
+    """Cache key for a token - never keep raw bearer tokens in memory as keys"""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
 
 def verify_supabase_token(
     request: Request,
@@ -35,119 +59,199 @@ def verify_supabase_token(
 
     token = credentials.credentials
 
+    # Opaque session id from POST /api/auth/session - a dictionary lookup,
+    # however large the original token's metadata was
+    if is_session_id(token):
+        claims = resolve_session(token)
+        if claims is None:
+            raise _reject("Session expired or revoked. Please log in again.")
+        return claims
+
+    token_key = _token_digest(token)
+
+    cached = verified_token_cache.get(token_key)
+    if cached is not None:
+        return cached
+
+    try:
+        header = jwt.get_unverified_header(token)
+    except JWTError:
+        header = {}
+    algorithm = header.get("alg")
+
+    # Asymmetric signing keys: verify locally against the cached JWKS
+    if algorithm in ASYMMETRIC_ALGORITHMS:
+        key = jwks_cache.get_key(header.get("kid"))
+        if key is not None:
+            return _verify_locally(token, token_key, key, algorithm, request.url.path)
+        # Unknown kid (e.g. keys just rotated) - the JWKS refreshes in the background
+        logger.warning(f"No JWKS key for kid {header.get('kid')}, falling back to remote validation for {request.url.path}")
+        return _verify_remotely(token, token_key, request.url.path)
+
     # Check if SUPABASE_JWT_SECRET is configured for local validation
     if settings.SUPABASE_JWT_SECRET:
         # Use local JWT validation (preferred method - faster and avoids 431 errors)
-        try:
-            logger.debug(f"Using local JWT validation for request to {request.url.path}")
-
-            # Decode and validate JWT token
-            # - Validates signature using SUPABASE_JWT_SECRET
-            # - Validates expiration time (exp claim)
-            # - Validates audience (must be "authenticated" for Supabase auth tokens)
-            payload = jwt.decode(
-                token,
-                settings.SUPABASE_JWT_SECRET,
-                algorithms=["HS256"],
-                audience="authenticated",  # Required for Supabase auth tokens
-                options={
-                    "verify_signature": True,
-                    "verify_exp": True,
-                    "verify_aud": True
-                }
-            )
-
-            # Extract user data from token payload
-            user_id = payload.get("sub")
-            email = payload.get("email")
-            user_metadata = payload.get("user_metadata", {})
-
-            # Validate required claims
-            if not user_id:
-                logger.warning(f"Token missing 'sub' claim for path {request.url.path}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token: missing user ID",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-
-            # Optional: Validate issuer (iss) matches Supabase URL
-            issuer = payload.get("iss")
-            if issuer and not issuer.startswith(settings.SUPABASE_URL):
-                logger.warning(f"Token issuer mismatch: expected {settings.SUPABASE_URL}, got {issuer}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token: issuer mismatch",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-
-            logger.debug(f"Successfully verified token locally for user {user_id} (email: {email})")
-
-            return {
-                "sub": user_id,
-                "email": email,
-                "user_metadata": user_metadata
-            }
-
-        except JWTError as e:
-            # Handle JWT-specific errors with detailed messages
-            error_type = type(e).__name__
-            logger.error(f"Local JWT validation error ({error_type}) for path {request.url.path}: {str(e)}")
-            logger.error(f"Token preview (first 20 chars): {token[:20] if token else 'None'}...")
-
-            # Provide user-friendly error messages based on error type
-            if "expired" in str(e).lower():
-                detail = "Token has expired. Please log in again."
-            elif "signature" in str(e).lower():
-                detail = "Invalid token signature. Please log in again."
-            elif "audience" in str(e).lower():
-                detail = "Invalid token audience. Please log in again."
-            else:
-                detail = "Invalid authentication token. Please log in again."
-
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=detail,
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+        return _verify_locally(token, token_key, settings.SUPABASE_JWT_SECRET, "HS256", request.url.path)
 
     else:
         # Fallback to remote validation via Supabase API (legacy method)
         # This may fail with 431 errors for tokens with large metadata
         logger.warning(f"SUPABASE_JWT_SECRET not configured, falling back to remote validation for {request.url.path}")
-        supabase = get_supabase()
-
-        try:
-            # Get user from Supabase using the token
-            response = supabase.auth.get_user(token)
-
-            if not response or not response.user:
-                logger.warning(f"Remote token verification failed: No user returned from Supabase for path {request.url.path}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid or expired authentication token",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-
-            user = response.user
-            logger.debug(f"Successfully verified token remotely for user {user.id} (email: {user.email})")
-
-            return {
-                "sub": user.id,
-                "email": user.email,
-                "user_metadata": user.user_metadata or {}
+        return _verify_remotely(token, token_key, request.url.path)
+
+
+def _verify_locally(token: str, token_key: bytes, key, algorithm: str, path: str) -> dict:
+    """Verify a token's signature and claims without calling Supabase
+
+    Args:
+        key: SUPABASE_JWT_SECRET for HS256, or the JWK for ES256/RS256
+        algorithm: The only algorithm accepted for this key
+    """
+    if isinstance(key, dict) and key.get("alg", algorithm) != algorithm:
+        logger.warning(f"Token algorithm {algorithm} does not match JWKS key {key.get('kid')} for path {path}")
+        raise _reject("Invalid token signature. Please log in again.")
+
+    try:
+        logger.debug(f"Using local {algorithm} JWT validation for request to {path}")
+
+        # Decode and validate JWT token
+        # - Validates signature using the shared secret or the JWKS public key
+        # - Validates expiration time (exp claim)
+        # - Validates audience (must be "authenticated" for Supabase auth tokens)
+        payload = jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience="authenticated",  # Required for Supabase auth tokens
+            options={
+                "verify_signature": True,
+                "verify_exp": True,
+                "verify_aud": True
             }
+        )
+
+    except JWTError as e:
+        # Handle JWT-specific errors with detailed messages
+        error_type = type(e).__name__
+        logger.error(f"Local JWT validation error ({error_type}) for path {path}: {str(e)}")
+        logger.error(f"Token preview (first 20 chars): {token[:20] if token else 'None'}...")
+
+        # Provide user-friendly error messages based on error type
+        if "expired" in str(e).lower():
+            detail = "Token has expired. Please log in again."
+        elif "signature" in str(e).lower():
+            detail = "Invalid token signature. Please log in again."
+        elif "audience" in str(e).lower():
+            detail = "Invalid token audience. Please log in again."
+        else:
+            detail = "Invalid authentication token. Please log in again."
+
+        raise _reject(detail)
+
+    # Extract user data from token payload
+    user_id = payload.get("sub")
+    email = payload.get("email")
+    user_metadata = payload.get("user_metadata", {})
+
+    # Validate required claims
+    if not user_id:
+        logger.warning(f"Token missing 'sub' claim for path {path}")
+        raise _reject("Invalid token: missing user ID")
+
+    # Optional: Validate issuer (iss) matches Supabase URL
+    issuer = payload.get("iss")
+    if issuer and not issuer.startswith(settings.SUPABASE_URL):
+        logger.warning(f"Token issuer mismatch: expected {settings.SUPABASE_URL}, got {issuer}")
+        raise _reject("Invalid token: issuer mismatch")
+
+    logger.debug(f"Successfully verified token locally for user {user_id} (email: {email})")
+
+    claims = {
+        "sub": user_id,
+        "email": email,
+        "user_metadata": user_metadata
+    }
+
+    # Cache until the token expires (tokens without exp are not cached)
+    exp = payload.get("exp")
+    if exp:
+        verified_token_cache.set(token_key, claims, expires_at=float(exp))
+
+    return claims
+
+
+def _reject(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _verify_remotely(token: str, token_key: bytes, path: str) -> dict:
+    """Validate a token with Supabase Auth, caching the outcome
+
+    Rejections are remembered briefly so a client retrying a bad token doesn't
+    hammer Supabase Auth, and concurrent requests with the same token share one
+    `get_user` call.
+    """
+    detail = rejected_token_cache.get(token_key)
+    if detail is not None:
+        raise _reject(detail)
 
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Remote token verification error for path {request.url.path}: {str(e)}", exc_info=True)
-            logger.error(f"Token preview (first 20 chars): {token[:20] if token else 'None'}...")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Token verification failed: {str(e)}",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+    return _remote_validation.do(token_key, lambda: _fetch_remote_claims(token, token_key, path))
+
+
+def _fetch_remote_claims(token: str, token_key: bytes, path: str) -> dict:
+    # Another request may have finished validating this token just before us
+    cached = verified_token_cache.get(token_key)
+    if cached is not None:
+        return cached
+
+    supabase = get_supabase()
+
+    try:
+        # Get user from Supabase using the token
+        response = supabase.auth.get_user(token)
+    except AuthApiError as e:
+        logger.warning(f"Remote token verification rejected ({e.status}) for path {path}: {e.message}")
+        detail = "Invalid or expired authentication token"
+        if e.status in (401, 403):
+            rejected_token_cache.set(token_key, detail)
+        raise _reject(detail)
+    except Exception as e:
+        # Network/Auth outages are not cached - the next request retries
+        logger.error(f"Remote token verification error for path {path}: {str(e)}", exc_info=True)
+        logger.error(f"Token preview (first 20 chars): {token[:20] if token else 'None'}...")
+        raise _reject(f"Token verification failed: {str(e)}")
+
+    if not response or not response.user:
+        logger.warning(f"Remote token verification failed: No user returned from Supabase for path {path}")
+        detail = "Invalid or expired authentication token"
+        rejected_token_cache.set(token_key, detail)
+        raise _reject(detail)
+
+    user = response.user
+    logger.debug(f"Successfully verified token remotely for user {user.id} (email: {user.email})")
+
+    claims = {
+        "sub": user.id,
+        "email": user.email,
+        "user_metadata": user.user_metadata or {}
+    }
+
+    # Trust the result for a short while (a revoked session is noticed within
+    # REMOTE_TOKEN_CACHE_TTL) and never past the token's own expiry
+    expires_at = time.time() + settings.REMOTE_TOKEN_CACHE_TTL
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+        if exp:
+            expires_at = min(expires_at, float(exp))
+    except JWTError:
+        pass
+    verified_token_cache.set(token_key, claims, expires_at=expires_at)
+
+    return claims
 
 
 def verify_token(
@@ -0,0 +1,265 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Any, Callable, Dict, Optional, Tuple
+import threading
+import zlib
+import logging
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Encodings offered, in order of preference
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Responses worth compressing - PDFs, images and archives (the quote PDF and
+# ZIP export streams) are already compressed and always pass through
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def no_compression(endpoint: Callable) -> Callable:
+    """Route decorator: never compress this endpoint's responses
+
+    For downloads that are large, already compact or streamed to disk by the
+    client (exports, PDFs), where compressing costs more CPU than it saves.
+    Put it below the `@router.<method>(...)` decorator.
+    """
+    endpoint.__no_compression__ = True
+    return endpoint
+
+
+class CompressionStats:
+    """Raw vs compressed byte counters per encoding, for /api/debug/compression"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.encodings: Dict[str, Dict[str, int]] = {}
+        self.skipped: Dict[str, int] = {}
+
+    def record(self, encoding: str, raw: int, compressed: int) -> None:
+        with self._lock:
+            counters = self.encodings.setdefault(encoding, {"responses": 0, "raw_bytes": 0, "compressed_bytes": 0})
+            counters["responses"] += 1
+            counters["raw_bytes"] += raw
+            counters["compressed_bytes"] += compressed
+
+    def skip(self, reason: str) -> None:
+        with self._lock:
+            self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            encodings = {
+                encoding: {
+                    **counters,
+                    "ratio": round(counters["compressed_bytes"] / counters["raw_bytes"], 3) if counters["raw_bytes"] else None,
+                }
+                for encoding, counters in self.encodings.items()
+            }
+            return {"encodings": encodings, "skipped": dict(self.skipped)}
+
+
+compression_stats = CompressionStats()
+
+
+def negotiate(accept_encoding: str, available: Tuple[str, ...]) -> Optional[str]:
+    """Pick the encoding for an Accept-Encoding header (None = send identity)
+
+    Honours q-values (q=0 refuses an encoding) and `*`; on equal q-values the
+    order of `available` (server preference) decides.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Encoder:
+    """Incremental gzip or brotli compressor"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gzip = zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        """Compress a chunk; `flush` pushes everything so far out (for streams)"""
+        if self.encoding == "br":
+            out = self._br.process(data)
+            return out + self._br.flush() if flush else out
+        out = self._gzip.compress(data)
+        return out + self._gzip.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._br.finish()
+        return self._gzip.flush()
+
+
+class CompressionMiddleware:
+    """Negotiated gzip/brotli compression of responses
+
+    - Only compressible content types (JSON, text, ...) at least `minimum_size`
+      bytes long are compressed; smaller bodies go out as-is
+    - Streaming responses are compressed chunk by chunk and flushed per chunk,
+      so clients still get data as it is produced
+    - Responses that already set Content-Encoding, and routes marked with
+      `@no_compression`, pass through untouched
+    - Every other response of a compressible type carries
+      `Vary: Accept-Encoding`, compressed or not, so shared caches never hand
+      an identity copy to a client that accepts compression (or the other way
+      round)
+    - Strong ETags become weak on compressed responses (the bytes differ from
+      the identity representation, the content doesn't)
+
+    Add it before CORSMiddleware, so CORS stays the outer layer and
+    preflights never reach it.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        stats: CompressionStats = compression_stats
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.stats = stats
+        self.encodings: Tuple[str, ...] = ENCODINGS
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        responder = _CompressionResponder(self, scope, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Per-response state: decides on the first body chunk, then compresses or relays"""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, encoding: Optional[str], send: Send):
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self._send = send
+        self.start: Optional[Message] = None
+        self.encoder: Optional[_Encoder] = None
+        self.passthrough = False
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows the body size
+            self.start = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = MutableHeaders(raw=list(self.start["headers"]))
+            reason = self._skip_reason(headers, body, more_body)
+            if reason not in ("route_opt_out", "already_encoded", "content_type"):
+                # Compressible: the representation depends on Accept-Encoding either way
+                headers.add_vary_header("Accept-Encoding")
+                self.start["headers"] = headers.raw
+            if reason:
+                self.passthrough = True
+                self.middleware.stats.skip(reason)
+                await self._send(self.start)
+                await self._send(message)
+                return
+
+            self.encoder = _Encoder(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            headers["Content-Encoding"] = self.encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+
+            if not more_body:
+                # Whole body in one message - compress it and send an exact length
+                compressed = self.encoder.compress(body) + self.encoder.finish()
+                headers["Content-Length"] = str(len(compressed))
+                self.start["headers"] = headers.raw
+                await self._send(self.start)
+                await self._send({"type": "http.response.body", "body": compressed})
+                self._record(len(body), len(compressed), done=True)
+                return
+
+            del headers["Content-Length"]
+            self.start["headers"] = headers.raw
+            await self._send(self.start)
+
+        chunk = self.encoder.compress(body, flush=more_body)
+        if not more_body:
+            chunk += self.encoder.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+        self._record(len(body), len(chunk), done=not more_body)
+
+    def _skip_reason(self, headers: Headers, body: bytes, more_body: bool) -> Optional[str]:
+        # Set by the router by the time the response starts
+        endpoint = self.scope.get("endpoint")
+        if getattr(endpoint, "__no_compression__", False):
+            return "route_opt_out"
+        if "content-encoding" in headers:
+            return "already_encoded"
+        content_type = headers.get("content-type", "").lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return "content_type"
+        if self.encoding is None:
+            return "not_accepted"
+        if not more_body and len(body) < self.middleware.minimum_size:
+            return "below_minimum_size"
+        return None
+
+    def _record(self, raw: int, compressed: int, done: bool) -> None:
+        # Streamed responses are recorded once, when they complete
+        self.raw_bytes += raw
+        self.compressed_bytes += compressed
+        if done:
+            self.middleware.stats.record(self.encoding, self.raw_bytes, self.compressed_bytes)
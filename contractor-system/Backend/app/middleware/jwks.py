@@ -0,0 +1,108 @@
+from app.config import settings
+from typing import Dict, Optional
+import threading
+import time
+import json
+import logging
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Algorithms verified against the JWKS instead of the shared secret
+ASYMMETRIC_ALGORITHMS = ("ES256", "RS256")
+
+
+class JWKSCache:
+    """Signing keys from a JWKS document, indexed by `kid`
+
+    The key set is fetched once (on the first asymmetric token) and then only
+    refreshed in the background - when it is older than `ttl` or a token names
+    a `kid` we don't know yet (key rotation). Lookups never wait on the network
+    after the first load; a token with an unknown `kid` gets None, so the caller
+    can fall back to remote validation until the refresh lands.
+
+    The source is either an http(s) URL or a local file path, which makes it
+    easy to test against a JWKS file.
+    """
+
+    def __init__(self, source: str, ttl: float = 600, min_refresh_interval: float = 30):
+        """
+        Args:
+            source: JWKS URL or path to a JWKS JSON file
+            ttl: Seconds before the key set is refreshed in the background
+            min_refresh_interval: Minimum seconds between fetches, so tokens with
+                made-up kids can't make us hammer the JWKS endpoint
+        """
+        self.source = source
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: Optional[Dict[str, dict]] = None
+        self._loaded_at = 0.0
+        self._last_attempt = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get_key(self, kid: Optional[str]) -> Optional[dict]:
+        """Return the JWK for a key id, or None if it isn't (yet) known"""
+        if self._keys is None:
+            with self._lock:
+                if self._keys is None:
+                    self._load()
+
+        keys = self._keys or {}
+        key = keys.get(kid) if kid else None
+
+        if (kid and key is None) or time.time() - self._loaded_at > self.ttl:
+            self.refresh_in_background()
+
+        return key
+
+    def refresh_in_background(self) -> None:
+        """Start a refresh thread unless one is running or we fetched too recently"""
+        with self._lock:
+            if self._refreshing or time.time() - self._last_attempt < self.min_refresh_interval:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                with self._lock:
+                    self._load()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="jwks-refresh", daemon=True).start()
+
+    def _load(self) -> None:
+        """Fetch the key set (caller holds the lock); keeps old keys on failure"""
+        self._last_attempt = time.time()
+        try:
+            document = self._fetch()
+            keys = {
+                key["kid"]: key
+                for key in document.get("keys", [])
+                if key.get("kid") and key.get("use", "sig") == "sig"
+            }
+            self._keys = keys
+            self._loaded_at = time.time()
+            logger.info(f"Loaded {len(keys)} signing keys from JWKS ({self.source})")
+        except Exception as e:
+            logger.error(f"Failed to load JWKS from {self.source}: {str(e)}")
+            if self._keys is None:
+                self._keys = {}
+
+    def _fetch(self) -> dict:
+        if self.source.startswith(("http://", "https://")):
+            response = httpx.get(self.source, timeout=10)
+            response.raise_for_status()
+            return response.json()
+
+        path = self.source[len("file://"):] if self.source.startswith("file://") else self.source
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+jwks_cache = JWKSCache(
+    settings.SUPABASE_JWKS_URL or f"{settings.SUPABASE_URL}/auth/v1/.well-known/jwks.json",
+    ttl=settings.JWKS_CACHE_TTL
+)
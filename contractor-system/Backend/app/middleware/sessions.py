@@ -0,0 +1,146 @@
+from abc import ABC, abstractmethod
+from app.config import settings
+from app.utils.cache import TTLCache
+from typing import Optional
+import hashlib
+import os
+import secrets
+import tempfile
+import logging
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows (development only); the lock check is skipped
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Session ids are sent as `Authorization: Bearer sess_...` - the prefix tells
+# them apart from Supabase JWTs without any decoding
+SESSION_PREFIX = "sess_"
+
+# user_metadata fields kept in a session; anything else (the bloat that makes
+# tokens ~29KB, see scripts/cleanup_user_metadata_v2.py) stays out of memory
+SESSION_METADATA_FIELDS = ("full_name", "email_verified", "phone", "phone_verified")
+
+
+class SessionStore(ABC):
+    """Where exchanged sessions live
+
+    The default keeps them in process memory, which only works with a single
+    worker (see InMemorySessionStore). Multi-worker deployments need a shared
+    backend (e.g. Redis): subclass this and assign it to `session_store`.
+    """
+
+    # False: no new sessions are issued (POST /api/auth/session answers 503)
+    enabled: bool = True
+
+    def start(self) -> None:
+        """Called once at application startup"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, claims: dict, expires_at: float) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+
+class InMemorySessionStore(SessionStore):
+    """Bounded in-process session store (least recently used sessions are evicted)
+
+    A session created in one worker is unknown to the others, so only one
+    worker may issue them: start() takes an exclusive lock on the lock file,
+    and a worker that finds it held by another process disables sessions
+    for itself (with a warning) instead of failing to boot.
+    """
+
+    def __init__(self, maxsize: int, lock_file: str, enabled: bool = True):
+        self._cache = TTLCache("sessions", maxsize=maxsize)
+        self._lock_file = lock_file
+        self._lock = None
+        self.enabled = enabled
+
+    def start(self) -> None:
+        if not self.enabled or fcntl is None or self._lock is not None:
+            return
+        lock = open(self._lock_file, "w")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            self.enabled = False
+            logger.warning(
+                f"Another API worker holds {self._lock_file}: sessions are disabled in this worker. "
+                "In-memory sessions need a single worker - set SESSIONS_ENABLED=false when running more"
+            )
+            return
+        # Held (open) for the life of the process; the OS releases it on exit
+        self._lock = lock
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._cache.get(key)
+
+    def set(self, key: str, claims: dict, expires_at: float) -> None:
+        self._cache.set(key, claims, expires_at=expires_at)
+
+    def delete(self, key: str) -> None:
+        self._cache.pop(key)
+
+
+def _default_lock_file() -> str:
+    """One lock file per API instance: the workers of one server share it, other
+    instances on the host (another Supabase project or port) don't"""
+    instance = f"{settings.SUPABASE_URL}|{os.environ.get('PORT', '')}"
+    digest = hashlib.sha256(instance.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"contractor-api-sessions-{digest}.lock")
+
+
+session_store: SessionStore = InMemorySessionStore(
+    maxsize=settings.SESSION_STORE_SIZE,
+    lock_file=settings.SESSION_LOCK_FILE or _default_lock_file(),
+    enabled=settings.SESSIONS_ENABLED
+)
+
+
+def is_session_id(token: str) -> bool:
+    return token.startswith(SESSION_PREFIX)
+
+
+def _store_key(session_id: str) -> str:
+    """Sessions are stored by digest so the store never holds usable ids"""
+    return hashlib.sha256(session_id.encode("utf-8")).hexdigest()
+
+
+def create_session(claims: dict, expires_at: float) -> str:
+    """Store verified token claims and return a new opaque session id
+
+    Args:
+        claims: Claims returned by verify_supabase_token
+        expires_at: Absolute epoch expiry (never later than the token's own exp)
+    """
+    metadata = claims.get("user_metadata") or {}
+    session_claims = {
+        "sub": claims["sub"],
+        "email": claims.get("email"),
+        "user_metadata": {k: metadata[k] for k in SESSION_METADATA_FIELDS if k in metadata}
+    }
+
+    session_id = SESSION_PREFIX + secrets.token_urlsafe(32)
+    session_store.set(_store_key(session_id), session_claims, expires_at)
+    logger.debug(f"Created session for user {claims['sub']}")
+    return session_id
+
+
+def resolve_session(session_id: str) -> Optional[dict]:
+    """Return the claims for a session id, or None if unknown or expired"""
+    return session_store.get(_store_key(session_id))
+
+
+def revoke_session(session_id: str) -> None:
+    session_store.delete(_store_key(session_id))
@@ -99,4 +99,5 @@ class CatalogItemResponse(CatalogItemBase):
 class CatalogItemList(BaseModel):
     """Model for catalog item list response"""
     items: List[CatalogItemResponse]
-    total: int
+    total: Optional[int] = None  # None on cursor pages (only the first page is counted)
+    next_cursor: Optional[str] = None
@@ -44,4 +44,5 @@ class ClientResponse(ClientBase):
 class ClientList(BaseModel):
     """Model for client list response"""
     clients: list[ClientResponse]
-    total: int
+    total: Optional[int] = None  # None on cursor pages (only the first page is counted)
+    next_cursor: Optional[str] = None
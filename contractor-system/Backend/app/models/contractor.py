@@ -44,4 +44,5 @@ class ContractorPricingResponse(ContractorPricingBase):
 class ContractorPricingList(BaseModel):
     """Model for contractor pricing list response"""
     pricing: List[ContractorPricingResponse]
-    total: int
+    total: Optional[int] = None  # None on cursor pages (only the first page is counted)
+    next_cursor: Optional[str] = None
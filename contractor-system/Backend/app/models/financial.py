@@ -70,7 +70,8 @@ class FinancialTransactionResponse(FinancialTransactionBase):
 class FinancialTransactionList(BaseModel):
     """Model for financial transaction list response"""
     transactions: List[FinancialTransactionResponse]
-    total: int
+    total: Optional[int] = None  # None on cursor pages (only the first page is counted)
+    next_cursor: Optional[str] = None
 
 
 class FinancialSummary(BaseModel):
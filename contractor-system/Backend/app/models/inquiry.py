@@ -38,4 +38,5 @@ class CustomerInquiryResponse(CustomerInquiryBase):
 class CustomerInquiryList(BaseModel):
     """Model for customer inquiry list response"""
     inquiries: List[CustomerInquiryResponse]
-    total: int
+    total: Optional[int] = None  # None on cursor pages (only the first page is counted)
+    next_cursor: Optional[str] = None
@@ -0,0 +1,92 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List, Dict, Any, Literal
+
+
+class PricebookOp(BaseModel):
+    """One item operation on a pricebook section
+
+    - add: insert `item` (must have an `id`) at `position`, default the end
+    - update: shallow-merge `item` into the item with `id`
+    - remove: delete the item with `id`
+    - reorder: move the item with `id` to `position`, default the end
+    """
+    op: Literal['add', 'update', 'remove', 'reorder']
+    id: Optional[str] = None
+    item: Optional[Dict[str, Any]] = None
+    position: Optional[int] = Field(None, ge=0)
+
+    @model_validator(mode='after')
+    def check_operands(self):
+        if self.op == 'add':
+            if not self.item or not self.item.get('id'):
+                raise ValueError("'add' requires an item with an id")
+        elif not self.id:
+            raise ValueError(f"'{self.op}' requires the id of the item")
+        elif self.op == 'update' and not self.item:
+            raise ValueError("'update' requires the item fields to change")
+        return self
+
+
+class PricebookPatchRequest(BaseModel):
+    """Operations applied in order, atomically (all or nothing)"""
+    ops: List[PricebookOp] = Field(..., min_length=1, max_length=200)
+
+
+class PricebookPatchResponse(BaseModel):
+    """Result of a pricebook patch"""
+    section: str
+    item_count: int
+
+
+class PricebookSection(BaseModel):
+    """A pricebook section with its version (content hash, also sent as ETag)"""
+    version: str
+    items: List[Dict[str, Any]] = Field(default_factory=list)
+    defaults: Dict[str, Any] = Field(default_factory=dict)
+
+
+class UpdatePricebookItemsRequest(BaseModel):
+    """Full replacement of a section's items"""
+    items: List[Dict[str, Any]]
+
+
+class UpdatePricebookDefaultsRequest(BaseModel):
+    """Full replacement of a section's default settings"""
+    defaults: Dict[str, Any]
+
+
+class UpdatePricebookSectionRequest(BaseModel):
+    """Replacement of a section's items and/or default settings in one write"""
+    items: Optional[List[Dict[str, Any]]] = None
+    defaults: Optional[Dict[str, Any]] = None
+
+    @model_validator(mode='after')
+    def check_fields(self):
+        if self.items is None and self.defaults is None:
+            raise ValueError("Send items, defaults or both")
+        return self
+
+
+class RepriceRequest(BaseModel):
+    """Re-price draft quotes from the current pricebook
+
+    Defaults to every re-priceable section; with `item_ids`, only quote items
+    priced from those pricebook items are touched.
+    """
+    sections: Optional[List[str]] = None
+    item_ids: Optional[List[str]] = Field(None, min_length=1, max_length=500)
+
+
+class RepriceJob(BaseModel):
+    """Status of a background re-pricing job"""
+    id: str
+    status: Literal['pending', 'running', 'completed', 'failed']
+    sections: List[str]
+    item_ids: Optional[List[str]] = None
+    scanned: int  # Draft quotes read so far
+    affected: int  # Drafts with re-priced items
+    updated: int  # Drafts written back
+    conflicts: int  # Drafts edited while the job ran (left as saved)
+    error: Optional[str] = None
+    created_at: float
+    finished_at: Optional[float] = None
@@ -58,7 +58,8 @@ class ProjectResponse(ProjectBase):
 class ProjectList(BaseModel):
     """Model for project list response"""
     projects: List[ProjectResponse]
-    total: int
+    total: Optional[int] = None  # None on cursor pages (only the first page is counted)
+    next_cursor: Optional[str] = None
 
 
 class ProjectCostsBase(BaseModel):
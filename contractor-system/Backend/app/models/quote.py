@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime, date
 
 
@@ -240,14 +240,156 @@ class QuoteResponse(BaseModel):
         extra = "allow"
 
 
+# Columns returned by `?fields=summary` - what list pages (QuotesList, SentQuotes) render,
+# without the heavy JSONB columns (items, tiling_items, category_timings, company_info, ...)
+QUOTE_SUMMARY_FIELDS = [
+    "id", "user_id", "quote_number", "title", "status",
+    "created_at", "updated_at", "sent_at", "approved_at", "valid_until",
+    "client_id", "client_name", "client_email", "client_phone",
+    "project_name", "project_address", "project_type",
+    "total_amount", "final_amount", "estimated_cost", "estimated_profit_percent", "discount_percent",
+    "general_start_date", "general_end_date",
+]
+
+
+# JSONB columns that PATCH /api/quotes/{id} operations may target
+QUOTE_JSON_FIELDS = [
+    "items", "additional_costs", "payment_terms", "tiling_items", "tiling_work_types",
+    "category_timings", "project_complexities", "company_info", "category_commitments",
+]
+
+
+def split_pointer(pointer: str) -> List[str]:
+    """Reference tokens of a JSON Pointer (RFC 6901) into a quote's JSONB columns
+
+    `/items/3/quantity` -> ["items", "3", "quantity"]. The pointer must start
+    with one of QUOTE_JSON_FIELDS and point inside it.
+    """
+    if not pointer.startswith("/"):
+        raise ValueError(f"'{pointer}' is not a JSON Pointer")
+    tokens = pointer[1:].split("/")
+    for token in tokens:
+        if "~" in token.replace("~0", "").replace("~1", ""):
+            raise ValueError(f"Invalid escape in '{pointer}'")
+    tokens = [token.replace("~1", "/").replace("~0", "~") for token in tokens]
+    if tokens[0] not in QUOTE_JSON_FIELDS:
+        raise ValueError(f"'{pointer}' is not in a patchable column ({', '.join(QUOTE_JSON_FIELDS)})")
+    if len(tokens) < 2:
+        raise ValueError(f"'{pointer}' must point inside the column - use PUT to replace it whole")
+    return tokens
+
+
+class QuotePatchOp(BaseModel):
+    """One JSON Patch (RFC 6902) operation on a quote's JSONB columns
+
+    Paths start with the column: `/items/3/quantity`, `/items/-` (append),
+    `/project_complexities/additionalCostDetails/0`.
+    """
+    op: Literal['add', 'remove', 'replace', 'move', 'copy', 'test']
+    path: str
+    from_: Optional[str] = Field(None, alias='from')
+    value: Any = None
+
+    @model_validator(mode='after')
+    def check_operands(self):
+        split_pointer(self.path)
+        if self.op in ('add', 'replace', 'test') and 'value' not in self.model_fields_set:
+            raise ValueError(f"'{self.op}' requires a value")
+        if self.op in ('move', 'copy'):
+            if self.from_ is None:
+                raise ValueError(f"'{self.op}' requires from")
+            split_pointer(self.from_)
+        return self
+
+
+class QuotePatchResult(BaseModel):
+    """Result of a quote patch: the new version, and the totals if they were re-derived"""
+    id: str
+    updated_at: Optional[datetime] = None
+    total_amount: Optional[float] = None
+    final_amount: Optional[float] = None
+    discount_percentage: Optional[float] = None
+    discount_amount: Optional[float] = None
+    tax_amount: Optional[float] = None
+    total_cost: Optional[float] = None
+    total_price: Optional[float] = None
+    profit_amount: Optional[float] = None
+    profit_margin: Optional[float] = None
+    estimated_cost: Optional[float] = None
+    estimated_profit_percent: Optional[float] = None
+    estimated_work_days: Optional[float] = None
+
+
+class QuoteCopyRequest(BaseModel):
+    """Fields to set on a quote created by duplication or from a template (the rest is copied)"""
+    title: Optional[str] = None
+    client_id: Optional[str] = None
+    client_name: Optional[str] = None
+    client_email: Optional[str] = None
+    client_phone: Optional[str] = None
+    project_name: Optional[str] = None
+    project_address: Optional[str] = None
+    project_type: Optional[str] = None
+
+
+class QuoteRevision(BaseModel):
+    """One recorded version of a quote (content via /revisions/{revision})"""
+    revision: int
+    kind: Literal['snapshot', 'delta']  # Stored whole, or as a diff against the previous revision
+    changed: List[str] = Field(default_factory=list)  # Columns changed by this revision
+    updated_at: Optional[datetime] = None  # The quote's updated_at at this revision
+    created_at: datetime
+
+
+class QuoteRevisionList(BaseModel):
+    """Paginated revisions of a quote, newest first"""
+    revisions: List[QuoteRevision]
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
 class QuoteList(BaseModel):
     """Model for paginated quote list response"""
     quotes: List[QuoteResponse]
-    total: int
+    total: Optional[int] = None  # None on cursor pages (only the first page is counted)
+    next_cursor: Optional[str] = None
+
+
+class QuotePriceRequest(BaseModel):
+    """Pricing inputs of a quote, for a totals preview (nothing is saved)"""
+    items: List[Dict[str, Any]] = Field(default_factory=list)
+    project_complexities: Dict[str, Any] = Field(default_factory=dict)  # additionalCostDetails = project-level costs
+    discount_percent: Optional[float] = 0
+    price_increase: Optional[float] = 0
+    tax_percentage: Optional[float] = 17  # Israeli VAT
+
+
+class QuotePricing(BaseModel):
+    """Quote totals derived by the server (see pricing_service.price_quote)"""
+    total_amount: float  # Items + additional costs, before adjustments
+    final_amount: float  # After price increase and discount, before VAT
+    discount_percentage: float
+    discount_amount: float
+    tax_amount: float
+    total_cost: float  # Contractor cost
+    total_price: float
+    profit_amount: float
+    profit_margin: float  # Profit as % of contractor cost
+    estimated_cost: float
+    estimated_profit_percent: float
+    estimated_work_days: float
+
+    # Breakdown
+    items_amount: float
+    additional_costs_amount: float
+    price_increase_amount: float
+    total_before_discount: float
+    total_with_tax: float
+    item_count: int
 
 
 class QuoteSummary(BaseModel):
-    """Model for quote summary statistics (for future use)"""
+    """Model for quote summary statistics (GET /api/quotes/summary)"""
     total_quotes: int
     draft_quotes: int
     sent_quotes: int
@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from typing import List
+from app.models.catalog import CatalogItemResponse
+from app.models.client import ClientResponse
+from app.models.quote import QuoteResponse
+
+
+class QuoteSearchHit(QuoteResponse):
+    """A matching quote (summary columns) and its relevance"""
+    rank: float
+
+
+class ClientSearchHit(ClientResponse):
+    """A matching client and its relevance"""
+    rank: float
+
+
+class CatalogSearchHit(CatalogItemResponse):
+    """A matching catalog item and its relevance"""
+    rank: float
+
+
+class QuoteSearchResults(BaseModel):
+    """One page of quote search results, best match first"""
+    results: List[QuoteSearchHit]
+    has_more: bool
+
+
+class ClientSearchResults(BaseModel):
+    """One page of client search results, best match first"""
+    results: List[ClientSearchHit]
+    has_more: bool
+
+
+class CatalogSearchResults(BaseModel):
+    """One page of catalog search results, best match first"""
+    results: List[CatalogSearchHit]
+    has_more: bool
@@ -67,4 +67,5 @@ class QuoteTemplateResponse(QuoteTemplateBase):
 class QuoteTemplateList(BaseModel):
     """Model for quote template list response"""
     templates: List[QuoteTemplateResponse]
-    total: int
+    total: Optional[int] = None  # None on cursor pages (only the first page is counted)
+    next_cursor: Optional[str] = None
@@ -32,6 +32,21 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+# Columns always returned by GET /api/auth/me - identity and role, a few hundred bytes
+PROFILE_CORE_FIELDS = ["id", "auth_user_id", "email", "full_name", "phone", "role", "is_active", "created_at", "updated_at"]
+
+# Opt-in `/me?sections=` groups of heavier columns (pricebook sections are
+# added from the pricebook registry; `all` returns the whole row)
+PROFILE_SECTIONS = {
+    "commitments": ["contract_template", "contractor_commitments", "client_commitments", "category_commitments"],
+    "company": ["company_info"],
+    "quote_settings": [
+        "category_active_map", "tiling_work_types", "default_payment_terms", "additional_cost_defaults",
+        "room_estimates", "custom_paint_types", "custom_plaster_types"
+    ],
+}
+
+
 class UserUpdate(BaseModel):
     """Model for updating user profile"""
     full_name: Optional[str] = None
@@ -46,6 +61,13 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
+class SessionResponse(BaseModel):
+    """Opaque session id exchanged for a Supabase access token"""
+    session_id: str
+    token_type: str = "bearer"
+    expires_at: int  # Unix timestamp
+
+
 class TokenPayload(BaseModel):
     """JWT token payload"""
     sub: str  # user_id
@@ -0,0 +1,32 @@
+"""Async data-access layer for Supabase tables"""
+from app.config import settings
+from app.repositories.base import Repository
+from app.repositories.defaults import default_pricebook
+from app.repositories.profile_cache import ProfileCache
+
+# Tables accessed through the service-role client (ownership filtered by user_id in code)
+quotes_repo = Repository("quotes", admin=True)
+financial_repo = Repository("financial_transactions", admin=True)
+user_profiles_repo = Repository("user_profiles", admin=True)
+quote_revisions_repo = Repository("quote_revisions", admin=True)
+quote_stats_repo = Repository("quote_stats", admin=True)
+
+# Tables accessed through the anon client
+clients_repo = Repository("clients")
+projects_repo = Repository("projects")
+categories_repo = Repository("categories")
+catalog_items_repo = Repository("catalog_items")
+price_ranges_repo = Repository("price_ranges")
+templates_repo = Repository("quote_templates")
+template_items_repo = Repository("template_items")
+inquiries_repo = Repository("customer_inquiries")
+contractor_pricing_repo = Repository("contractor_pricing")
+
+# Shared profile rows (pricebook data) by auth_user_id
+profile_cache = ProfileCache(
+    user_profiles_repo,
+    maxsize=settings.PROFILE_CACHE_SIZE,
+    ttl=settings.PROFILE_CACHE_TTL,
+    resolve=default_pricebook.merge,
+    upgrade=default_pricebook.upgrade
+)
@@ -0,0 +1,119 @@
+from fastapi import HTTPException, status
+from postgrest import AsyncPostgrestClient
+from postgrest._async.request_builder import AsyncRequestBuilder
+from app.database import get_async_supabase, get_async_supabase_admin
+from typing import Any, Dict, List, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Repository:
+    """Async data access for a single Supabase table
+
+    Every call is awaited on the pooled async PostgREST client, so a slow query
+    yields the event loop instead of stalling every other request on the worker.
+    """
+
+    def __init__(self, table_name: str, admin: bool = False):
+        """
+        Args:
+            table_name: PostgREST table name
+            admin: Use the service-role client (bypasses RLS)
+        """
+        self.table_name = table_name
+        self.admin = admin
+
+    @property
+    def client(self) -> AsyncPostgrestClient:
+        return get_async_supabase_admin() if self.admin else get_async_supabase()
+
+    def query(self) -> AsyncRequestBuilder:
+        """Start a query builder on this table for queries the helpers don't cover"""
+        return self.client.table(self.table_name)
+
+    async def find(self, columns: str = "*", **filters: Any) -> List[Dict[str, Any]]:
+        """Select all rows matching the equality filters"""
+        query = self.query().select(columns)
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        response = await query.execute()
+        return response.data
+
+    async def find_one(self, columns: str = "*", **filters: Any) -> Optional[Dict[str, Any]]:
+        """Select the first row matching the equality filters, or None"""
+        query = self.query().select(columns)
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        response = await query.limit(1).execute()
+        return response.data[0] if response.data else None
+
+    async def insert(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], columns: str = "*") -> List[Dict[str, Any]]:
+        """Insert one or many rows and return the created rows
+
+        `columns` limits the returned representation, as for update().
+        """
+        query = self.query().insert(data)
+        if columns != "*":
+            query.params = query.params.set("select", columns)
+        response = await query.execute()
+        return response.data
+
+    async def update(self, data: Dict[str, Any], columns: str = "*", **filters: Any) -> List[Dict[str, Any]]:
+        """Update rows matching the equality filters and return the updated rows
+
+        `columns` limits the returned representation (e.g. "id" when the caller
+        doesn't need the row back).
+        """
+        query = self.query().update(data)
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        if columns != "*":
+            query.params = query.params.set("select", columns)
+        response = await query.execute()
+        return response.data
+
+    async def delete(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Delete rows matching the equality filters and return the deleted rows"""
+        query = self.query().delete()
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        response = await query.execute()
+        return response.data
+
+    async def update_one(
+        self,
+        data: Dict[str, Any],
+        not_found: str = "Not found",
+        columns: str = "*",
+        **filters: Any
+    ) -> Dict[str, Any]:
+        """Conditionally update a single row in one round trip
+
+        The ownership/existence check is part of the UPDATE's filter (e.g.
+        `id=... AND user_id=...`), so there is no separate select and no window
+        for the row to change in between. Zero affected rows means the row
+        doesn't exist or isn't the caller's, and maps to 404.
+        """
+        rows = await self.update(data, columns, **filters)
+        if not rows:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+        return rows[0]
+
+    async def delete_one(self, not_found: str = "Not found", **filters: Any) -> None:
+        """Conditionally delete a single row in one round trip, 404 if nothing matched"""
+        query = self.query().delete()
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        # Only return the key of deleted rows - enough to tell whether anything matched
+        query.params = query.params.set("select", "id")
+        response = await query.execute()
+        if not response.data:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+
+    async def find_one_or_404(self, columns: str = "*", not_found: str = "Not found", **filters: Any) -> Dict[str, Any]:
+        """find_one() that raises 404 when no row matches"""
+        row = await self.find_one(columns, **filters)
+        if not row:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+        return row
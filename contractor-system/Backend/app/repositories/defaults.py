@@ -0,0 +1,173 @@
+from typing import Any, Dict, Optional
+import copy
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Pricebook section -> (items column, defaults column) on user_profiles
+SECTIONS: Dict[str, tuple] = {
+    "plumbing": ("plumbing_subcontractor_items", "plumbing_defaults"),
+    "electrical": ("electrical_subcontractor_items", "electrical_defaults"),
+    "construction": ("construction_subcontractor_items", "construction_defaults"),
+    "demolition": ("demolition_items", "demolition_defaults"),
+    "tiling": ("tiling_items", "tiling_user_defaults"),
+    "paint": ("paint_items", "paint_user_defaults"),
+}
+
+PRICEBOOK_COLUMNS = tuple(column for columns in SECTIONS.values() for column in columns)
+
+# Version of default_user_data.json - bump it when the file gains sections,
+# and record the version each column first appeared in below
+DEFAULTS_VERSION = 2
+
+COLUMN_VERSIONS: Dict[str, int] = {
+    "plumbing_subcontractor_items": 1,
+    "plumbing_defaults": 1,
+    "electrical_subcontractor_items": 1,
+    "electrical_defaults": 1,
+    "construction_subcontractor_items": 1,
+    "construction_defaults": 1,
+    "demolition_items": 2,
+    "demolition_defaults": 2,
+    "tiling_items": 2,
+    "tiling_user_defaults": 2,
+    "paint_items": 2,
+    "paint_user_defaults": 2,
+}
+
+# Values used for columns missing from default_user_data.json (or when the
+# file can't be read)
+FALLBACKS: Dict[str, Any] = {
+    "plumbing_subcontractor_items": [],
+    "plumbing_defaults": {"desiredProfitPercent": 30},
+    "electrical_subcontractor_items": [],
+    "electrical_defaults": {"desiredProfitPercent": 40},
+    "construction_subcontractor_items": [],
+    "construction_defaults": {"desiredProfitPercent": 30, "workerCostPerUnit": 1000},
+    "demolition_items": [],
+    "demolition_defaults": {"laborCostPerDay": 1000, "profitPercent": 40},
+    "tiling_items": [],
+    "tiling_user_defaults": {},
+    "paint_items": [],
+    "paint_user_defaults": {},
+}
+
+DEFAULT_DATA_PATH = os.path.join(os.path.dirname(__file__), "../data/default_user_data.json")
+
+
+class DefaultPricebook:
+    """The shared default pricebook that user profiles inherit from
+
+    Profiles are copy-on-write per column: a pricebook column that is NULL in
+    `user_profiles` means "use the shared default", and `merge()` fills the
+    inherited columns in at read time. New profiles are created with every
+    pricebook column NULL; a column gets the profile's own copy
+    (`materialize()`) the first time it is customised. Clients read and write
+    the pricebook through the API (/api/pricebook, /api/auth/me), never the
+    raw columns.
+
+    The data is read once at startup and must be treated as immutable -
+    `merge()` hands out the shared objects, `materialize()` hands out copies
+    for writing.
+
+    Profiles record the `defaults_version` they were last upgraded to. Profiles
+    from older versions are brought forward lazily the first time they are
+    read (`upgrade()`), instead of by bulk migration scans.
+    """
+
+    def __init__(self, data: Dict[str, Any], version: int = DEFAULTS_VERSION):
+        self._data = {column: data.get(column, FALLBACKS[column]) for column in PRICEBOOK_COLUMNS}
+        self.version = version
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_DATA_PATH) -> "DefaultPricebook":
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            logger.info(f"Loaded default pricebook from {path}")
+        except Exception as e:
+            logger.error(f"Failed to load default pricebook: {e}")
+            # Continue with empty defaults if file is not available
+            data = {}
+        return cls(data)
+
+    def column(self, column: str) -> Optional[Any]:
+        """Shared default value of a pricebook column (do not modify)"""
+        return self._data.get(column)
+
+    def merge(self, profile: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Profile with every inherited (NULL) pricebook column filled from the defaults"""
+        if profile is None:
+            return None
+        merged = dict(profile)
+        for column in PRICEBOOK_COLUMNS:
+            if merged.get(column) is None:
+                merged[column] = self._data[column]
+        return merged
+
+    def materialize(self, column: str) -> Any:
+        """Private copy of a column's default, for a profile about to customise it"""
+        return copy.deepcopy(self._data.get(column))
+
+    def upgrade(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Column updates bringing a stored profile up to this version ({} if current)
+
+        Sections added after the profile's version that it holds only empty
+        values for (rows created before the section existed, or by the old
+        column defaults) get their own copy of the shared default, like a new
+        profile.
+        """
+        if "defaults_version" not in profile:
+            # Column not migrated yet - nothing to record the upgrade in
+            return {}
+
+        current = profile.get("defaults_version") or 0
+        if current >= self.version:
+            return {}
+
+        changes: Dict[str, Any] = {
+            column: self.materialize(column)
+            for column, introduced in COLUMN_VERSIONS.items()
+            if introduced > current and profile.get(column) is not None and not profile[column]
+        }
+        changes["defaults_version"] = self.version
+        return changes
+
+
+def profile_schema_sql() -> str:
+    """Schema the profile code relies on: the `defaults_version` column, and
+    pricebook columns that may be NULL (inherited)
+
+    Part of the default install - registration writes `defaults_version` and
+    NULL pricebook columns.
+    """
+    statements = ["alter table public.user_profiles add column if not exists defaults_version integer;"]
+    for column in PRICEBOOK_COLUMNS:
+        statements.append(f"alter table public.user_profiles alter column {column} drop not null;")
+    return "\n".join(statements)
+
+
+def inherit_sql(pricebook: "DefaultPricebook") -> str:
+    """SQL that lets existing profiles inherit the shared defaults
+
+    Resets columns still identical to the default (every profile created
+    before copy-on-write) to NULL. Set-based, so it is one statement per
+    column rather than a table scan in Python. Needs profile_schema_sql().
+
+    Optional: profiles left with their own copy still work, they just don't
+    pick up later changes to the defaults.
+    """
+    statements = []
+    for column in PRICEBOOK_COLUMNS:
+        value = pricebook.column(column)
+        if value is not None:
+            literal = json.dumps(value, ensure_ascii=False).replace("'", "''")
+            statements.append(
+                f"update public.user_profiles set {column} = null where {column} = '{literal}'::jsonb;"
+            )
+    return "\n".join(statements)
+
+
+default_pricebook = DefaultPricebook.from_file()
@@ -0,0 +1,83 @@
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+from typing import Dict, Iterable, List, Optional, Type
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FieldSelector:
+    """`?fields=` dependency that turns a sparse fieldset into a PostgREST select
+
+    The requested columns are pushed down into the select so heavy JSONB columns
+    are never read or transferred unless asked for. Fields are validated against
+    the response model; the model's required fields (and any `always` columns,
+    e.g. the pagination sort key) are always included so responses stay valid.
+
+    Named projections (e.g. `?fields=summary`) expand to a predefined column list.
+    Embedded resources (e.g. a catalog item's price ranges) are always returned.
+
+    Usage:
+        quote_fields = FieldSelector(QuoteResponse, projections={"summary": [...]})
+
+        async def list_quotes(columns: str = Depends(quote_fields)):
+            query = quotes_repo.query().select(columns)
+
+    Routes using it should set `response_model_exclude_unset=True` so columns that
+    weren't selected are omitted instead of being filled with model defaults.
+    """
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        projections: Optional[Dict[str, List[str]]] = None,
+        always: Iterable[str] = ("id", "created_at"),
+        embeds: Optional[Dict[str, str]] = None
+    ):
+        """
+        Args:
+            model: Response model whose fields may be selected
+            projections: Named column lists selectable by name
+            always: Columns included in every projection
+            embeds: Response field -> PostgREST embedded resource appended to every
+                select (e.g. {"price_ranges": "price_ranges(*)"})
+        """
+        self.embeds = embeds or {}
+        self.allowed = set(model.model_fields) - set(self.embeds)
+        self.required = [
+            name for name, field in model.model_fields.items()
+            if field.is_required() and name not in self.embeds
+        ]
+        self.projections = projections or {}
+        self.always = list(always)
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(
+            None,
+            description="Comma-separated columns to return, or a named projection such as 'summary'"
+        )
+    ) -> str:
+        if not fields:
+            return self._with_embed("*")
+
+        requested: List[str] = []
+        for name in (f.strip() for f in fields.split(",")):
+            if not name:
+                continue
+            if name in self.projections:
+                requested.extend(self.projections[name])
+            elif name in self.allowed:
+                requested.append(name)
+            else:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown field '{name}'"
+                )
+
+        # Keep order stable and drop duplicates
+        columns = list(dict.fromkeys(self.always + self.required + requested))
+        return self._with_embed(",".join(columns))
+
+    def _with_embed(self, columns: str) -> str:
+        return ",".join([columns, *self.embeds.values()])
@@ -0,0 +1,151 @@
+from fastapi import HTTPException, Query, status
+from postgrest.utils import sanitize_param
+from typing import Any, AsyncIterator, Callable, Dict, List, Literal, Optional, Tuple
+from dataclasses import dataclass
+import base64
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+CountMethod = Literal["exact", "planned", "estimated"]
+
+
+class PageParams:
+    """Pagination query parameters shared by all list endpoints
+
+    Use as `page: PageParams = Depends()`.
+
+    - skip/limit: classic offset pagination (kept for backward compatibility)
+    - cursor: opaque keyset cursor returned as `next_cursor` by the previous page;
+      when given, `skip` is ignored and the page is read with an indexed range scan
+    - count: how PostgREST should count the matching rows ("exact", or the cheaper
+      "planned"/"estimated" for very large tables). Only the first page is counted.
+    """
+
+    def __init__(
+        self,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = None,
+        count: CountMethod = Query("exact")
+    ):
+        self.skip = skip
+        self.limit = limit
+        self.cursor = cursor
+        self.count = count
+
+    @property
+    def count_method(self) -> Optional[str]:
+        """Count method to pass to select() - cursor pages skip counting"""
+        return None if self.cursor else self.count
+
+
+@dataclass
+class Page:
+    """One page of rows plus the total count and the cursor for the next page"""
+    items: List[Dict[str, Any]]
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(row: Dict[str, Any], order_column: str) -> str:
+    """Encode the keyset position of a row as an opaque URL-safe cursor"""
+    raw = json.dumps([row.get(order_column), row.get("id")], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, Any]:
+    """Decode a cursor produced by encode_cursor into (order value, id)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if row_id is None:
+            raise ValueError("cursor has no id")
+        return value, row_id
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def _keyset_filter(order_column: str, value: Any, row_id: Any, desc: bool) -> str:
+    """Build the PostgREST `or` filter selecting rows after (value, id)
+
+    Postgres puts NULLs first in descending order and last in ascending order,
+    so rows with a NULL sort value are handled explicitly.
+    """
+    op = "lt" if desc else "gt"
+    row_id = sanitize_param(row_id)
+
+    if value is None:
+        if desc:
+            return f"{order_column}.not.is.null,and({order_column}.is.null,id.{op}.{row_id})"
+        return f"and({order_column}.is.null,id.{op}.{row_id})"
+
+    value = sanitize_param(value)
+    keyset = f"{order_column}.{op}.{value},and({order_column}.eq.{value},id.{op}.{row_id})"
+    if not desc:
+        keyset += f",{order_column}.is.null"
+    return keyset
+
+
+async def paginate(
+    query,
+    page: PageParams,
+    order_column: str = "created_at",
+    desc: bool = True
+) -> Page:
+    """Fetch one page of a select query in a single round trip
+
+    The query must already be a select built with `count=page.count_method`, so
+    the total comes from PostgREST's Content-Range header instead of a second
+    unbounded query. Rows are ordered by (order_column, id), which makes the
+    order stable and lets cursor pages seek directly to their start.
+
+    One extra row is requested to know whether another page exists.
+    """
+    query = query.order(order_column, desc=desc).order("id", desc=desc)
+
+    if page.cursor:
+        value, row_id = decode_cursor(page.cursor)
+        query = query.or_(_keyset_filter(order_column, value, row_id, desc)).limit(page.limit + 1)
+    else:
+        query = query.range(page.skip, page.skip + page.limit)
+
+    response = await query.execute()
+
+    rows = response.data
+    has_more = len(rows) > page.limit
+    rows = rows[:page.limit]
+    next_cursor = encode_cursor(rows[-1], order_column) if has_more else None
+
+    return Page(items=rows, total=response.count, next_cursor=next_cursor)
+
+
+async def iter_pages(
+    build_query: Callable[[], Any],
+    page_size: int = 100,
+    order_column: str = "created_at",
+    desc: bool = True
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield every matching row, one keyset page at a time
+
+    `build_query` returns a fresh (uncounted) select for each page, since query
+    builders can't be reused. Only one page is held in memory, for exports
+    that walk a whole table.
+    """
+    cursor = None
+    while True:
+        page = await paginate(
+            build_query(),
+            PageParams(skip=0, limit=page_size, cursor=cursor, count=None),
+            order_column=order_column,
+            desc=desc
+        )
+        if page.items:
+            yield page.items
+        if not page.next_cursor:
+            return
+        cursor = page.next_cursor
@@ -0,0 +1,225 @@
+from fastapi import HTTPException, status
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+from app.repositories import profile_cache, user_profiles_repo
+from app.repositories.defaults import SECTIONS, default_pricebook
+from typing import Any, Dict, List
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Database function applying item patch operations in place.
+# Install with `python -m app.scripts.install_database_functions` (prints the
+# SQL to run in the Supabase SQL editor). Kept here, next to the code calling
+# it, so the two can't drift apart.
+PRICEBOOK_PATCH_SQL = """
+create or replace function public.pricebook_patch(
+    p_auth_user_id uuid,
+    p_column text,
+    p_ops jsonb
+) returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    items jsonb;
+    op jsonb;
+    idx int;
+    pos int;
+    moved jsonb;
+    found_row boolean;
+begin
+    if p_column not in (
+        'plumbing_subcontractor_items', 'electrical_subcontractor_items',
+        'construction_subcontractor_items', 'demolition_items',
+        'tiling_items', 'paint_items'
+    ) then
+        raise exception 'Unknown pricebook column %', p_column using errcode = '22023';
+    end if;
+
+    -- Lock the row: concurrent patches to the same profile apply one after another
+    execute format(
+        'select %I, true from user_profiles where auth_user_id = $1 for update',
+        p_column
+    ) into items, found_row using p_auth_user_id;
+
+    if found_row is null then
+        raise exception 'User profile not found' using errcode = 'P0002';
+    end if;
+
+    -- NULL = inherited from the shared default pricebook; the caller copies
+    -- the defaults in (once) and retries
+    if items is null then
+        raise exception 'Section % is inherited from the default pricebook', p_column using errcode = '55000';
+    end if;
+
+    for op in select value from jsonb_array_elements(p_ops) loop
+        select e.i - 1 into idx
+        from jsonb_array_elements(items) with ordinality as e(v, i)
+        where e.v->>'id' = coalesce(op->>'id', op->'item'->>'id')
+        limit 1;
+
+        case op->>'op'
+            when 'add' then
+                if idx is not null then
+                    raise exception 'Item % already exists', op->'item'->>'id' using errcode = '23505';
+                end if;
+                moved := op->'item';
+            when 'update' then
+                if idx is null then
+                    raise exception 'Item % not found', op->>'id' using errcode = 'P0002';
+                end if;
+                -- Shallow merge; the id itself never changes
+                items := jsonb_set(
+                    items, array[idx::text],
+                    (items->idx) || (op->'item') || jsonb_build_object('id', items->idx->'id')
+                );
+                continue;
+            when 'remove' then
+                if idx is null then
+                    raise exception 'Item % not found', op->>'id' using errcode = 'P0002';
+                end if;
+                items := items - idx;
+                continue;
+            when 'reorder' then
+                if idx is null then
+                    raise exception 'Item % not found', op->>'id' using errcode = 'P0002';
+                end if;
+                moved := items->idx;
+                items := items - idx;
+            else
+                raise exception 'Unknown operation %', op->>'op' using errcode = '22023';
+        end case;
+
+        -- add/reorder: insert `moved` at `position` (default: the end)
+        pos := least(greatest(coalesce((op->>'position')::int, jsonb_array_length(items)), 0), jsonb_array_length(items));
+        items := coalesce((
+                select jsonb_agg(e.v order by e.i)
+                from jsonb_array_elements(items) with ordinality as e(v, i)
+                where e.i <= pos
+            ), '[]'::jsonb)
+            || jsonb_build_array(moved)
+            || coalesce((
+                select jsonb_agg(e.v order by e.i)
+                from jsonb_array_elements(items) with ordinality as e(v, i)
+                where e.i > pos
+            ), '[]'::jsonb);
+    end loop;
+
+    execute format('update user_profiles set %I = $1 where auth_user_id = $2', p_column)
+    using items, p_auth_user_id;
+
+    return jsonb_build_object('item_count', jsonb_array_length(items));
+end;
+$$;
+
+-- The function takes the user id as an argument, so only the backend's
+-- service-role client may call it
+revoke all on function public.pricebook_patch(uuid, text, jsonb) from public, anon, authenticated;
+grant execute on function public.pricebook_patch(uuid, text, jsonb) to service_role;
+"""
+
+# SQLSTATE raised by pricebook_patch -> HTTP status
+_ERROR_STATUS = {
+    "P0002": status.HTTP_404_NOT_FOUND,
+    "23505": status.HTTP_409_CONFLICT,
+    "22023": status.HTTP_400_BAD_REQUEST,
+}
+
+
+def items_column(section: str) -> str:
+    """Items column for a section name, 404 for unknown sections"""
+    if section not in SECTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown pricebook section '{section}'"
+        )
+    return SECTIONS[section][0]
+
+
+def section_data(profile: Dict[str, Any], section: str) -> Dict[str, Any]:
+    """A section's items and defaults from a profile row"""
+    items_col, defaults_col = SECTIONS[section]
+    return {
+        "items": profile.get(items_col) or [],
+        "defaults": profile.get(defaults_col) or {}
+    }
+
+
+def section_version(profile: Dict[str, Any], section: str) -> str:
+    """Content hash of a section, used as its ETag
+
+    Derived from the data itself, so it changes exactly when the section does -
+    whichever path wrote it (API, frontend, scripts).
+    """
+    canonical = json.dumps(section_data(profile, section), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def version_vector(profile: Dict[str, Any]) -> Dict[str, str]:
+    """Version of every section"""
+    return {section: section_version(profile, section) for section in SECTIONS}
+
+
+async def read_sections(auth_user_id: str, sections: List[str]) -> Dict[str, Any]:
+    """The columns of `sections`, read from the database rather than profile_cache
+
+    Other workers and the database functions (pricebook_patch) write these
+    columns without touching this process's cache, so a version computed from
+    a cached row could answer 304 (or serve stale items) for up to the cache
+    TTL after a change. Only the sections' columns are selected;
+    inherited ones are filled from the defaults, and a profile still needing a
+    defaults upgrade takes the profile_cache path once to get it written back.
+    """
+    columns = [column for section in sections for column in SECTIONS[section]]
+    row = await user_profiles_repo.find_one_or_404(
+        ",".join(columns + ["defaults_version"]), not_found="User profile not found", auth_user_id=auth_user_id
+    )
+    if (row.get("defaults_version") or 0) < default_pricebook.version:
+        profile_cache.invalidate(auth_user_id)
+        return await profile_cache.get_or_404(auth_user_id)
+    return default_pricebook.merge(row)
+
+
+async def _materialize(auth_user_id: str, column: str) -> None:
+    """Copy the shared default into an inherited column (no-op if already customised)"""
+    await user_profiles_repo.query().update(
+        {column: default_pricebook.materialize(column) or []},
+        returning=ReturnMethod.minimal
+    ).eq("auth_user_id", auth_user_id).is_(column, "null").execute()
+
+
+async def patch_items(auth_user_id: str, section: str, ops: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply item operations to one pricebook section atomically in the database
+
+    Only the operations travel over the wire, never the section's whole array,
+    and the row lock inside pricebook_patch keeps concurrent edits (e.g. two
+    open tabs) from overwriting each other. All operations apply or none do.
+
+    Returns:
+        {"item_count": <items in the section after the patch>}
+    """
+    column = items_column(section)
+    params = {"p_auth_user_id": auth_user_id, "p_column": column, "p_ops": ops}
+
+    try:
+        try:
+            response = await user_profiles_repo.client.rpc("pricebook_patch", params).execute()
+        except APIError as e:
+            if e.code != "55000":
+                raise
+            # First edit of an inherited section: give the profile its own copy
+            await _materialize(auth_user_id, column)
+            response = await user_profiles_repo.client.rpc("pricebook_patch", params).execute()
+    except APIError as e:
+        if e.code in _ERROR_STATUS:
+            raise HTTPException(status_code=_ERROR_STATUS[e.code], detail=e.message)
+        raise
+    finally:
+        # The cached row no longer matches whatever the database did
+        profile_cache.invalidate(auth_user_id)
+
+    return response.data
@@ -0,0 +1,107 @@
+from fastapi import HTTPException, status
+from app.repositories.base import Repository
+from app.utils.cache import TTLCache
+from typing import Any, Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileCache:
+    """Read-through, write-through cache of `user_profiles` rows by auth_user_id
+
+    A profile row carries the user's whole pricebook (~50KB of JSONB with the
+    default data), and the auth service and pricebook routers all read the same
+    row. They share this cache instead of re-selecting it per call.
+
+    Writes made through `update()` refresh the cached row, `invalidate()` drops
+    it. The TTL bounds staleness for writes that bypass the API (other workers,
+    the frontend writing to Supabase directly), and `maxsize` bounds memory
+    (roughly maxsize * 50KB).
+
+    Returned rows are shallow copies passed through `resolve` (e.g. to fill in
+    inherited default pricebook columns); the cache keeps the rows as stored.
+    Rows fetched from the database first go through `upgrade`, which returns
+    the column updates (if any) that bring an outdated row up to date; they are
+    written back once, before the row is cached.
+    """
+
+    def __init__(
+        self,
+        repo: Repository,
+        maxsize: int = 500,
+        ttl: float = 120,
+        resolve: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        upgrade: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+    ):
+        self.repo = repo
+        self.resolve = resolve or dict
+        self.upgrade = upgrade
+        self._cache = TTLCache("user_profiles", maxsize=maxsize, ttl=ttl)
+
+    async def get(self, auth_user_id: str) -> Optional[Dict[str, Any]]:
+        """Return the full profile row, or None if the user has no profile"""
+        row = self._cache.get(auth_user_id)
+        if row is None:
+            row = await self.repo.find_one(auth_user_id=auth_user_id)
+            if row is None:
+                return None
+            row = await self._upgrade(auth_user_id, row)
+            self._cache.set(auth_user_id, row)
+        return self.resolve(row)
+
+    async def _upgrade(self, auth_user_id: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        changes = self.upgrade(row) if self.upgrade else None
+        if not changes:
+            return row
+        try:
+            await self.repo.update(changes, columns="id", auth_user_id=auth_user_id)
+            logger.info(f"Upgraded profile {auth_user_id}: {sorted(changes)}")
+            return {**row, **changes}
+        except Exception as e:
+            # Serve the row as stored; the upgrade is retried on the next read
+            logger.warning(f"Failed to upgrade profile {auth_user_id}: {e}")
+            return row
+
+    def peek(self, auth_user_id: str) -> Optional[Dict[str, Any]]:
+        """The cached profile, or None without going to the database"""
+        row = self._cache.get(auth_user_id)
+        return self.resolve(row) if row is not None else None
+
+    async def get_or_404(self, auth_user_id: str, not_found: str = "User profile not found") -> Dict[str, Any]:
+        row = await self.get(auth_user_id)
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+        return row
+
+    async def update(
+        self,
+        auth_user_id: str,
+        data: Dict[str, Any],
+        not_found: str = "User profile not found",
+        columns: str = "id"
+    ) -> Dict[str, Any]:
+        """Update the profile in one round trip and keep the cache in step
+
+        With the default `columns="id"` only the key comes back over the wire and
+        the written values are merged into the cached row; with `columns="*"` the
+        returned row replaces it.
+        """
+        row = await self.repo.update_one(data, not_found=not_found, columns=columns, auth_user_id=auth_user_id)
+
+        if columns == "*":
+            self.put(row)
+            return self.resolve(row)
+
+        cached = self._cache.get(auth_user_id)
+        if cached is not None:
+            self._cache.set(auth_user_id, {**cached, **data})
+        return row
+
+    def put(self, row: Dict[str, Any]) -> None:
+        """Cache a full row just read or written elsewhere (e.g. after an insert)"""
+        if row and row.get("auth_user_id"):
+            self._cache.set(row["auth_user_id"], dict(row))
+
+    def invalidate(self, auth_user_id: str) -> None:
+        self._cache.pop(auth_user_id)
@@ -0,0 +1,64 @@
+from app.models.quote import QuoteCreate, QUOTE_SUMMARY_FIELDS
+from app.repositories import quotes_repo
+from typing import Any, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Columns a duplicate copies: everything a client can set on create except the
+# status (a copy starts as a draft). Number, timestamps and sent/approved dates
+# come from the defaults and triggers, as for a new quote.
+_COPIED_COLUMNS = [field for field in QuoteCreate.model_fields if field != "status"]
+
+# Database function copying a quote in one statement - the JSONB columns never
+# leave the database. Install with `python -m app.scripts.install_database_functions`.
+#
+# `p_overrides` (title, client and project fields) is laid over the source row
+# with jsonb_populate_record, so the overrides are typed like the columns.
+QUOTES_DUPLICATE_SQL = """
+create or replace function public.quotes_duplicate(
+    p_user_id uuid,
+    p_quote_id uuid,
+    p_overrides jsonb
+) returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    created jsonb;
+begin
+    insert into quotes (user_id, status, {columns})
+    select src.user_id, 'draft', {source_columns}
+      from quotes src,
+           jsonb_populate_record(src, coalesce(p_overrides, '{{}}'::jsonb)) r
+     where src.id = p_quote_id
+       and src.user_id = p_user_id
+    returning to_jsonb(quotes.*) into created;
+
+    if created is null then
+        return null;
+    end if;
+
+    return (
+        select jsonb_object_agg(key, value)
+          from jsonb_each(created)
+         where key = any(array[{summary}])
+    );
+end;
+$$;
+
+revoke all on function public.quotes_duplicate(uuid, uuid, jsonb) from public, anon, authenticated;
+grant execute on function public.quotes_duplicate(uuid, uuid, jsonb) to service_role;
+""".format(
+    columns=", ".join(_COPIED_COLUMNS),
+    source_columns=", ".join(f"r.{column}" for column in _COPIED_COLUMNS),
+    summary=", ".join(f"'{field}'" for field in QUOTE_SUMMARY_FIELDS),
+)
+
+
+async def duplicate(user_id: str, quote_id: str, overrides: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Copy a quote as a new draft; the new quote's summary columns, or None if not found"""
+    params = {"p_user_id": user_id, "p_quote_id": quote_id, "p_overrides": overrides}
+    response = await quotes_repo.client.rpc("quotes_duplicate", params).execute()
+    return response.data
@@ -0,0 +1,258 @@
+from fastapi import HTTPException, status
+from postgrest.exceptions import APIError
+from app.models.quote import QUOTE_JSON_FIELDS, split_pointer
+from app.repositories import quotes_repo
+from app.services import pricing_service
+from typing import Any, Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+# JSONB columns holding arrays (the rest hold objects); NULLs patch as empty
+_ARRAY_FIELDS = {"items", "additional_costs", "payment_terms", "tiling_items", "tiling_work_types"}
+
+# Database functions applying JSON Patch operations to a quote in place.
+# Install with `python -m app.scripts.install_database_functions`.
+#
+# The patchable columns are gathered into one document, the operations are
+# applied to it in order under a row lock, and the columns are written back in
+# the same statement - all operations apply or none do. Paths arrive as text
+# arrays (already unescaped); array indexes are checked strictly here, since
+# Postgres would otherwise accept negative or out-of-range ones.
+#
+# Totals are priced in Python, so a patch touching pricing inputs runs twice:
+# first with p_dry_run to read the patched inputs and the row's updated_at,
+# then with the derived totals in p_set and that updated_at in p_version. The
+# second call writes the patch and the totals in one UPDATE, or raises 40001
+# if the quote was saved in between.
+QUOTES_PATCH_SQL = """
+drop function if exists public.quotes_patch(uuid, uuid, jsonb, text[]);
+
+create or replace function public.quotes_patch_path(
+    p_doc jsonb,
+    p_path text[],
+    p_add boolean
+) returns text[]
+language plpgsql
+immutable
+set search_path = public
+as $$
+declare
+    parent jsonb;
+    token text;
+    size int;
+begin
+    for i in 1 .. cardinality(p_path) loop
+        parent := p_doc #> p_path[1:i - 1];
+        token := p_path[i];
+
+        case jsonb_typeof(parent)
+            when 'array' then
+                size := jsonb_array_length(parent);
+                if p_add and i = cardinality(p_path) and token = '-' then
+                    token := size::text;
+                    p_path[i] := token;
+                elsif token !~ '^(0|[1-9][0-9]{{0,8}})$' then
+                    raise exception 'Invalid array index % in %', token, p_path using errcode = '22023';
+                end if;
+                if token::int >= size + (case when p_add and i = cardinality(p_path) then 1 else 0 end) then
+                    raise exception 'Index % out of range in %', token, p_path using errcode = '22023';
+                end if;
+            when 'object' then
+                if not (p_add and i = cardinality(p_path)) and not parent ? token then
+                    raise exception 'Path % not found', p_path using errcode = '22023';
+                end if;
+            else
+                raise exception 'Path % not found', p_path using errcode = '22023';
+        end case;
+    end loop;
+    return p_path;
+end;
+$$;
+
+create or replace function public.quotes_patch_add(
+    p_doc jsonb,
+    p_path text[],
+    p_value jsonb
+) returns jsonb
+language plpgsql
+immutable
+set search_path = public
+as $$
+begin
+    p_path := quotes_patch_path(p_doc, p_path, true);
+    if jsonb_typeof(p_doc #> p_path[1:cardinality(p_path) - 1]) = 'array' then
+        -- Index == length appends
+        return jsonb_insert(p_doc, p_path, p_value);
+    end if;
+    return jsonb_set(p_doc, p_path, p_value, true);
+end;
+$$;
+
+create or replace function public.quotes_patch(
+    p_user_id uuid,
+    p_quote_id uuid,
+    p_ops jsonb,
+    p_return text[],
+    p_dry_run boolean default false,
+    p_set jsonb default null,
+    p_version timestamptz default null
+) returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    doc jsonb;
+    op jsonb;
+    path text[];
+    from_path text[];
+    moved jsonb;
+    row_data jsonb;
+begin
+    select jsonb_build_object(
+               {document}
+           ),
+           to_jsonb(quotes.*)
+      into doc, row_data
+      from quotes
+     where id = p_quote_id and user_id = p_user_id
+       for update;
+
+    if doc is null then
+        raise exception 'Quote not found' using errcode = 'P0002';
+    end if;
+
+    if p_version is not null and (row_data->>'updated_at')::timestamptz is distinct from p_version then
+        raise exception 'Quote was modified concurrently' using errcode = '40001';
+    end if;
+
+    for op in select value from jsonb_array_elements(p_ops) loop
+        path := array(select jsonb_array_elements_text(op->'path'));
+        if op ? 'from' then
+            from_path := array(select jsonb_array_elements_text(op->'from'));
+        end if;
+
+        case op->>'op'
+            when 'add' then
+                doc := quotes_patch_add(doc, path, op->'value');
+            when 'remove' then
+                doc := doc #- quotes_patch_path(doc, path, false);
+            when 'replace' then
+                doc := jsonb_set(doc, quotes_patch_path(doc, path, false), op->'value', false);
+            when 'move' then
+                if path[1:cardinality(from_path)] = from_path and path <> from_path then
+                    raise exception 'Cannot move % into itself', from_path using errcode = '22023';
+                end if;
+                from_path := quotes_patch_path(doc, from_path, false);
+                moved := doc #> from_path;
+                doc := quotes_patch_add(doc #- from_path, path, moved);
+            when 'copy' then
+                doc := quotes_patch_add(doc, path, doc #> quotes_patch_path(doc, from_path, false));
+            when 'test' then
+                if doc #> quotes_patch_path(doc, path, false) <> op->'value' then
+                    raise exception 'Test failed at %', path using errcode = '23514';
+                end if;
+            else
+                raise exception 'Unknown operation %', op->>'op' using errcode = '22023';
+        end case;
+    end loop;
+
+    if p_dry_run then
+        row_data := row_data || doc;
+    else
+        update quotes
+           set {assignments},
+               {priced}
+          from jsonb_populate_record(null::quotes, p_set) as priced
+         where quotes.id = p_quote_id
+        returning to_jsonb(quotes.*) into row_data;
+    end if;
+
+    return (
+        select coalesce(jsonb_object_agg(key, value), '{{}}'::jsonb)
+          from jsonb_each(row_data)
+         where key = any(p_return)
+    );
+end;
+$$;
+
+revoke all on function public.quotes_patch(uuid, uuid, jsonb, text[], boolean, jsonb, timestamptz) from public, anon, authenticated;
+grant execute on function public.quotes_patch(uuid, uuid, jsonb, text[], boolean, jsonb, timestamptz) to service_role;
+""".format(
+    document=",\n               ".join(
+        f"'{field}', coalesce({field}, '{'[]' if field in _ARRAY_FIELDS else '{}'}'::jsonb)" for field in QUOTE_JSON_FIELDS
+    ),
+    assignments=",\n               ".join(f"{field} = doc->'{field}'" for field in QUOTE_JSON_FIELDS),
+    priced=",\n               ".join(
+        f"{field} = case when p_set ? '{field}' then priced.{field} else quotes.{field} end"
+        for field in pricing_service.PRICED_FIELDS
+    ),
+)
+
+# SQLSTATE raised by quotes_patch -> HTTP status
+_ERROR_STATUS = {
+    "P0002": status.HTTP_404_NOT_FOUND,
+    "22023": status.HTTP_422_UNPROCESSABLE_ENTITY,
+    "23514": status.HTTP_409_CONFLICT,
+}
+
+# Re-pricing patches retry this many times when the quote is saved between
+# the dry run and the write, then give up with 409
+_REPRICE_ATTEMPTS = 3
+
+
+def _db_op(op: Dict[str, Any]) -> Dict[str, Any]:
+    """An operation with its pointers split into the text arrays the function takes"""
+    db_op = {**op, "path": split_pointer(op["path"])}
+    if "from" in op:
+        db_op["from"] = split_pointer(op["from"])
+    return db_op
+
+
+async def _call(params: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        response = await quotes_repo.client.rpc("quotes_patch", params).execute()
+    except APIError as e:
+        if e.code in _ERROR_STATUS:
+            raise HTTPException(status_code=_ERROR_STATUS[e.code], detail=e.message)
+        raise
+    return response.data
+
+
+async def patch_quote(user_id: str, quote_id: str, ops: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply JSON Patch operations to a quote atomically in the database
+
+    Only the operations travel to the database, not the patched arrays. When
+    an operation touches a pricing input (items, additional costs, ...), a dry
+    run returns the patched inputs, the totals are derived from them, and the
+    patch and totals are written in one update - conditional on the quote not
+    having been saved since the dry run (retried, then 409).
+
+    Returns:
+        {"id", "updated_at"} plus the priced columns if they were re-derived
+    """
+    db_ops = [_db_op(op) for op in ops]
+    touched = {op["path"][0] for op in db_ops} | {op["from"][0] for op in db_ops if "from" in op}
+    params = {"p_user_id": user_id, "p_quote_id": quote_id, "p_ops": db_ops, "p_return": ["id", "updated_at"]}
+
+    if not pricing_service.touches_pricing(dict.fromkeys(touched)):
+        row = await _call(params)
+        return {"id": row["id"], "updated_at": row.get("updated_at")}
+
+    for _ in range(_REPRICE_ATTEMPTS):
+        inputs = await _call({**params, "p_dry_run": True, "p_return": ["updated_at"] + pricing_service.PRICING_INPUT_FIELDS})
+        priced = pricing_service.priced_fields(inputs)
+        try:
+            row = await _call({**params, "p_set": priced, "p_version": inputs.get("updated_at")})
+        except APIError as e:
+            if e.code == "40001":
+                logger.info(f"Quote {quote_id} changed while patching, retrying")
+                continue
+            raise
+        return {"id": row["id"], "updated_at": row.get("updated_at"), **priced}
+
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Quote is being modified concurrently, try again"
+    )
@@ -0,0 +1,119 @@
+from app.repositories import quotes_repo
+from app.services.pricing_service import PRICED_FIELDS
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Database function writing re-priced draft quotes back in one statement.
+# Install with `python -m app.scripts.install_database_functions`.
+#
+# Rows are only written if the quote is still a draft of the user and has not
+# been saved since it was read (same updated_at), so a re-pricing job never
+# overwrites an edit made while it was running.
+QUOTES_APPLY_PRICING_SQL = """
+create or replace function public.quotes_apply_pricing(
+    p_user_id uuid,
+    p_rows jsonb
+) returns integer
+language sql
+security definer
+set search_path = public
+as $$
+    with updated as (
+        update quotes q
+           set items = r.items,
+               {assignments}
+          from jsonb_to_recordset(p_rows) as r(
+                   id uuid,
+                   updated_at timestamptz,
+                   items jsonb,
+                   {columns}
+               )
+         where q.id = r.id
+           and q.user_id = p_user_id
+           and q.status = 'draft'
+           and q.updated_at is not distinct from r.updated_at
+        returning 1
+    )
+    select count(*)::integer from updated;
+$$;
+
+revoke all on function public.quotes_apply_pricing(uuid, jsonb) from public, anon, authenticated;
+grant execute on function public.quotes_apply_pricing(uuid, jsonb) to service_role;
+""".format(
+    assignments=",\n               ".join(f"{field} = r.{field}" for field in PRICED_FIELDS),
+    columns=",\n                   ".join(f"{field} numeric" for field in PRICED_FIELDS),
+)
+
+
+# Draft quotes with at least one cart item priced from one of the given
+# pricebook item ids, so a job for a few changed items doesn't page through
+# every draft. Matches every reference repricing_service.item_ref() follows
+# (pricebookItemId, demolitionItemId, meta.subcontractorItemId, and the id
+# embedded in legacy `<prefix>_<id>_<timestamp>` cart ids); the job still
+# checks the section and isCustomEdited per item. Callers page the result
+# with the usual filters (select, id > after, order, limit), which Postgres
+# applies inside the inlined function.
+QUOTES_REPRICING_DRAFTS_SQL = """
+create or replace function public.quotes_repricing_drafts(
+    p_user_id uuid,
+    p_item_ids text[]
+) returns setof quotes
+language sql
+stable
+security definer
+set search_path = public
+as $$
+    select q.*
+      from quotes q
+     where q.user_id = p_user_id
+       and q.status = 'draft'
+       and exists (
+               select 1
+                 from jsonb_array_elements(case jsonb_typeof(q.items) when 'array' then q.items else '[]' end) as item
+                where item->>'pricebookItemId' = any(p_item_ids)
+                   or item->>'demolitionItemId' = any(p_item_ids)
+                   or item->'meta'->>'subcontractorItemId' = any(p_item_ids)
+                   or substring(item->>'id' from '^(?:pl|el|construction)_(.+)_\\d+$') = any(p_item_ids)
+           );
+$$;
+
+revoke all on function public.quotes_repricing_drafts(uuid, text[]) from public, anon, authenticated;
+grant execute on function public.quotes_repricing_drafts(uuid, text[]) to service_role;
+"""
+
+
+async def find_drafts(
+    user_id: str,
+    columns: str,
+    after_id: Optional[str],
+    limit: int,
+    item_ids: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """One batch of the user's draft quotes in id order, starting after `after_id`
+
+    With `item_ids`, only drafts holding items priced from those pricebook
+    items (filtered in the database).
+    """
+    if item_ids is None:
+        query = quotes_repo.query().select(columns).eq("user_id", user_id).eq("status", "draft")
+    else:
+        params = {"p_user_id": user_id, "p_item_ids": item_ids}
+        query = quotes_repo.client.rpc("quotes_repricing_drafts", params).select(columns)
+    if after_id:
+        query = query.gt("id", after_id)
+    response = await query.order("id").limit(limit).execute()
+    return response.data
+
+
+async def apply_pricing(user_id: str, rows: List[Dict[str, Any]]) -> int:
+    """Write re-priced quotes (id, updated_at, items + priced columns) in one round trip
+
+    Returns the number of quotes written; the rest had changed since they were read.
+    """
+    if not rows:
+        return 0
+    params = {"p_user_id": user_id, "p_rows": rows}
+    response = await quotes_repo.client.rpc("quotes_apply_pricing", params).execute()
+    return response.data or 0
@@ -0,0 +1,253 @@
+from app.repositories import quote_revisions_repo
+from typing import Any, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Every Nth revision of a quote is stored whole, so materializing any revision
+# applies at most N - 1 deltas
+SNAPSHOT_INTERVAL = 20
+
+# Revision history of quotes, recorded by a trigger so every write path (API,
+# re-pricing job, JSON Patch, the frontend's direct Supabase writes) is covered.
+# Install with `python -m app.scripts.install_database_functions`.
+#
+# Each update is stored as a delta against the previous version: add / remove /
+# replace operations with text-array paths (the format quotes_patch takes),
+# diffed per object key and per array index in a single walk. Inserts record
+# nothing - a quote's first change stores the version it replaces as the
+# revision 1 snapshot. A revision is also stored whole every SNAPSHOT_INTERVAL
+# revisions and whenever the delta would be more than half the size of the
+# quote. Large values are compressed by TOAST (lz4 where the server supports it).
+QUOTE_REVISIONS_SQL = """
+create table if not exists public.quote_revisions (
+    id bigint generated always as identity primary key,
+    quote_id uuid not null references public.quotes(id) on delete cascade,
+    user_id uuid not null,
+    revision integer not null,
+    kind text not null check (kind in ('snapshot', 'delta')),
+    data jsonb not null,
+    changed text[] not null default '{{}}',
+    updated_at timestamptz,
+    created_at timestamptz not null default now(),
+    unique (quote_id, revision)
+);
+
+-- Read through the backend only
+alter table public.quote_revisions enable row level security;
+
+drop function if exists public.quote_diff(jsonb, jsonb, text[]);
+
+do $$
+begin
+    alter table public.quote_revisions alter column data set compression lz4;
+exception when others then
+    raise notice 'lz4 not available, quote revisions use the default compression';
+end;
+$$;
+
+create or replace function public.quote_diff_ops(
+    p_old jsonb,
+    p_new jsonb,
+    p_path text[]
+) returns setof jsonb
+language plpgsql
+immutable
+set search_path = public
+as $$
+declare
+    entry record;
+    old_len int;
+    new_len int;
+    changed int;
+begin
+    if p_old = p_new then
+        return;
+    end if;
+
+    if jsonb_typeof(p_old) = 'object' and jsonb_typeof(p_new) = 'object' then
+        for entry in select key, value from jsonb_each(p_old) loop
+            if p_new ? entry.key then
+                return query select * from quote_diff_ops(entry.value, p_new->entry.key, p_path || entry.key);
+            else
+                return next jsonb_build_object('op', 'remove', 'path', p_path || entry.key);
+            end if;
+        end loop;
+        return query
+            select jsonb_build_object('op', 'add', 'path', p_path || key, 'value', value)
+              from jsonb_each(p_new)
+             where not p_old ? key;
+        return;
+    end if;
+
+    if jsonb_typeof(p_old) = 'array' and jsonb_typeof(p_new) = 'array' then
+        old_len := jsonb_array_length(p_old);
+        new_len := jsonb_array_length(p_new);
+        select count(*) into changed
+          from generate_series(0, least(old_len, new_len) - 1) i
+         where p_old->i <> p_new->i;
+
+        -- An element inserted or removed near the top shifts every index
+        -- after it; replacing the array beats diffing each shifted element
+        if old_len = new_len or changed * 2 <= least(old_len, new_len) then
+            for i in 0 .. least(old_len, new_len) - 1 loop
+                if p_old->i <> p_new->i then
+                    return query select * from quote_diff_ops(p_old->i, p_new->i, p_path || i::text);
+                end if;
+            end loop;
+            for i in old_len .. new_len - 1 loop
+                return next jsonb_build_object('op', 'add', 'path', p_path || i::text, 'value', p_new->i);
+            end loop;
+            for i in reverse old_len - 1 .. new_len loop
+                return next jsonb_build_object('op', 'remove', 'path', p_path || i::text);
+            end loop;
+            return;
+        end if;
+    end if;
+
+    return next jsonb_build_object('op', 'replace', 'path', p_path, 'value', p_new);
+end;
+$$;
+
+create or replace function public.quote_diff(
+    p_old jsonb,
+    p_new jsonb
+) returns jsonb
+language sql
+immutable
+set search_path = public
+as $$
+    select coalesce(jsonb_agg(op order by n), '[]'::jsonb)
+      from quote_diff_ops(p_old, p_new, '{{}}') with ordinality as d(op, n);
+$$;
+
+create or replace function public.quote_apply_diff(
+    p_doc jsonb,
+    p_ops jsonb
+) returns jsonb
+language plpgsql
+immutable
+set search_path = public
+as $$
+declare
+    op jsonb;
+    path text[];
+begin
+    for op in select value from jsonb_array_elements(p_ops) loop
+        path := array(select jsonb_array_elements_text(op->'path'));
+        case op->>'op'
+            when 'add' then
+                p_doc := jsonb_insert(p_doc, path, op->'value');
+            when 'remove' then
+                p_doc := p_doc #- path;
+            when 'replace' then
+                p_doc := jsonb_set(p_doc, path, op->'value', false);
+        end case;
+    end loop;
+    return p_doc;
+end;
+$$;
+
+create or replace function public.quote_revisions_record()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    old_doc jsonb;
+    new_doc jsonb := to_jsonb(new) - 'updated_at';
+    delta jsonb;
+    last_revision int;
+begin
+    old_doc := to_jsonb(old) - 'updated_at';
+    if old_doc = new_doc then
+        return null;
+    end if;
+
+    select max(revision) into last_revision from quote_revisions where quote_id = new.id;
+    if last_revision is null then
+        -- First change (or a quote from before history was installed): the
+        -- state being replaced is revision 1
+        insert into quote_revisions (quote_id, user_id, revision, kind, data, updated_at)
+        values (old.id, old.user_id, 1, 'snapshot', old_doc, old.updated_at);
+        last_revision := 1;
+    end if;
+
+    delta := quote_diff(old_doc, new_doc);
+    insert into quote_revisions (quote_id, user_id, revision, kind, data, changed, updated_at)
+    select new.id, new.user_id, last_revision + 1,
+           case when snapshot then 'snapshot' else 'delta' end,
+           case when snapshot then new_doc else delta end,
+           array(select distinct e->'path'->>0 from jsonb_array_elements(delta) e order by 1),
+           new.updated_at
+      from (select last_revision % {interval} = 0
+                   or pg_column_size(delta) * 2 > pg_column_size(new_doc) as snapshot) s;
+    return null;
+end;
+$$;
+
+drop trigger if exists quote_revisions_record on public.quotes;
+create trigger quote_revisions_record
+    after update on public.quotes
+    for each row execute function public.quote_revisions_record();
+
+create or replace function public.quote_revision(
+    p_user_id uuid,
+    p_quote_id uuid,
+    p_revision integer
+) returns jsonb
+language plpgsql
+stable
+security definer
+set search_path = public
+as $$
+declare
+    doc jsonb;
+    base int;
+    version timestamptz;
+    delta jsonb;
+begin
+    select updated_at into version
+      from quote_revisions
+     where quote_id = p_quote_id and user_id = p_user_id and revision = p_revision;
+    if not found then
+        -- A quote never changed has no history rows; revision 1 is the quote itself
+        if p_revision = 1 and not exists (select 1 from quote_revisions where quote_id = p_quote_id) then
+            return (select to_jsonb(quotes.*) from quotes where id = p_quote_id and user_id = p_user_id);
+        end if;
+        return null;
+    end if;
+
+    select revision, data into base, doc
+      from quote_revisions
+     where quote_id = p_quote_id and revision <= p_revision and kind = 'snapshot'
+     order by revision desc
+     limit 1;
+
+    for delta in
+        select data from quote_revisions
+         where quote_id = p_quote_id and revision > base and revision <= p_revision
+         order by revision
+    loop
+        doc := quote_apply_diff(doc, delta);
+    end loop;
+
+    return doc || jsonb_build_object('updated_at', version);
+end;
+$$;
+
+revoke all on function public.quote_revision(uuid, uuid, integer) from public, anon, authenticated;
+grant execute on function public.quote_revision(uuid, uuid, integer) to service_role;
+""".format(interval=SNAPSHOT_INTERVAL)
+
+
+async def materialize(user_id: str, quote_id: str, revision: int) -> Optional[Dict[str, Any]]:
+    """The quote as it was at `revision`, or None if the quote has no such revision
+
+    Rebuilt in the database from the nearest snapshot, so only the result
+    travels back.
+    """
+    params = {"p_user_id": user_id, "p_quote_id": quote_id, "p_revision": revision}
+    response = await quote_revisions_repo.client.rpc("quote_revision", params).execute()
+    return response.data
@@ -0,0 +1,100 @@
+from app.repositories import quote_stats_repo
+from typing import Any, Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Statuses QuoteSummary counts separately (the rest only count towards the totals)
+SUMMARY_STATUSES = ["draft", "sent", "approved", "rejected"]
+
+# Per-user quote counters, one row per (user, status), kept current by a
+# trigger on quotes so every write path (API, re-pricing job, JSON Patch,
+# duplication, the frontend's direct Supabase writes) is counted and the
+# summary reads a handful of rows however many quotes a user has.
+# Install with `python -m app.scripts.install_database_functions`.
+#
+# A quote's value is its final_amount (before VAT), falling back to
+# total_amount. The closing block recounts every user from quotes, so
+# re-running the install also repairs any drift.
+QUOTE_STATS_SQL = """
+create table if not exists public.quote_stats (
+    user_id uuid not null,
+    status text not null,
+    quote_count bigint not null default 0,
+    total_value numeric not null default 0,
+    primary key (user_id, status)
+);
+
+-- Read through the backend only
+alter table public.quote_stats enable row level security;
+
+create or replace function public.quote_stats_record()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    if tg_op = 'UPDATE'
+       and new.user_id is not distinct from old.user_id
+       and new.status is not distinct from old.status
+       and coalesce(new.final_amount, new.total_amount, 0) = coalesce(old.final_amount, old.total_amount, 0) then
+        return null;
+    end if;
+
+    if tg_op in ('UPDATE', 'DELETE') then
+        update quote_stats
+           set quote_count = quote_count - 1,
+               total_value = total_value - coalesce(old.final_amount, old.total_amount, 0)
+         where user_id = old.user_id and status = coalesce(old.status, 'draft');
+    end if;
+
+    if tg_op in ('INSERT', 'UPDATE') and new.user_id is not null then
+        insert into quote_stats as s (user_id, status, quote_count, total_value)
+        values (new.user_id, coalesce(new.status, 'draft'), 1, coalesce(new.final_amount, new.total_amount, 0))
+        on conflict (user_id, status) do update
+           set quote_count = s.quote_count + 1,
+               total_value = s.total_value + excluded.total_value;
+    end if;
+    return null;
+end;
+$$;
+
+drop trigger if exists quote_stats_record on public.quotes;
+create trigger quote_stats_record
+    after insert or update or delete on public.quotes
+    for each row execute function public.quote_stats_record();
+
+-- Recount from scratch (first install, or repairing drift), with quote
+-- writes held off so none is counted twice
+do $$
+begin
+    lock table public.quotes in share mode;
+    delete from public.quote_stats;
+    insert into public.quote_stats (user_id, status, quote_count, total_value)
+    select user_id, coalesce(status, 'draft'), count(*), coalesce(sum(coalesce(final_amount, total_amount, 0)), 0)
+      from public.quotes
+     where user_id is not null
+     group by 1, 2;
+end;
+$$;
+"""
+
+
+async def summary(user_id: str) -> Dict[str, Any]:
+    """QuoteSummary fields for a user, from the counter rows (one per status)"""
+    response = await quote_stats_repo.query().select("status,quote_count,total_value").eq("user_id", user_id).execute()
+    counts = {status: 0 for status in SUMMARY_STATUSES}
+    total_quotes, total_value = 0, 0.0
+    for row in response.data or []:
+        count = int(row["quote_count"])
+        total_quotes += count
+        total_value += float(row["total_value"])
+        if row["status"] in counts:
+            counts[row["status"]] += count
+    return {
+        "total_quotes": total_quotes,
+        **{f"{status}_quotes": count for status, count in counts.items()},
+        "total_value": total_value,
+        "average_value": total_value / total_quotes if total_quotes else 0.0,
+    }
@@ -0,0 +1,266 @@
+from app.models.quote import QUOTE_SUMMARY_FIELDS
+from app.repositories import catalog_items_repo, quotes_repo
+from app.utils.search_text import MIN_PHONE_DIGITS, phone_query, tokens
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Search over quotes, clients and catalog items.
+# Install with `python -m app.scripts.install_database_functions`.
+#
+# Each table gets a `search_text` computed field (name-like columns folded by
+# search_normalize(): lowercase, final letters folded, niqqud and punctuation
+# stripped - app/utils/search_text.py does the same in Python), clients and
+# quotes a `search_phone` one (digits only, +972 as 0), and a trigram GIN index
+# on each. Being functions of the row, they are filterable through PostgREST
+# (`?search_text=like.*term*`) but never part of `select=*`.
+#
+# Words of a query must all appear (as substrings, so Hebrew prefixes like
+# ו/ה/ב still match); the search_* functions rank by trigram word similarity.
+SEARCH_SQL = r"""
+create extension if not exists pg_trgm with schema extensions;
+
+create or replace function public.search_normalize(p_text text) returns text
+language sql
+immutable
+parallel safe
+as $$
+    select btrim(regexp_replace(
+        regexp_replace(
+            translate(lower(coalesce(p_text, '')), 'ךםןףץ', 'כמנפצ'),
+            '[\u0591-\u05bd\u05bf\u05c1\u05c2\u05c4\u05c5\u05c7''"`\u05f3\u05f4]', '', 'g'
+        ),
+        '[^0-9a-z\u05d0-\u05ea]+', ' ', 'g'
+    ))
+$$;
+
+create or replace function public.search_digits(p_text text) returns text
+language sql
+immutable
+parallel safe
+as $$
+    select regexp_replace(regexp_replace(coalesce(p_text, ''), '[^0-9]', '', 'g'), '^972', '0')
+$$;
+
+create or replace function public.search_item_text(p_items jsonb) returns text
+language sql
+immutable
+parallel safe
+as $$
+    select coalesce(string_agg(coalesce(e->>'name', '') || ' ' || coalesce(e->>'description', ''), ' '), '')
+      from jsonb_array_elements(case when jsonb_typeof(p_items) = 'array' then p_items else '[]'::jsonb end) e
+$$;
+
+-- Computed fields
+create or replace function public.search_text(public.quotes) returns text
+language sql
+immutable
+parallel safe
+as $$
+    select search_normalize(
+        coalesce($1.title, '') || ' ' || coalesce($1.quote_number, '') || ' ' ||
+        coalesce($1.project_name, '') || ' ' || coalesce($1.project_address, '') || ' ' ||
+        coalesce($1.client_name, '') || ' ' || coalesce($1.client_email, '') || ' ' ||
+        search_item_text($1.items)
+    )
+$$;
+
+create or replace function public.search_phone(public.quotes) returns text
+language sql
+immutable
+parallel safe
+as $$
+    select search_digits($1.client_phone)
+$$;
+
+create or replace function public.search_text(public.clients) returns text
+language sql
+immutable
+parallel safe
+as $$
+    select search_normalize(
+        coalesce($1.name, '') || ' ' || coalesce($1.company, '') || ' ' ||
+        coalesce($1.email, '') || ' ' || coalesce($1.city, '') || ' ' || coalesce($1.address, '')
+    )
+$$;
+
+create or replace function public.search_phone(public.clients) returns text
+language sql
+immutable
+parallel safe
+as $$
+    select search_digits($1.phone)
+$$;
+
+create or replace function public.search_text(public.catalog_items) returns text
+language sql
+immutable
+parallel safe
+as $$
+    select search_normalize(coalesce($1.name, '') || ' ' || coalesce($1.description, ''))
+$$;
+
+create index if not exists quotes_search_text_idx
+    on public.quotes using gin (public.search_text(quotes) extensions.gin_trgm_ops);
+create index if not exists quotes_search_phone_idx
+    on public.quotes using gin (public.search_phone(quotes) extensions.gin_trgm_ops);
+create index if not exists clients_search_text_idx
+    on public.clients using gin (public.search_text(clients) extensions.gin_trgm_ops);
+create index if not exists clients_search_phone_idx
+    on public.clients using gin (public.search_phone(clients) extensions.gin_trgm_ops);
+create index if not exists catalog_items_search_text_idx
+    on public.catalog_items using gin (public.search_text(catalog_items) extensions.gin_trgm_ops);
+
+-- WHERE clause matching a query against a row alias: every word as a
+-- substring of search_text, or (queries without letters) the digits as a
+-- substring of search_phone. Built as text so each word is its own indexable
+-- condition.
+create or replace function public.search_condition(
+    p_alias text,
+    p_query text,
+    p_phone boolean
+) returns text
+language plpgsql
+immutable
+set search_path = public
+as $$
+declare
+    condition text;
+    digits text := search_digits(p_query);
+begin
+    select string_agg(format('search_text(%I) like %L', p_alias, '%' || word || '%'), ' and ')
+      into condition
+      from unnest(string_to_array(nullif(search_normalize(p_query), ''), ' ')) word;
+
+    if p_phone and p_query !~ '[A-Za-z\u05d0-\u05ea]' and length(digits) >= {min_phone_digits} then
+        condition := format('(%s) or search_phone(%I) like %L', coalesce(condition, 'false'), p_alias, '%' || digits || '%');
+    end if;
+    return coalesce(condition, 'false');
+end;
+$$;
+
+create or replace function public.search_quotes(
+    p_user_id uuid,
+    p_query text,
+    p_limit integer,
+    p_offset integer
+) returns setof jsonb
+language plpgsql
+stable
+security definer
+set search_path = public, extensions
+as $$
+begin
+    return query execute format(
+        'select to_jsonb(r) from (
+             select {quote_columns}, word_similarity($1, search_text(q)) as rank
+               from quotes q
+              where q.user_id = $2 and (%s)
+              order by rank desc, q.updated_at desc nulls last, q.id
+              limit $3 offset $4
+         ) r',
+        search_condition('q', p_query, true)
+    ) using search_normalize(p_query), p_user_id, p_limit, p_offset;
+end;
+$$;
+
+create or replace function public.search_clients(
+    p_user_id uuid,
+    p_query text,
+    p_limit integer,
+    p_offset integer
+) returns setof jsonb
+language plpgsql
+stable
+security definer
+set search_path = public, extensions
+as $$
+begin
+    return query execute format(
+        'select to_jsonb(c) || jsonb_build_object(''rank'', word_similarity($1, search_text(c)))
+           from clients c
+          where c.user_id = $2 and (%s)
+          order by word_similarity($1, search_text(c)) desc, c.name, c.id
+          limit $3 offset $4',
+        search_condition('c', p_query, true)
+    ) using search_normalize(p_query), p_user_id, p_limit, p_offset;
+end;
+$$;
+
+create or replace function public.search_catalog_items(
+    p_query text,
+    p_category_id uuid,
+    p_limit integer,
+    p_offset integer
+) returns setof jsonb
+language plpgsql
+stable
+set search_path = public, extensions
+as $$
+begin
+    return query execute format(
+        'select to_jsonb(i) || jsonb_build_object(''rank'', word_similarity($1, search_text(i)))
+           from catalog_items i
+          where i.is_active and ($2 is null or i.category_id = $2) and (%s)
+          order by word_similarity($1, search_text(i)) desc, i.name, i.id
+          limit $3 offset $4',
+        search_condition('i', p_query, false)
+    ) using search_normalize(p_query), p_category_id, p_limit, p_offset;
+end;
+$$;
+
+-- Quotes and clients are searched per user through the backend; the catalog
+-- is public and read with the anon client, like the catalog endpoints
+revoke all on function public.search_quotes(uuid, text, integer, integer) from public, anon, authenticated;
+grant execute on function public.search_quotes(uuid, text, integer, integer) to service_role;
+revoke all on function public.search_clients(uuid, text, integer, integer) from public, anon, authenticated;
+grant execute on function public.search_clients(uuid, text, integer, integer) to service_role;
+""".replace("{min_phone_digits}", str(MIN_PHONE_DIGITS)).replace(
+    "{quote_columns}", ", ".join(f"q.{field}" for field in QUOTE_SUMMARY_FIELDS)
+)
+
+
+def apply_search(query: Any, term: str, phone: bool = False) -> Any:
+    """Filter a PostgREST query on the indexed search fields, like search_condition()
+
+    Every word must appear in `search_text`; with `phone`, a query without
+    letters also matches the digits of `search_phone`. Normalized words only
+    hold letters, digits and spaces, so they are safe inside filter syntax; a
+    term with no words at all (just punctuation) leaves the query unfiltered.
+    """
+    words = tokens(term)
+    digits = phone_query(term) if phone else ""
+    if digits:
+        text_match = f"and({','.join(f'search_text.like.*{word}*' for word in words)})" if words else None
+        return query.or_(",".join(filter(None, [text_match, f"search_phone.like.*{digits}*"])))
+    for word in words:
+        query = query.like("search_text", f"*{word}*")
+    return query
+
+
+async def _search(client: Any, function: str, params: Dict[str, Any], limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+    # One row more than asked for tells whether there is a next page
+    response = await client.rpc(function, {**params, "p_limit": limit + 1}).execute()
+    rows = response.data or []
+    return rows[:limit], len(rows) > limit
+
+
+async def search_quotes(user_id: str, term: str, limit: int, offset: int) -> Tuple[List[Dict[str, Any]], bool]:
+    """Ranked page of the user's quotes (summary columns + rank) and whether more follow"""
+    params = {"p_user_id": user_id, "p_query": term, "p_offset": offset}
+    return await _search(quotes_repo.client, "search_quotes", params, limit)
+
+
+async def search_clients(user_id: str, term: str, limit: int, offset: int) -> Tuple[List[Dict[str, Any]], bool]:
+    """Ranked page of the user's clients and whether more follow"""
+    params = {"p_user_id": user_id, "p_query": term, "p_offset": offset}
+    return await _search(quotes_repo.client, "search_clients", params, limit)
+
+
+async def search_catalog_items(
+    term: str, category_id: Optional[str], limit: int, offset: int
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Ranked page of active catalog items and whether more follow"""
+    params = {"p_query": term, "p_category_id": category_id, "p_offset": offset}
+    return await _search(catalog_items_repo.client, "search_catalog_items", params, limit)
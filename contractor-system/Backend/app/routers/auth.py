@@ -1,7 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.models.user import UserCreate, UserLogin, UserResponse, Token
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+from app.config import settings
+from app.models.user import UserCreate, UserLogin, UserResponse, Token, SessionResponse
 from app.services import auth_service
-from app.middleware.auth_middleware import get_current_user
+from app.middleware import sessions
+from app.middleware.auth_middleware import get_current_user, security, verify_token
+from app.middleware.sessions import is_session_id
+from typing import Optional
+import time
 
 router = APIRouter()
 
@@ -18,10 +25,73 @@ async def login(credentials: UserLogin):
     return await auth_service.login_user(credentials)
 
 
+@router.post("/session", response_model=SessionResponse, status_code=status.HTTP_201_CREATED)
+async def create_session(
+    payload: dict = Depends(verify_token),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """Exchange a Supabase access token for a short opaque session id
+
+    Send the session id as `Authorization: Bearer <session_id>` instead of the
+    (possibly very large) Supabase token. The session expires with the token.
+
+    Sessions are held in the API process's memory: only one worker issues
+    them (others answer 503, as does a server with SESSIONS_ENABLED=false -
+    keep sending the Supabase token then), and a restart drops every
+    session - on a 401, exchange the Supabase token again.
+    """
+    if not sessions.session_store.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Sessions are not available on this server - send the Supabase access token"
+        )
+
+    token = credentials.credentials
+    if is_session_id(token):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A Supabase access token is required to create a session"
+        )
+
+    expires_at = time.time() + settings.SESSION_TTL
+    exp = jwt.get_unverified_claims(token).get("exp")
+    if exp:
+        expires_at = min(expires_at, float(exp))
+
+    return SessionResponse(
+        session_id=sessions.create_session(payload, expires_at),
+        expires_at=int(expires_at)
+    )
+
+
+@router.delete("/session", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_session(
+    user_id: str = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """Revoke the session used to authenticate this request
+
+    Only affects this API process's in-memory session store (see POST /session).
+    """
+    if is_session_id(credentials.credentials):
+        sessions.revoke_session(credentials.credentials)
+    return None
+
+
 @router.get("/me", response_model=dict)
-async def get_current_user_profile(user_id: str = Depends(get_current_user)):
-    """Get current user profile - auto-creates profile if it doesn't exist"""
-    return await auth_service.get_user_by_id(user_id, auto_create=True)
+async def get_current_user_profile(
+    sections: Optional[str] = Query(
+        None,
+        description="Comma-separated extra sections: pricebook, plumbing, electrical, construction, "
+                    "demolition, tiling, paint, commitments, company, quote_settings, or all"
+    ),
+    user_id: str = Depends(get_current_user)
+):
+    """Get current user profile - auto-creates profile if it doesn't exist
+
+    Returns the compact identity core by default; heavy sections are opt-in.
+    """
+    return await auth_service.get_profile_sections(user_id, sections)
 
 
 @router.post("/refresh", response_model=Token)
@@ -1,16 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status
 from app.models.catalog import (
     CategoryCreate, CategoryUpdate, CategoryResponse,
     CatalogItemCreate, CatalogItemUpdate, CatalogItemResponse, CatalogItemList
 )
 from app.middleware.auth_middleware import get_current_user, get_optional_user
-from app.database import get_supabase
+from app.repositories import categories_repo, catalog_items_repo, price_ranges_repo
+from app.repositories.pagination import PageParams, paginate
+from app.repositories.search import apply_search
+from app.repositories.fields import FieldSelector
 from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+catalog_item_fields = FieldSelector(CatalogItemResponse, embeds={"price_ranges": "price_ranges(*)"})
+
 
 # ============================================================================
 # CATEGORY ROUTES
@@ -19,10 +24,8 @@ router = APIRouter()
 @router.get("/categories", response_model=list[CategoryResponse])
 async def list_categories(user_id: Optional[str] = Depends(get_optional_user)):
     """List all categories (public endpoint)"""
-    supabase = get_supabase()
-
     try:
-        response = supabase.table("categories")\
+        response = await categories_repo.query()\
             .select("*")\
             .order("order")\
             .execute()
@@ -41,12 +44,10 @@ async def create_category(
     user_id: str = Depends(get_current_user)
 ):
     """Create a new category (admin only)"""
-    supabase = get_supabase()
-
     try:
         category_data = category.model_dump()
-        response = supabase.table("categories").insert(category_data).execute()
-        return response.data[0]
+        created = await categories_repo.insert(category_data)
+        return created[0]
     except Exception as e:
         logger.error(f"Error creating category: {e}", exc_info=True)
         raise HTTPException(
@@ -61,21 +62,16 @@ async def get_category(
     user_id: Optional[str] = Depends(get_optional_user)
 ):
     """Get a specific category by ID"""
-    supabase = get_supabase()
-
     try:
-        response = supabase.table("categories")\
-            .select("*")\
-            .eq("id", category_id)\
-            .execute()
+        category = await categories_repo.find_one(id=category_id)
 
-        if not response.data:
+        if not category:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Category not found"
             )
 
-        return response.data[0]
+        return category
     except HTTPException:
         raise
     except Exception as e:
@@ -93,31 +89,13 @@ async def update_category(
     user_id: str = Depends(get_current_user)
 ):
     """Update a category (admin only)"""
-    supabase = get_supabase()
-
     try:
-        # Check if category exists
-        existing = supabase.table("categories")\
-            .select("*")\
-            .eq("id", category_id)\
-            .execute()
-
-        if not existing.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Category not found"
-            )
-
-        # Update category
+        # Existence is checked by the update itself - 404 if no row matched
         update_data = category.model_dump(exclude_unset=True)
         if update_data:
-            response = supabase.table("categories")\
-                .update(update_data)\
-                .eq("id", category_id)\
-                .execute()
-            return response.data[0]
+            return await categories_repo.update_one(update_data, not_found="Category not found", id=category_id)
 
-        return existing.data[0]
+        return await categories_repo.find_one_or_404(not_found="Category not found", id=category_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -134,23 +112,9 @@ async def delete_category(
     user_id: str = Depends(get_current_user)
 ):
     """Delete a category (admin only)"""
-    supabase = get_supabase()
-
     try:
-        # Check if category exists
-        existing = supabase.table("categories")\
-            .select("*")\
-            .eq("id", category_id)\
-            .execute()
-
-        if not existing.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Category not found"
-            )
-
-        # Delete category
-        supabase.table("categories").delete().eq("id", category_id).execute()
+        # Existence is checked by the delete itself - 404 if no row matched
+        await categories_repo.delete_one(not_found="Category not found", id=category_id)
         return None
     except HTTPException:
         raise
@@ -172,14 +136,12 @@ async def create_catalog_item(
     user_id: str = Depends(get_current_user)
 ):
     """Create a new catalog item"""
-    supabase = get_supabase()
-
     try:
         item_data = item.model_dump(exclude={"price_ranges"})
 
         # Insert catalog item
-        response = supabase.table("catalog_items").insert(item_data).execute()
-        catalog_item = response.data[0]
+        created = await catalog_items_repo.insert(item_data)
+        catalog_item = created[0]
 
         # Insert price ranges if provided
         if item.price_ranges:
@@ -187,8 +149,7 @@ async def create_catalog_item(
                 {**pr.model_dump(), "catalog_item_id": catalog_item["id"]}
                 for pr in item.price_ranges
             ]
-            ranges_response = supabase.table("price_ranges").insert(price_ranges_data).execute()
-            catalog_item["price_ranges"] = ranges_response.data
+            catalog_item["price_ranges"] = await price_ranges_repo.insert(price_ranges_data)
         else:
             catalog_item["price_ranges"] = []
 
@@ -201,20 +162,18 @@ async def create_catalog_item(
         )
 
 
-@router.get("/items", response_model=CatalogItemList)
+@router.get("/items", response_model=CatalogItemList, response_model_exclude_unset=True)
 async def list_catalog_items(
     category_id: Optional[str] = None,
     is_active: bool = True,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    page: PageParams = Depends(),
     search: Optional[str] = None,
+    columns: str = Depends(catalog_item_fields),
     user_id: Optional[str] = Depends(get_optional_user)
 ):
     """List all catalog items"""
-    supabase = get_supabase()
-
     try:
-        query = supabase.table("catalog_items").select("*, price_ranges(*)")
+        query = catalog_items_repo.query().select(columns, count=page.count_method)
 
         if category_id:
             query = query.eq("category_id", category_id)
@@ -223,16 +182,15 @@ async def list_catalog_items(
             query = query.eq("is_active", is_active)
 
         if search:
-            query = query.or_(f"name.ilike.%{search}%,description.ilike.%{search}%")
+            # Indexed, Hebrew-normalized match on name and description
+            query = apply_search(query, search)
 
-        # Get total count
-        count_response = query.execute()
-        total = len(count_response.data)
+        # Single bounded query - total comes from the PostgREST count header
+        result = await paginate(query, page)
 
-        # Get paginated data
-        response = query.range(skip, skip + limit - 1).execute()
-
-        return CatalogItemList(items=response.data, total=total)
+        return CatalogItemList(items=result.items, total=result.total, next_cursor=result.next_cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing catalog items: {e}", exc_info=True)
         raise HTTPException(
@@ -241,27 +199,23 @@ async def list_catalog_items(
         )
 
 
-@router.get("/items/{item_id}", response_model=CatalogItemResponse)
+@router.get("/items/{item_id}", response_model=CatalogItemResponse, response_model_exclude_unset=True)
 async def get_catalog_item(
     item_id: str,
-    user_id: Optional[str] = Depends(get_optional_user)
+    user_id: Optional[str] = Depends(get_optional_user),
+    columns: str = Depends(catalog_item_fields)
 ):
     """Get a specific catalog item by ID"""
-    supabase = get_supabase()
-
     try:
-        response = supabase.table("catalog_items")\
-            .select("*, price_ranges(*)")\
-            .eq("id", item_id)\
-            .execute()
+        catalog_item = await catalog_items_repo.find_one(columns, id=item_id)
 
-        if not response.data:
+        if not catalog_item:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Catalog item not found"
             )
 
-        return response.data[0]
+        return catalog_item
     except HTTPException:
         raise
     except Exception as e:
@@ -279,31 +233,13 @@ async def update_catalog_item(
     user_id: str = Depends(get_current_user)
 ):
     """Update a catalog item"""
-    supabase = get_supabase()
-
     try:
-        # Check if item exists
-        existing = supabase.table("catalog_items")\
-            .select("*")\
-            .eq("id", item_id)\
-            .execute()
-
-        if not existing.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Catalog item not found"
-            )
-
-        # Update item
+        # Existence is checked by the update itself - 404 if no row matched
         update_data = item.model_dump(exclude_unset=True)
         if update_data:
-            response = supabase.table("catalog_items")\
-                .update(update_data)\
-                .eq("id", item_id)\
-                .execute()
-            return response.data[0]
+            return await catalog_items_repo.update_one(update_data, not_found="Catalog item not found", id=item_id)
 
-        return existing.data[0]
+        return await catalog_items_repo.find_one_or_404(not_found="Catalog item not found", id=item_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -320,23 +256,9 @@ async def delete_catalog_item(
     user_id: str = Depends(get_current_user)
 ):
     """Delete a catalog item"""
-    supabase = get_supabase()
-
     try:
-        # Check if item exists
-        existing = supabase.table("catalog_items")\
-            .select("*")\
-            .eq("id", item_id)\
-            .execute()
-
-        if not existing.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Catalog item not found"
-            )
-
-        # Delete item (cascade will delete price ranges)
-        supabase.table("catalog_items").delete().eq("id", item_id).execute()
+        # Delete item (cascade will delete price ranges) - 404 if no row matched
+        await catalog_items_repo.delete_one(not_found="Catalog item not found", id=item_id)
         return None
     except HTTPException:
         raise
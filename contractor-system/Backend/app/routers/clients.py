@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status
 from app.models.client import ClientCreate, ClientUpdate, ClientResponse, ClientList
 from app.middleware.auth_middleware import get_current_user
-from app.database import get_supabase
+from app.repositories import clients_repo
+from app.repositories.search import apply_search
+from app.repositories.pagination import PageParams, paginate
+from app.repositories.fields import FieldSelector
 from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+client_fields = FieldSelector(ClientResponse)
+
 
 @router.post("/", response_model=ClientResponse, status_code=status.HTTP_201_CREATED)
 async def create_client(
@@ -15,14 +20,12 @@ async def create_client(
     user_id: str = Depends(get_current_user)
 ):
     """Create a new client"""
-    supabase = get_supabase()
-
     try:
         client_data = client.model_dump()
         client_data["user_id"] = user_id
 
-        response = supabase.table("clients").insert(client_data).execute()
-        return response.data[0]
+        created = await clients_repo.insert(client_data)
+        return created[0]
     except Exception as e:
         logger.error(f"Error creating client: {e}", exc_info=True)
         raise HTTPException(
@@ -31,30 +34,27 @@ async def create_client(
         )
 
 
-@router.get("/", response_model=ClientList)
+@router.get("/", response_model=ClientList, response_model_exclude_unset=True)
 async def list_clients(
     user_id: str = Depends(get_current_user),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    columns: str = Depends(client_fields),
+    page: PageParams = Depends(),
     search: Optional[str] = None
 ):
     """List all clients for the current user"""
-    supabase = get_supabase()
-
     try:
-        query = supabase.table("clients").select("*").eq("user_id", user_id)
+        query = clients_repo.query().select(columns, count=page.count_method).eq("user_id", user_id)
 
         if search:
-            query = query.or_(f"name.ilike.%{search}%,email.ilike.%{search}%,phone.ilike.%{search}%")
+            # Indexed, Hebrew-normalized match on name/company/email/city/address, or phone digits
+            query = apply_search(query, search, phone=True)
 
-        # Get total count
-        count_response = query.execute()
-        total = len(count_response.data)
+        # Single bounded query - total comes from the PostgREST count header
+        result = await paginate(query, page)
 
-        # Get paginated data
-        response = query.range(skip, skip + limit - 1).execute()
-
-        return ClientList(clients=response.data, total=total)
+        return ClientList(clients=result.items, total=result.total, next_cursor=result.next_cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing clients: {e}", exc_info=True)
         raise HTTPException(
@@ -63,28 +63,23 @@ async def list_clients(
         )
 
 
-@router.get("/{client_id}", response_model=ClientResponse)
+@router.get("/{client_id}", response_model=ClientResponse, response_model_exclude_unset=True)
 async def get_client(
     client_id: str,
-    user_id: str = Depends(get_current_user)
+    user_id: str = Depends(get_current_user),
+    columns: str = Depends(client_fields)
 ):
     """Get a specific client by ID"""
-    supabase = get_supabase()
-
     try:
-        response = supabase.table("clients")\
-            .select("*")\
-            .eq("id", client_id)\
-            .eq("user_id", user_id)\
-            .execute()
+        client = await clients_repo.find_one(columns, id=client_id, user_id=user_id)
 
-        if not response.data:
+        if not client:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Client not found"
             )
 
-        return response.data[0]
+        return client
     except HTTPException:
         raise
     except Exception as e:
@@ -102,32 +97,13 @@ async def update_client(
     user_id: str = Depends(get_current_user)
 ):
     """Update a client"""
-    supabase = get_supabase()
-
     try:
-        # Check if client exists and belongs to user
-        existing = supabase.table("clients")\
-            .select("*")\
-            .eq("id", client_id)\
-            .eq("user_id", user_id)\
-            .execute()
-
-        if not existing.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Client not found"
-            )
-
-        # Update client
+        # Ownership is part of the update filter - 404 if no row matched
         update_data = client.model_dump(exclude_unset=True)
         if update_data:
-            response = supabase.table("clients")\
-                .update(update_data)\
-                .eq("id", client_id)\
-                .execute()
-            return response.data[0]
+            return await clients_repo.update_one(update_data, not_found="Client not found", id=client_id, user_id=user_id)
 
-        return existing.data[0]
+        return await clients_repo.find_one_or_404(not_found="Client not found", id=client_id, user_id=user_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -144,24 +120,9 @@ async def delete_client(
     user_id: str = Depends(get_current_user)
 ):
     """Delete a client"""
-    supabase = get_supabase()
-
     try:
-        # Check if client exists and belongs to user
-        existing = supabase.table("clients")\
-            .select("*")\
-            .eq("id", client_id)\
-            .eq("user_id", user_id)\
-            .execute()
-
-        if not existing.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Client not found"
-            )
-
-        # Delete client
-        supabase.table("clients").delete().eq("id", client_id).execute()
+        # Ownership is part of the delete filter - 404 if no row matched
+        await clients_repo.delete_one(not_found="Client not found", id=client_id, user_id=user_id)
         return None
     except HTTPException:
         raise
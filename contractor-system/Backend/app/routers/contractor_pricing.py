@@ -1,44 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status
 from app.models.contractor import ContractorPricingCreate, ContractorPricingUpdate, ContractorPricingResponse, ContractorPricingList
 from app.middleware.auth_middleware import get_current_user
-from app.database import get_supabase
+from app.repositories import contractor_pricing_repo
+from app.repositories.pagination import PageParams, paginate
+from app.repositories.fields import FieldSelector
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+pricing_fields = FieldSelector(ContractorPricingResponse)
+
 
 @router.post("/", response_model=ContractorPricingResponse, status_code=status.HTTP_201_CREATED)
 async def create_contractor_pricing(pricing: ContractorPricingCreate, user_id: str = Depends(get_current_user)):
     """Create a new contractor pricing entry"""
-    supabase = get_supabase()
     try:
         pricing_data = pricing.model_dump()
         pricing_data["user_id"] = user_id
-        response = supabase.table("contractor_pricing").insert(pricing_data).execute()
-        return response.data[0]
+        created = await contractor_pricing_repo.insert(pricing_data)
+        return created[0]
     except Exception as e:
         logger.error(f"Error creating contractor pricing: {e}", exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create contractor pricing")
 
 
-@router.get("/", response_model=ContractorPricingList)
+@router.get("/", response_model=ContractorPricingList, response_model_exclude_unset=True)
 async def list_contractor_pricing(
     user_id: str = Depends(get_current_user),
+    columns: str = Depends(pricing_fields),
     category_id: str = None,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100)
+    page: PageParams = Depends()
 ):
     """List all contractor pricing for the current user"""
-    supabase = get_supabase()
     try:
-        query = supabase.table("contractor_pricing").select("*").eq("user_id", user_id)
+        query = contractor_pricing_repo.query().select(columns, count=page.count_method).eq("user_id", user_id)
         if category_id:
             query = query.eq("category_id", category_id)
-        count_response = query.execute()
-        total = len(count_response.data)
-        response = query.range(skip, skip + limit - 1).execute()
-        return ContractorPricingList(pricing=response.data, total=total)
+        result = await paginate(query, page)
+        return ContractorPricingList(pricing=result.items, total=result.total, next_cursor=result.next_cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing contractor pricing: {e}", exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to list contractor pricing")
@@ -47,12 +49,8 @@ async def list_contractor_pricing(
 @router.delete("/{pricing_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_contractor_pricing(pricing_id: str, user_id: str = Depends(get_current_user)):
     """Delete a contractor pricing entry"""
-    supabase = get_supabase()
     try:
-        existing = supabase.table("contractor_pricing").select("*").eq("id", pricing_id).eq("user_id", user_id).execute()
-        if not existing.data:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contractor pricing not found")
-        supabase.table("contractor_pricing").delete().eq("id", pricing_id).execute()
+        await contractor_pricing_repo.delete_one(not_found="Contractor pricing not found", id=pricing_id, user_id=user_id)
         return None
     except HTTPException:
         raise
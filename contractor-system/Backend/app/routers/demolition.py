@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from app.middleware.auth_middleware import get_current_user
-from app.database import get_supabase_admin
+from app.repositories import pricebook, profile_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -53,24 +53,18 @@ async def get_demolition_data(current_user_id: str = Depends(get_current_user)):
     - demolition_items: Array of demolition items with pricing details
     - demolition_defaults: Default labor cost and profit percentage
     """
-    supabase = get_supabase_admin()
-
     try:
         logger.info(f"Fetching demolition data for user: {current_user_id}")
 
-        response = supabase.table("user_profiles").select(
-            "demolition_items, demolition_defaults"
-        ).eq("auth_user_id", current_user_id).execute()
+        user_data = await profile_cache.get(current_user_id)
 
-        if not response.data:
+        if not user_data:
             logger.error(f"User profile not found: {current_user_id}")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User profile not found"
             )
 
-        user_data = response.data[0]
-
         # Parse and validate data
         demolition_items = user_data.get("demolition_items", [])
         demolition_defaults = user_data.get("demolition_defaults", {})
@@ -111,7 +105,6 @@ async def update_demolition_items(
     - success: True if update succeeded
     - item_count: Number of items saved
     """
-    supabase = get_supabase_admin()
 
     try:
         logger.info(f"Updating demolition items for user: {current_user_id}")
@@ -119,16 +112,10 @@ async def update_demolition_items(
         # Convert Pydantic models to dicts for JSON storage
         items_dict = [item.model_dump() for item in request.demolition_items]
 
-        response = supabase.table("user_profiles").update({
+        # Single conditional update - 404 if the profile doesn't exist
+        await profile_cache.update(current_user_id, {
             "demolition_items": items_dict
-        }).eq("auth_user_id", current_user_id).execute()
-
-        if not response.data:
-            logger.error(f"Failed to update demolition items for user: {current_user_id}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update demolition items"
-            )
+        })
 
         logger.info(f"Successfully updated {len(items_dict)} demolition items for user {current_user_id}")
 
@@ -163,7 +150,6 @@ async def update_demolition_defaults(
     - success: True if update succeeded
     - defaults: The updated default settings
     """
-    supabase = get_supabase_admin()
 
     try:
         logger.info(f"Updating demolition defaults for user: {current_user_id}")
@@ -171,16 +157,9 @@ async def update_demolition_defaults(
         # Convert Pydantic model to dict
         defaults_dict = request.demolition_defaults.model_dump()
 
-        response = supabase.table("user_profiles").update({
+        await profile_cache.update(current_user_id, {
             "demolition_defaults": defaults_dict
-        }).eq("auth_user_id", current_user_id).execute()
-
-        if not response.data:
-            logger.error(f"Failed to update demolition defaults for user: {current_user_id}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update demolition defaults"
-            )
+        })
 
         logger.info(f"Successfully updated demolition defaults for user {current_user_id}")
 
@@ -215,51 +194,19 @@ async def delete_demolition_item(
     - success: True if deletion succeeded
     - deleted_item_id: ID of the deleted item
     """
-    supabase = get_supabase_admin()
 
     try:
         logger.info(f"Deleting demolition item {item_id} for user: {current_user_id}")
 
-        # First, fetch current items
-        response = supabase.table("user_profiles").select(
-            "demolition_items"
-        ).eq("auth_user_id", current_user_id).execute()
-
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User profile not found"
-            )
-
-        current_items = response.data[0].get("demolition_items", [])
-
-        # Filter out the item to delete
-        updated_items = [item for item in current_items if item.get("id") != item_id]
-
-        if len(updated_items) == len(current_items):
-            logger.warning(f"Item {item_id} not found for user {current_user_id}")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Demolition item {item_id} not found"
-            )
-
-        # Update with filtered items
-        update_response = supabase.table("user_profiles").update({
-            "demolition_items": updated_items
-        }).eq("auth_user_id", current_user_id).execute()
-
-        if not update_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to delete demolition item"
-            )
+        # Single atomic remove in the database - 404 if the profile or item doesn't exist
+        result = await pricebook.patch_items(current_user_id, "demolition", [{"op": "remove", "id": item_id}])
 
         logger.info(f"Successfully deleted demolition item {item_id} for user {current_user_id}")
 
         return {
             "success": True,
             "deleted_item_id": item_id,
-            "remaining_count": len(updated_items),
+            "remaining_count": result["item_count"],
             "message": f"Deleted demolition item {item_id}"
         }
 
@@ -286,7 +233,6 @@ async def reset_to_default_items(current_user_id: str = Depends(get_current_user
     - success: True if reset succeeded
     - item_count: Number of default items (5)
     """
-    supabase = get_supabase_admin()
 
     DEFAULT_ITEMS = [
         {
@@ -334,16 +280,10 @@ async def reset_to_default_items(current_user_id: str = Depends(get_current_user
     try:
         logger.info(f"Resetting demolition items to defaults for user: {current_user_id}")
 
-        response = supabase.table("user_profiles").update({
+        await profile_cache.update(current_user_id, {
             "demolition_items": DEFAULT_ITEMS,
             "demolition_defaults": DEFAULT_SETTINGS
-        }).eq("auth_user_id", current_user_id).execute()
-
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to reset demolition items"
-            )
+        })
 
         logger.info(f"Successfully reset demolition items for user {current_user_id}")
 
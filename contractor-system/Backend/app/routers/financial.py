@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
 from app.models.financial import FinancialTransactionCreate, FinancialTransactionUpdate, FinancialTransactionResponse, FinancialTransactionList
 from app.middleware.auth_middleware import get_current_user
-from app.database import get_supabase
+from app.repositories import financial_repo
+from app.repositories.pagination import PageParams, paginate
+from app.repositories.fields import FieldSelector
 from typing import Optional
 import logging
 import json
@@ -12,6 +14,9 @@ import json
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# transaction_date is the list sort key, so keyset cursors need it in every projection
+transaction_fields = FieldSelector(FinancialTransactionResponse, always=("id", "transaction_date", "created_at"))
+
 
 @router.post("/", response_model=FinancialTransactionResponse, status_code=status.HTTP_201_CREATED)
 async def create_transaction(
@@ -20,7 +25,6 @@ async def create_transaction(
     user_id: str = Depends(get_current_user)
 ):
     """Create a new financial transaction"""
-    from app.database import get_supabase_admin
     
     # Log the raw request body for debugging
     try:
@@ -29,8 +33,6 @@ async def create_transaction(
     except Exception as e:
         logger.warning(f"[create_transaction] Could not read request body: {e}")
     
-    supabase = get_supabase_admin()  # Use admin client to bypass RLS
-    
     try:
         transaction_data = transaction.model_dump()
         transaction_data["user_id"] = user_id
@@ -43,15 +45,16 @@ async def create_transaction(
 
         logger.info(f"[create_transaction] Creating transaction for user {user_id}: type={payload.get('type')}, category={payload.get('category')}, amount={payload.get('amount')}")
 
-        response = supabase.table("financial_transactions").insert(payload).execute()
+        # financial_repo uses the admin client to bypass RLS
+        created = await financial_repo.insert(payload)
 
-        if not response.data:
+        if not created:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to create transaction - no data returned"
             )
 
-        created_transaction = response.data[0]
+        created_transaction = created[0]
         logger.info(f"[create_transaction] Transaction created: id={created_transaction.get('id')}")
 
         return created_transaction
@@ -72,51 +75,43 @@ async def create_transaction(
         )
 
 
-@router.get("/", response_model=FinancialTransactionList)
+@router.get("/", response_model=FinancialTransactionList, response_model_exclude_unset=True)
 async def list_transactions(
     user_id: str = Depends(get_current_user),
+    columns: str = Depends(transaction_fields),
     type_filter: Optional[str] = None,
     category: Optional[str] = None,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100)
+    page: PageParams = Depends()
 ):
     """List all financial transactions for the current user"""
-    from app.database import get_supabase_admin
-    supabase = get_supabase_admin()  # Use admin client to bypass RLS (already filtering by user_id)
     try:
-        query = supabase.table("financial_transactions").select("*").eq("user_id", user_id)
+        query = financial_repo.query().select(columns, count=page.count_method).eq("user_id", user_id)
         if type_filter:
             query = query.eq("type", type_filter)
         if category:
             query = query.eq("category", category)
-        count_response = query.execute()
-        total = len(count_response.data)
-        response = query.order("transaction_date", desc=True).range(skip, skip + limit - 1).execute()
-        return FinancialTransactionList(transactions=response.data, total=total)
+        result = await paginate(query, page, order_column="transaction_date")
+        return FinancialTransactionList(transactions=result.items, total=result.total, next_cursor=result.next_cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing transactions: {e}", exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to list transactions")
 
 
-@router.get("/{transaction_id}", response_model=FinancialTransactionResponse)
-async def get_transaction(transaction_id: str, user_id: str = Depends(get_current_user)):
+@router.get("/{transaction_id}", response_model=FinancialTransactionResponse, response_model_exclude_unset=True)
+async def get_transaction(transaction_id: str, user_id: str = Depends(get_current_user), columns: str = Depends(transaction_fields)):
     """Get a specific financial transaction by ID"""
-    from app.database import get_supabase_admin
-    supabase = get_supabase_admin()  # Use admin client to bypass RLS (already filtering by user_id)
     try:
-        response = supabase.table("financial_transactions")\
-            .select("*")\
-            .eq("id", transaction_id)\
-            .eq("user_id", user_id)\
-            .execute()
+        transaction = await financial_repo.find_one(columns, id=transaction_id, user_id=user_id)
         
-        if not response.data:
+        if not transaction:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Transaction not found"
             )
         
-        return response.data[0]
+        return transaction
     except HTTPException:
         raise
     except Exception as e:
@@ -134,34 +129,15 @@ async def update_transaction(
     user_id: str = Depends(get_current_user)
 ):
     """Update a financial transaction"""
-    from app.database import get_supabase_admin
-    supabase = get_supabase_admin()  # Use admin client to bypass RLS (already filtering by user_id)
     try:
-        # Check if transaction exists and belongs to user
-        existing = supabase.table("financial_transactions")\
-            .select("*")\
-            .eq("id", transaction_id)\
-            .eq("user_id", user_id)\
-            .execute()
-        
-        if not existing.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Transaction not found"
-            )
-        
-        # Update transaction
+        # Ownership is part of the update filter - 404 if no row matched
         update_data = transaction.model_dump(exclude_unset=True)
         if update_data:
             # Serialize all complex types to JSON-compatible types
             payload = jsonable_encoder(update_data, exclude_none=True)
-            response = supabase.table("financial_transactions")\
-                .update(payload)\
-                .eq("id", transaction_id)\
-                .execute()
-            return response.data[0]
+            return await financial_repo.update_one(payload, not_found="Transaction not found", id=transaction_id, user_id=user_id)
         
-        return existing.data[0]
+        return await financial_repo.find_one_or_404(not_found="Transaction not found", id=transaction_id, user_id=user_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -175,13 +151,8 @@ async def update_transaction(
 @router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_transaction(transaction_id: str, user_id: str = Depends(get_current_user)):
     """Delete a financial transaction"""
-    from app.database import get_supabase_admin
-    supabase = get_supabase_admin()  # Use admin client to bypass RLS (already filtering by user_id)
     try:
-        existing = supabase.table("financial_transactions").select("*").eq("id", transaction_id).eq("user_id", user_id).execute()
-        if not existing.data:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transaction not found")
-        supabase.table("financial_transactions").delete().eq("id", transaction_id).execute()
+        await financial_repo.delete_one(not_found="Transaction not found", id=transaction_id, user_id=user_id)
         return None
     except HTTPException:
         raise
@@ -0,0 +1,265 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from app.models.pricebook import (
+    PricebookPatchRequest, PricebookPatchResponse, PricebookSection,
+    UpdatePricebookItemsRequest, UpdatePricebookDefaultsRequest, UpdatePricebookSectionRequest,
+    RepriceRequest, RepriceJob
+)
+from app.middleware.auth_middleware import get_current_user
+from app.repositories import pricebook, profile_cache
+from app.services import repricing_service
+from app.utils.responses import trusted_response
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Pricebook sections: plumbing, electrical, construction, demolition, tiling, paint.
+# Each section has a version (content hash) so clients can poll /versions and
+# refetch only what changed; GET /{section} honours If-None-Match with a 304.
+# Reads always go to the database (pricebook.read_sections), never the
+# profile cache, so a version is never older than the row.
+
+
+def _etag(version: str) -> str:
+    return f'"{version}"'
+
+
+def _etag_matches(if_none_match: Optional[str], version: str) -> bool:
+    """Whether an If-None-Match header matches the current version"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == _etag(version) for tag in tags)
+
+
+@router.get("/", response_model=Dict[str, PricebookSection])
+async def get_pricebook(
+    sections: Optional[str] = Query(None, description="Comma-separated sections to return (default: all)"),
+    current_user_id: str = Depends(get_current_user)
+):
+    """Get pricebook sections with their versions"""
+    try:
+        names = [s.strip() for s in sections.split(",") if s.strip()] if sections else list(pricebook.SECTIONS)
+        for name in names:
+            pricebook.items_column(name)  # 404 for unknown sections
+
+        profile = await pricebook.read_sections(current_user_id, names)
+
+        return trusted_response({
+            name: {"version": pricebook.section_version(profile, name), **pricebook.section_data(profile, name)}
+            for name in names
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching pricebook for {current_user_id}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch pricebook: {str(e)}"
+        )
+
+
+@router.get("/versions", response_model=Dict[str, str])
+async def get_pricebook_versions(current_user_id: str = Depends(get_current_user)):
+    """Version vector: the current version of every section"""
+    try:
+        profile = await pricebook.read_sections(current_user_id, list(pricebook.SECTIONS))
+        return pricebook.version_vector(profile)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching pricebook versions for {current_user_id}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch pricebook versions: {str(e)}"
+        )
+
+
+@router.post("/reprice", response_model=RepriceJob, status_code=status.HTTP_202_ACCEPTED)
+async def reprice_draft_quotes(
+    request: RepriceRequest,
+    current_user_id: str = Depends(get_current_user)
+):
+    """Start re-pricing draft quotes from the current pricebook
+
+    Runs in the background; poll GET /reprice/{job_id} for progress. Drafts
+    edited while the job runs are left as saved.
+    """
+    try:
+        sections = request.sections or list(repricing_service.REPRICEABLE_SECTIONS)
+        for section in sections:
+            if section not in repricing_service.REPRICEABLE_SECTIONS:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Quotes can't be re-priced from the {section} pricebook"
+                )
+
+        job = repricing_service.start_job(current_user_id, sections, request.item_ids)
+        logger.info(f"Started re-pricing job {job['id']} for user {current_user_id}: {sections}")
+        return job
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error starting re-pricing for {current_user_id}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to start re-pricing: {str(e)}"
+        )
+
+
+@router.get("/reprice/{job_id}", response_model=RepriceJob)
+async def get_reprice_job(job_id: str, current_user_id: str = Depends(get_current_user)):
+    """Progress of a re-pricing job"""
+    job = repricing_service.get_job(job_id, current_user_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Re-pricing job not found")
+    return job
+
+
+@router.get(
+    "/{section}",
+    response_model=PricebookSection,
+    responses={304: {"description": "Section unchanged since the version in If-None-Match"}}
+)
+async def get_pricebook_section(
+    section: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user_id: str = Depends(get_current_user)
+):
+    """Get one pricebook section - 304 if the client's copy is current"""
+    try:
+        pricebook.items_column(section)
+        profile = await pricebook.read_sections(current_user_id, [section])
+        version = pricebook.section_version(profile, section)
+
+        if _etag_matches(if_none_match, version):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": _etag(version)})
+
+        response.headers["ETag"] = _etag(version)
+        return trusted_response(
+            {"version": version, **pricebook.section_data(profile, section)},
+            headers={"ETag": _etag(version)}
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching {section} pricebook for {current_user_id}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch {section} items: {str(e)}"
+        )
+
+
+@router.put("/{section}", response_model=dict)
+async def update_pricebook_section(
+    section: str,
+    request: UpdatePricebookSectionRequest,
+    current_user_id: str = Depends(get_current_user)
+):
+    """Replace a section's items and/or defaults in one write (e.g. "save all")"""
+    try:
+        items_column = pricebook.items_column(section)
+        _, defaults_column = pricebook.SECTIONS[section]
+        data = {}
+        if request.items is not None:
+            data[items_column] = request.items
+        if request.defaults is not None:
+            data[defaults_column] = request.defaults
+        await profile_cache.update(current_user_id, data)
+
+        logger.info(f"Updated {section} pricebook ({', '.join(sorted(data))}) for user {current_user_id}")
+        return {"success": True, "section": section}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating {section} pricebook for {current_user_id}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update {section} pricebook: {str(e)}"
+        )
+
+
+@router.put("/{section}/items", response_model=dict)
+async def replace_pricebook_items(
+    section: str,
+    request: UpdatePricebookItemsRequest,
+    current_user_id: str = Depends(get_current_user)
+):
+    """Replace all items of a section (prefer PATCH for single-item edits)"""
+    try:
+        column = pricebook.items_column(section)
+        await profile_cache.update(current_user_id, {column: request.items})
+
+        logger.info(f"Replaced {len(request.items)} {section} items for user {current_user_id}")
+        return {"success": True, "section": section, "item_count": len(request.items)}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error replacing {section} items for {current_user_id}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update {section} items: {str(e)}"
+        )
+
+
+@router.put("/{section}/defaults", response_model=dict)
+async def update_pricebook_defaults(
+    section: str,
+    request: UpdatePricebookDefaultsRequest,
+    current_user_id: str = Depends(get_current_user)
+):
+    """Replace a section's default settings"""
+    try:
+        pricebook.items_column(section)
+        _, defaults_column = pricebook.SECTIONS[section]
+        await profile_cache.update(current_user_id, {defaults_column: request.defaults})
+
+        logger.info(f"Updated {section} defaults for user {current_user_id}")
+        return {"success": True, "section": section, "defaults": request.defaults}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating {section} defaults for {current_user_id}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update {section} defaults: {str(e)}"
+        )
+
+
+@router.patch("/{section}/items", response_model=PricebookPatchResponse)
+async def patch_pricebook_items(
+    section: str,
+    request: PricebookPatchRequest,
+    current_user_id: str = Depends(get_current_user)
+):
+    """Add, update, remove or reorder individual items of a pricebook section
+
+    The operations are applied atomically in the database.
+    """
+    try:
+        ops = [op.model_dump(exclude_none=True) for op in request.ops]
+        result = await pricebook.patch_items(current_user_id, section, ops)
+
+        logger.info(f"Applied {len(ops)} {section} pricebook ops for user {current_user_id}")
+        return PricebookPatchResponse(section=section, item_count=result["item_count"])
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error patching {section} pricebook for {current_user_id}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update {section} items: {str(e)}"
+        )
@@ -1,65 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.encoders import jsonable_encoder
 from app.models.project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectList
 from app.middleware.auth_middleware import get_current_user
-from app.database import get_supabase
+from app.repositories import projects_repo
+from app.repositories.pagination import PageParams, paginate
+from app.repositories.fields import FieldSelector
 from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+project_fields = FieldSelector(ProjectResponse)
+
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project(project: ProjectCreate, user_id: str = Depends(get_current_user)):
     """Create a new project"""
-    supabase = get_supabase()
     try:
         project_data = project.model_dump()
         project_data["user_id"] = user_id
         # Serialize all complex types (date, datetime, Decimal, UUID) to JSON-compatible types
         payload = jsonable_encoder(project_data, exclude_none=True)
-        response = supabase.table("projects").insert(payload).execute()
-        return response.data[0]
+        created = await projects_repo.insert(payload)
+        return created[0]
     except Exception as e:
         logger.error(f"Error creating project: {e}", exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create project")
 
 
-@router.get("/", response_model=ProjectList)
+@router.get("/", response_model=ProjectList, response_model_exclude_unset=True)
 async def list_projects(
     user_id: str = Depends(get_current_user),
+    columns: str = Depends(project_fields),
     status_filter: Optional[str] = None,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100)
+    page: PageParams = Depends()
 ):
     """List all projects for the current user"""
-    supabase = get_supabase()
     try:
-        query = supabase.table("projects").select("*").eq("user_id", user_id)
+        query = projects_repo.query().select(columns, count=page.count_method).eq("user_id", user_id)
         if status_filter:
             # Frontend translates Hebrew to English before sending
             # Backend accepts only English status values
             logger.info(f"[list_projects] Filtering by status: '{status_filter}'")
             query = query.eq("status", status_filter)
-        count_response = query.execute()
-        total = len(count_response.data)
-        response = query.order("created_at", desc=True).range(skip, skip + limit - 1).execute()
-        return ProjectList(projects=response.data, total=total)
+        result = await paginate(query, page)
+        return ProjectList(projects=result.items, total=result.total, next_cursor=result.next_cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing projects: {e}", exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to list projects")
 
 
-@router.get("/{project_id}", response_model=ProjectResponse)
-async def get_project(project_id: str, user_id: str = Depends(get_current_user)):
+@router.get("/{project_id}", response_model=ProjectResponse, response_model_exclude_unset=True)
+async def get_project(project_id: str, user_id: str = Depends(get_current_user), columns: str = Depends(project_fields)):
     """Get a specific project by ID"""
-    supabase = get_supabase()
     try:
-        response = supabase.table("projects").select("*").eq("id", project_id).eq("user_id", user_id).execute()
-        if not response.data:
+        project = await projects_repo.find_one(columns, id=project_id, user_id=user_id)
+        if not project:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-        return response.data[0]
+        return project
     except HTTPException:
         raise
     except Exception as e:
@@ -70,18 +71,13 @@ async def get_project(project_id: str, user_id: str = Depends(get_current_user))
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(project_id: str, project: ProjectUpdate, user_id: str = Depends(get_current_user)):
     """Update a project"""
-    supabase = get_supabase()
     try:
-        existing = supabase.table("projects").select("*").eq("id", project_id).eq("user_id", user_id).execute()
-        if not existing.data:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
         update_data = project.model_dump(exclude_unset=True)
         if update_data:
             # Serialize all complex types (date, datetime, Decimal, UUID) to JSON-compatible types
             payload = jsonable_encoder(update_data, exclude_none=True)
-            response = supabase.table("projects").update(payload).eq("id", project_id).execute()
-            return response.data[0]
-        return existing.data[0]
+            return await projects_repo.update_one(payload, not_found="Project not found", id=project_id, user_id=user_id)
+        return await projects_repo.find_one_or_404(not_found="Project not found", id=project_id, user_id=user_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -92,12 +88,8 @@ async def update_project(project_id: str, project: ProjectUpdate, user_id: str =
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(project_id: str, user_id: str = Depends(get_current_user)):
     """Delete a project"""
-    supabase = get_supabase()
     try:
-        existing = supabase.table("projects").select("*").eq("id", project_id).eq("user_id", user_id).execute()
-        if not existing.data:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-        supabase.table("projects").delete().eq("id", project_id).execute()
+        await projects_repo.delete_one(not_found="Project not found", id=project_id, user_id=user_id)
         return None
     except HTTPException:
         raise
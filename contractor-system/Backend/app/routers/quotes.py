@@ -1,14 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from fastapi.encoders import jsonable_encoder
-from app.models.quote import QuoteCreate, QuoteUpdate, QuoteResponse, QuoteList
+from app.models.quote import (
+    QuoteCreate, QuoteUpdate, QuoteResponse, QuoteList, QuotePriceRequest, QuotePricing,
+    QuotePatchOp, QuotePatchResult, QuoteRevisionList, QuoteCopyRequest, QuoteSummary, QUOTE_SUMMARY_FIELDS
+)
 from app.middleware.auth_middleware import get_current_user
-from app.database import get_supabase_admin
-from typing import Optional
+from app.middleware.compression import no_compression
+from app.repositories import quotes_repo, quote_copy, quote_patch, quote_revisions, quote_revisions_repo, quote_stats
+from app.repositories.pagination import PageParams, paginate
+from app.repositories.search import apply_search
+from app.repositories.fields import FieldSelector
+from app.services import export_service, pdf_service, pricing_service
+from app.utils.responses import trusted_response
+from typing import List, Literal, Optional
+from datetime import date
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# ?fields=... / ?fields=summary column projection for list and get endpoints
+quote_fields = FieldSelector(QuoteResponse, projections={"summary": QUOTE_SUMMARY_FIELDS})
+
 
 @router.post("/", response_model=QuoteResponse, status_code=status.HTTP_201_CREATED)
 async def create_quote(
@@ -21,13 +35,16 @@ async def create_quote(
     - Database triggers handle: quote_number generation, user_id setting, timestamps
     - Items stored as JSONB array in the same table
     - All 51 fields supported
+    - Totals (final_amount, tax_amount, profit, ...) are derived server-side from the items
     """
-    supabase = get_supabase_admin()
 
     try:
         # Convert Pydantic model to dict, exclude None values
         quote_data = quote.model_dump(exclude_none=True)
 
+        # Client-computed totals are not trusted - derive them from the pricing inputs
+        quote_data.update(pricing_service.priced_fields(quote_data))
+
         # Set user_id (also set by trigger, but explicit is better)
         quote_data["user_id"] = user_id
 
@@ -40,15 +57,15 @@ async def create_quote(
         logger.info(f"[create_quote] Creating quote for user {user_id}: project_name={payload.get('project_name')}, items_count={len(payload.get('items', []))}")
 
         # Single table insert - items are JSONB
-        response = supabase.table("quotes").insert(payload).execute()
+        created = await quotes_repo.insert(payload)
 
-        if not response.data:
+        if not created:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to create quote - no data returned"
             )
 
-        created_quote = response.data[0]
+        created_quote = created[0]
         logger.info(f"[create_quote] Quote created: id={created_quote.get('id')}, quote_number={created_quote.get('quote_number')}")
 
         return created_quote
@@ -63,26 +80,49 @@ async def create_quote(
         )
 
 
-@router.get("/", response_model=QuoteList)
+@router.post("/price", response_model=QuotePricing)
+async def price_quote(
+    request: QuotePriceRequest,
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Preview quote totals for the given items and adjustments
+
+    - Same calculation as create/update, nothing is saved
+    - No database access, so it is cheap enough to call while editing
+    """
+    try:
+        return pricing_service.price_quote(request.model_dump())
+
+    except Exception as e:
+        logger.error(f"Error pricing quote: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to price quote: {str(e)}"
+        )
+
+
+@router.get("/", response_model=QuoteList, response_model_exclude_unset=True)
 async def list_quotes(
     user_id: str = Depends(get_current_user),
+    columns: str = Depends(quote_fields),
     status_filter: Optional[str] = None,
     client_id: Optional[str] = None,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100)
+    search: Optional[str] = None,
+    page: PageParams = Depends()
 ):
     """
     List all quotes for the current user
 
     - Supports filtering by status and client_id
-    - Paginated results
+    - ?search= matches project/client names, quote number and item names (ranked search: /api/search/quotes)
+    - Paginated results (offset via skip/limit, or keyset via cursor)
+    - Sparse fieldsets via ?fields=a,b,c or ?fields=summary (skips heavy JSONB columns)
     - No joins needed (items in same table as JSONB)
     """
-    supabase = get_supabase_admin()
-
     try:
         # Build query
-        query = supabase.table("quotes").select("*").eq("user_id", user_id)
+        query = quotes_repo.query().select(columns, count=page.count_method).eq("user_id", user_id)
 
         if status_filter:
             # Frontend translates Hebrew to English before sending
@@ -93,16 +133,16 @@ async def list_quotes(
         if client_id:
             query = query.eq("client_id", client_id)
 
-        # Get total count
-        count_response = query.execute()
-        total = len(count_response.data)
+        if search:
+            query = apply_search(query, search, phone=True)
 
-        # Get paginated data
-        response = query.order("created_at", desc=True).range(skip, skip + limit - 1).execute()
+        # Single bounded query - total comes from the PostgREST count header
+        result = await paginate(query, page)
 
-        logger.info(f"[list_quotes] Found {len(response.data)} quotes for user {user_id} (total: {total})")
+        logger.info(f"[list_quotes] Found {len(result.items)} quotes for user {user_id} (total: {result.total})")
 
-        return QuoteList(quotes=response.data, total=total)
+        # Rows straight from PostgREST - skip QuoteList/QuoteResponse re-validation when enabled
+        return trusted_response({"quotes": result.items, "total": result.total, "next_cursor": result.next_cursor})
 
     except HTTPException:
         raise
@@ -114,27 +154,116 @@ async def list_quotes(
         )
 
 
-@router.get("/{quote_id}", response_model=QuoteResponse)
+@router.get("/summary", response_model=QuoteSummary)
+async def get_quote_summary(user_id: str = Depends(get_current_user)):
+    """
+    Quote counts per status and total / average value for the current user
+
+    - Read from per-user counters a database trigger keeps current (one row per status),
+      so the cost doesn't grow with the number of quotes
+    """
+    try:
+        return await quote_stats.summary(user_id)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting quote summary: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get quote summary: {str(e)}"
+        )
+
+
+# Export formats -> (media type, file extension)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "zip": ("application/zip", "zip"),
+}
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media: {} for media, _ in EXPORT_FORMATS.values()}}}
+)
+@no_compression
+async def export_quotes(
+    export_format: Literal["ndjson", "csv", "zip"] = Query("ndjson", alias="format"),
+    user_id: str = Depends(get_current_user),
+    columns: str = Depends(quote_fields),
+    status_filter: Optional[str] = None,
+    client_id: Optional[str] = None,
+    created_from: Optional[date] = Query(None, description="Quotes created on or after this date"),
+    created_to: Optional[date] = Query(None, description="Quotes created before this date")
+):
+    """
+    Export quotes as a stream
+
+    - ndjson: one quote per line (?fields=... selects the columns)
+    - csv: one row of totals per quote
+    - zip: one PDF per quote, rendered in the PDF worker pool
+    - Read page by page and written out as it goes, so memory stays flat however many quotes match
+    """
+    try:
+        if export_format == "csv":
+            columns = ",".join(["id", *export_service.CSV_COLUMNS])
+        elif export_format == "zip":
+            columns = "*"
+
+        def build_query():
+            query = quotes_repo.query().select(columns).eq("user_id", user_id)
+            if status_filter:
+                query = query.eq("status", status_filter)
+            if client_id:
+                query = query.eq("client_id", client_id)
+            if created_from:
+                query = query.gte("created_at", created_from.isoformat())
+            if created_to:
+                query = query.lt("created_at", created_to.isoformat())
+            return query
+
+        chunks = {
+            "ndjson": export_service.ndjson_rows,
+            "csv": export_service.csv_rows,
+            "zip": export_service.zip_of_pdfs,
+        }[export_format](build_query)
+
+        media_type, extension = EXPORT_FORMATS[export_format]
+        logger.info(f"[export_quotes] Exporting quotes for user {user_id} as {export_format}")
+        return StreamingResponse(
+            await export_service.started(chunks),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="quotes.{extension}"'}
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error exporting quotes: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to export quotes: {str(e)}"
+        )
+
+
+@router.get("/{quote_id}", response_model=QuoteResponse, response_model_exclude_unset=True)
 async def get_quote(
     quote_id: str,
-    user_id: str = Depends(get_current_user)
+    user_id: str = Depends(get_current_user),
+    columns: str = Depends(quote_fields)
 ):
     """
     Get a specific quote by ID
 
-    - Returns full quote with all fields including items (JSONB)
+    - Returns full quote with all fields including items (JSONB), or only ?fields=...
     - Verifies quote belongs to user
     """
-    supabase = get_supabase_admin()
-
     try:
-        response = supabase.table("quotes")\
-            .select("*")\
-            .eq("id", quote_id)\
-            .eq("user_id", user_id)\
-            .execute()
+        quote = await quotes_repo.find_one(columns, id=quote_id, user_id=user_id)
 
-        if not response.data:
+        if not quote:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Quote not found"
@@ -142,7 +271,7 @@ async def get_quote(
 
         logger.info(f"[get_quote] Retrieved quote {quote_id} for user {user_id}")
 
-        return response.data[0]
+        return trusted_response(quote)
 
     except HTTPException:
         raise
@@ -154,6 +283,162 @@ async def get_quote(
         )
 
 
+@router.get(
+    "/{quote_id}/pdf",
+    response_class=Response,
+    responses={200: {"content": {"application/pdf": {}}, "description": "The quote as a PDF"}}
+)
+@no_compression
+async def get_quote_pdf(
+    quote_id: str,
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Download a quote as PDF
+
+    - Rendered in a worker process, never on the event loop
+    - Cached per quote version (id + updated_at): repeat downloads skip the
+      render and read only the version columns
+    """
+    try:
+        version = await quotes_repo.find_one_or_404(
+            "id,updated_at", not_found="Quote not found", id=quote_id, user_id=user_id
+        )
+
+        pdf = pdf_service.pdf_cache.get((version["id"], version.get("updated_at")))
+        if pdf is None:
+            quote = await quotes_repo.find_one_or_404(not_found="Quote not found", id=quote_id, user_id=user_id)
+            pdf = await pdf_service.get_quote_pdf(quote)
+            logger.info(f"[get_quote_pdf] Rendered PDF for quote {quote_id} ({len(pdf)} bytes)")
+
+        filename = f"quote-{quote_id}.pdf"
+        return Response(
+            content=pdf,
+            media_type="application/pdf",
+            headers={"Content-Disposition": f'inline; filename="{filename}"', "Cache-Control": "private, max-age=0"}
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating quote PDF: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate quote PDF: {str(e)}"
+        )
+
+
+@router.post(
+    "/{quote_id}/duplicate",
+    response_model=QuoteResponse,
+    response_model_exclude_unset=True,
+    status_code=status.HTTP_201_CREATED
+)
+async def duplicate_quote(
+    quote_id: str,
+    overrides: Optional[QuoteCopyRequest] = None,
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Copy a quote as a new draft
+
+    - Copied inside the database in one call - items and the other JSONB columns never leave it
+    - Optional body sets the title, client or project of the copy
+    - Gets a new quote number; status, sent/approved dates and timestamps start fresh
+    - Returns the new quote's summary columns (as ?fields=summary)
+    """
+    try:
+        created = await quote_copy.duplicate(
+            user_id, quote_id, overrides.model_dump(exclude_none=True) if overrides else {}
+        )
+
+        if not created:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Quote not found"
+            )
+
+        logger.info(f"[duplicate_quote] Duplicated quote {quote_id} as {created.get('id')}")
+
+        return created
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error duplicating quote: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to duplicate quote: {str(e)}"
+        )
+
+
+@router.get("/{quote_id}/revisions", response_model=QuoteRevisionList)
+async def list_quote_revisions(
+    quote_id: str,
+    user_id: str = Depends(get_current_user),
+    page: PageParams = Depends()
+):
+    """
+    List a quote's revisions, newest first
+
+    - Recorded by the database on every change, whichever path made it
+    - Revision 1 is the quote as it was before its first recorded change; a quote never changed has none listed
+    - Metadata only; fetch a revision's content with /revisions/{revision}
+    """
+    try:
+        query = quote_revisions_repo.query().select(
+            "id,revision,kind,changed,updated_at,created_at", count=page.count_method
+        ).eq("quote_id", quote_id).eq("user_id", user_id)
+
+        result = await paginate(query, page, order_column="revision")
+
+        return {"revisions": result.items, "total": result.total, "next_cursor": result.next_cursor}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error listing quote revisions: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to list quote revisions: {str(e)}"
+        )
+
+
+@router.get("/{quote_id}/revisions/{revision}", response_model=QuoteResponse, response_model_exclude_unset=True)
+async def get_quote_revision(
+    quote_id: str,
+    revision: int,
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Get a quote as it was at a revision
+
+    - Rebuilt from the nearest full snapshot plus the deltas after it
+      (a bounded number - see quote_revisions.SNAPSHOT_INTERVAL)
+    """
+    try:
+        quote = await quote_revisions.materialize(user_id, quote_id, revision)
+
+        if not quote:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Quote revision not found"
+            )
+
+        logger.info(f"[get_quote_revision] Materialized revision {revision} of quote {quote_id}")
+
+        return trusted_response(quote)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting quote revision: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get quote revision: {str(e)}"
+        )
+
+
 @router.put("/{quote_id}", response_model=QuoteResponse)
 async def update_quote(
     quote_id: str,
@@ -166,48 +451,36 @@ async def update_quote(
     - Only provided fields will be updated
     - updated_at timestamp automatically updated by trigger
     - Supports updating items (JSONB array)
+    - Totals are re-derived when a pricing input changes; client-sent totals are ignored
+    - Ownership is checked by the update itself (404 if no row matched)
     """
-    supabase = get_supabase_admin()
-
     try:
-        # Check if quote exists and belongs to user
-        existing = supabase.table("quotes")\
-            .select("id")\
-            .eq("id", quote_id)\
-            .eq("user_id", user_id)\
-            .execute()
-
-        if not existing.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Quote not found"
-            )
-
         # Update quote - exclude unset and None values
         update_data = quote.model_dump(exclude_unset=True, exclude_none=True)
+        for field in pricing_service.PRICED_FIELDS:
+            update_data.pop(field, None)
+
+        if pricing_service.touches_pricing(update_data):
+            # Read only the pricing inputs the update doesn't carry
+            missing = [f for f in pricing_service.PRICING_INPUT_FIELDS if f not in update_data]
+            stored = None
+            if missing:
+                stored = await quotes_repo.find_one_or_404(
+                    ",".join(missing), not_found="Quote not found", id=quote_id, user_id=user_id
+                )
+            inputs = pricing_service.merge_pricing_inputs(stored, update_data)
+            update_data.update(pricing_service.priced_fields(inputs))
 
         if not update_data:
             # No updates provided, return existing quote
-            response = supabase.table("quotes").select("*").eq("id", quote_id).execute()
-            return response.data[0]
+            return await quotes_repo.find_one_or_404(not_found="Quote not found", id=quote_id, user_id=user_id)
 
         # Serialize all complex types (date, datetime, Decimal, UUID) to JSON-compatible types
         payload = jsonable_encoder(update_data, exclude_none=True)
 
         logger.info(f"[update_quote] Updating quote {quote_id}: {len(payload)} fields")
 
-        response = supabase.table("quotes")\
-            .update(payload)\
-            .eq("id", quote_id)\
-            .execute()
-
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update quote - no data returned"
-            )
-
-        return response.data[0]
+        return await quotes_repo.update_one(payload, not_found="Quote not found", id=quote_id, user_id=user_id)
 
     except HTTPException:
         raise
@@ -219,6 +492,40 @@ async def update_quote(
         )
 
 
+@router.patch("/{quote_id}", response_model=QuotePatchResult, response_model_exclude_none=True)
+async def patch_quote(
+    quote_id: str,
+    ops: List[QuotePatchOp] = Body(..., min_length=1, max_length=500),
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Apply JSON Patch (RFC 6902) operations to a quote's JSONB columns
+
+    - Body is the array of operations, e.g. `[{"op": "replace", "path": "/items/3/quantity", "value": 2}]`
+    - Applied in order, atomically in the database: all operations apply or none do
+    - A failed `test` operation is 409, a path that doesn't exist 422
+    - Patches to pricing inputs are written together with the re-derived totals (409 if the quote keeps changing meanwhile)
+    - Returns the new updated_at, plus the re-derived totals when a pricing input changed
+    """
+    try:
+        result = await quote_patch.patch_quote(
+            user_id, quote_id, [op.model_dump(by_alias=True, exclude_unset=True) for op in ops]
+        )
+
+        logger.info(f"[patch_quote] Applied {len(ops)} ops to quote {quote_id}")
+
+        return result
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error patching quote: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to patch quote: {str(e)}"
+        )
+
+
 @router.delete("/{quote_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_quote(
     quote_id: str,
@@ -228,26 +535,10 @@ async def delete_quote(
     Delete a quote
 
     - Permanently deletes the quote
-    - Verifies quote belongs to user
+    - Verifies quote belongs to user (404 if no row matched)
     """
-    supabase = get_supabase_admin()
-
     try:
-        # Check if quote exists and belongs to user
-        existing = supabase.table("quotes")\
-            .select("id")\
-            .eq("id", quote_id)\
-            .eq("user_id", user_id)\
-            .execute()
-
-        if not existing.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Quote not found"
-            )
-
-        # Delete quote
-        supabase.table("quotes").delete().eq("id", quote_id).execute()
+        await quotes_repo.delete_one(not_found="Quote not found", id=quote_id, user_id=user_id)
 
         logger.info(f"[delete_quote] Deleted quote {quote_id} for user {user_id}")
 
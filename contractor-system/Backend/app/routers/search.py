@@ -0,0 +1,91 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.models.search import QuoteSearchResults, ClientSearchResults, CatalogSearchResults
+from app.middleware.auth_middleware import get_current_user, get_optional_user
+from app.repositories import search
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Query text: Hebrew or English words (final letters, niqqud and punctuation
+# don't matter), or a phone number in any format
+SearchTerm = Query(..., min_length=1, max_length=200, description="Words to find, or a phone number")
+
+
+@router.get("/quotes", response_model=QuoteSearchResults, response_model_exclude_unset=True)
+async def search_quotes(
+    q: str = SearchTerm,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Search the user's quotes, best match first
+
+    - Matches title, quote number, project, client name/email, item names, and client phone
+    - Returns summary columns plus `rank`; page with skip/limit while `has_more`
+    """
+    try:
+        results, has_more = await search.search_quotes(user_id, q, limit, skip)
+        return {"results": results, "has_more": has_more}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching quotes: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search quotes: {str(e)}"
+        )
+
+
+@router.get("/clients", response_model=ClientSearchResults)
+async def search_clients(
+    q: str = SearchTerm,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Search the user's clients, best match first
+
+    - Matches name, company, email, city, address, and phone
+    """
+    try:
+        results, has_more = await search.search_clients(user_id, q, limit, skip)
+        return {"results": results, "has_more": has_more}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching clients: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search clients: {str(e)}"
+        )
+
+
+@router.get("/catalog", response_model=CatalogSearchResults)
+async def search_catalog(
+    q: str = SearchTerm,
+    category_id: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    user_id: Optional[str] = Depends(get_optional_user)
+):
+    """
+    Search active catalog items by name and description, best match first
+    """
+    try:
+        results, has_more = await search.search_catalog_items(q, category_id, limit, skip)
+        return {"results": results, "has_more": has_more}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching catalog: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search catalog: {str(e)}"
+        )
@@ -1,26 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
 from app.models.template import QuoteTemplateCreate, QuoteTemplateUpdate, QuoteTemplateResponse, QuoteTemplateList
+from app.models.quote import QuoteCopyRequest, QuoteResponse, QUOTE_SUMMARY_FIELDS
 from app.middleware.auth_middleware import get_current_user
-from app.database import get_supabase
+from app.repositories import quotes_repo, templates_repo, template_items_repo
+from app.repositories.pagination import PageParams, paginate
+from app.repositories.fields import FieldSelector
+from app.services import template_service
+from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+template_fields = FieldSelector(QuoteTemplateResponse, embeds={"items": "template_items(*)"})
+
 
 @router.post("/", response_model=QuoteTemplateResponse, status_code=status.HTTP_201_CREATED)
 async def create_template(template: QuoteTemplateCreate, user_id: str = Depends(get_current_user)):
     """Create a new quote template"""
-    supabase = get_supabase()
     try:
         template_data = template.model_dump(exclude={"items"})
         template_data["user_id"] = user_id
-        template_response = supabase.table("quote_templates").insert(template_data).execute()
-        created_template = template_response.data[0]
+        created = await templates_repo.insert(template_data)
+        created_template = created[0]
         if template.items:
             items_data = [{**item.model_dump(), "template_id": created_template["id"]} for item in template.items]
-            items_response = supabase.table("template_items").insert(items_data).execute()
-            created_template["items"] = items_response.data
+            created_template["items"] = await template_items_repo.insert(items_data)
         else:
             created_template["items"] = []
         return created_template
@@ -29,36 +35,33 @@ async def create_template(template: QuoteTemplateCreate, user_id: str = Depends(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create template")
 
 
-@router.get("/", response_model=QuoteTemplateList)
+@router.get("/", response_model=QuoteTemplateList, response_model_exclude_unset=True)
 async def list_templates(
     user_id: str = Depends(get_current_user),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100)
+    columns: str = Depends(template_fields),
+    page: PageParams = Depends()
 ):
     """List all quote templates for the current user"""
-    supabase = get_supabase()
     try:
-        query = supabase.table("quote_templates").select("*, template_items(*)").eq("user_id", user_id)
-        count_response = query.execute()
-        total = len(count_response.data)
-        response = query.order("created_at", desc=True).range(skip, skip + limit - 1).execute()
-        for template in response.data:
+        query = templates_repo.query().select(columns, count=page.count_method).eq("user_id", user_id)
+        result = await paginate(query, page)
+        for template in result.items:
             template["items"] = template.pop("template_items", [])
-        return QuoteTemplateList(templates=response.data, total=total)
+        return QuoteTemplateList(templates=result.items, total=result.total, next_cursor=result.next_cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing templates: {e}", exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to list templates")
 
 
-@router.get("/{template_id}", response_model=QuoteTemplateResponse)
-async def get_template(template_id: str, user_id: str = Depends(get_current_user)):
+@router.get("/{template_id}", response_model=QuoteTemplateResponse, response_model_exclude_unset=True)
+async def get_template(template_id: str, user_id: str = Depends(get_current_user), columns: str = Depends(template_fields)):
     """Get a specific quote template by ID"""
-    supabase = get_supabase()
     try:
-        response = supabase.table("quote_templates").select("*, template_items(*)").eq("id", template_id).eq("user_id", user_id).execute()
-        if not response.data:
+        template = await templates_repo.find_one(columns, id=template_id, user_id=user_id)
+        if not template:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
-        template = response.data[0]
         template["items"] = template.pop("template_items", [])
         return template
     except HTTPException:
@@ -68,15 +71,51 @@ async def get_template(template_id: str, user_id: str = Depends(get_current_user
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to get template")
 
 
+@router.post(
+    "/{template_id}/instantiate",
+    response_model=QuoteResponse,
+    response_model_exclude_unset=True,
+    status_code=status.HTTP_201_CREATED
+)
+async def instantiate_template(
+    template_id: str,
+    overrides: Optional[QuoteCopyRequest] = None,
+    user_id: str = Depends(get_current_user)
+):
+    """Start a new draft quote from a template
+
+    The template and its items are read in one query and the priced quote is
+    inserted in another; only the new quote's summary columns are returned.
+    """
+    try:
+        template = await templates_repo.find_one(
+            "id,name,description,template_items(*)", id=template_id, user_id=user_id
+        )
+        if not template:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
+
+        quote_data = template_service.quote_from_template(
+            template,
+            template.get("template_items") or [],
+            overrides.model_dump(exclude_none=True) if overrides else {}
+        )
+        quote_data["user_id"] = user_id
+
+        created = await quotes_repo.insert(jsonable_encoder(quote_data, exclude_none=True), columns=",".join(QUOTE_SUMMARY_FIELDS))
+        logger.info(f"Instantiated template {template_id} as quote {created[0].get('id')} ({len(quote_data['items'])} items)")
+        return created[0]
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error instantiating template: {e}", exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to instantiate template")
+
+
 @router.delete("/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_template(template_id: str, user_id: str = Depends(get_current_user)):
     """Delete a quote template"""
-    supabase = get_supabase()
     try:
-        existing = supabase.table("quote_templates").select("*").eq("id", template_id).eq("user_id", user_id).execute()
-        if not existing.data:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
-        supabase.table("quote_templates").delete().eq("id", template_id).execute()
+        await templates_repo.delete_one(not_found="Template not found", id=template_id, user_id=user_id)
         return None
     except HTTPException:
         raise
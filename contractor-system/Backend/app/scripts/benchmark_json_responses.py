@@ -0,0 +1,116 @@
+"""
+Benchmark the FAST_JSON_RESPONSES path (app/utils/responses.py) against the
+default response_model path, for quote reads.
+
+Runs the app in-process against a mocked PostgREST serving synthetic quotes
+(no database or network needed, but the usual settings must be present):
+
+    python -m app.scripts.benchmark_json_responses [--items 300] [--rounds 50]
+
+Reports the time to serialize one quote, and per-request times for
+GET /api/quotes/{id} and GET /api/quotes/?limit=20 with the setting off and on.
+Responses are requested uncompressed, so compression doesn't skew the numbers.
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app import database
+from app.config import settings
+from app.main import app
+from app.middleware.auth_middleware import get_current_user
+from app.models.quote import QuoteResponse
+from app.utils.responses import dumps, orjson
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def make_quote(index: int, items: int) -> dict:
+    """A quote row shaped like the quote builder's (Hebrew names, camelCase items)"""
+    return {
+        "id": f"00000000-0000-0000-0000-{index:012d}",
+        "user_id": USER_ID,
+        "quote_number": f"Q-{index}",
+        "created_at": "2024-01-01T10:00:00+00:00",
+        "updated_at": "2024-01-02T10:00:00+00:00",
+        "title": "שיפוץ דירה",
+        "status": "draft",
+        "client_name": "ישראל ישראלי",
+        "total_amount": 100000.0,
+        "final_amount": 95000.0,
+        "items": [
+            {
+                "id": f"item_{index}_{i}",
+                "name": f"פריט עבודה {i}",
+                "description": "תיאור מפורט של העבודה " * 3,
+                "categoryId": "cat_paint_plaster",
+                "quantity": i % 7 + 1,
+                "unitPrice": 120.5,
+                "totalPrice": 120.5 * (i % 7 + 1),
+                "totalCost": 80.0 * (i % 7 + 1),
+                "breakdown": {"labor": 50.0, "materials": 30.0, "rooms": [{"name": "סלון", "area": 20}]},
+            }
+            for i in range(items)
+        ],
+        "payment_terms": [{"milestone": "מקדמה", "percentage": 30}],
+        "category_timings": {"cat_paint_plaster": {"startDate": "2024-02-01", "endDate": "2024-02-10"}},
+    }
+
+
+def timed(fn, rounds: int) -> float:
+    """Mean milliseconds per call, after one warm-up call"""
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=300, help="items per quote")
+    parser.add_argument("--rounds", type=int, default=50, help="timed repetitions per measurement")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    quotes = [make_quote(i, args.items) for i in range(20)]
+    single = json.dumps([quotes[0]]).encode()
+    page = json.dumps(quotes).encode()
+
+    def postgrest(request: httpx.Request) -> httpx.Response:
+        body = page if request.url.params.get("limit") else single
+        return httpx.Response(200, content=body, headers={"content-type": "application/json", "content-range": "0-19/20"})
+
+    for client in (database.async_supabase, database.async_supabase_admin):
+        client.session = httpx.AsyncClient(
+            base_url=client.session.base_url, headers=client.session.headers, transport=httpx.MockTransport(postgrest)
+        )
+    app.dependency_overrides[get_current_user] = lambda: USER_ID
+    http = TestClient(app, headers={"Accept-Encoding": "identity"})
+
+    print(f"{args.items} items per quote, {len(single) // 1024} KB each; json library: {'orjson' if orjson else 'stdlib json'}")
+    print(f"serialize one quote   response_model: {timed(lambda: JSONResponse(jsonable_encoder(QuoteResponse.model_validate(quotes[0]))), args.rounds):7.2f} ms"
+          f"   fast: {timed(lambda: dumps(quotes[0]), args.rounds):7.2f} ms")
+
+    for label, path in (("GET /api/quotes/{id}", f"/api/quotes/{quotes[0]['id']}"), ("GET /api/quotes/?limit=20", "/api/quotes/?limit=20")):
+        results = []
+        for fast in (False, True):
+            settings.FAST_JSON_RESPONSES = fast
+            assert http.get(path).status_code == 200
+            results.append(timed(lambda: http.get(path), args.rounds))
+        print(f"{label:<25} response_model: {results[0]:7.2f} ms   fast: {results[1]:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Print the SQL for every database object the backend relies on - run this one
+script to set up (or update) all of them:
+
+- user_profiles schema: the defaults_version column, nullable pricebook columns
+- pricebook_patch: per-item pricebook edits
+- quotes_apply_pricing: writes re-priced quotes back (re-pricing job)
+- quotes_repricing_drafts: drafts using given pricebook items (re-pricing job)
+- quotes_patch: JSON Patch for quotes
+- quotes_duplicate: quote duplication
+- quote_revisions: revision history table, diff functions and trigger
+- quote_stats: per-user quote counters and their trigger
+- search: search functions and indexes
+
+PostgREST can't run DDL, so paste the output into the Supabase SQL editor
+(or pipe it to psql) once per environment, and again whenever it changes:
+
+    python -m app.scripts.install_database_functions > database_functions.sql
+
+Every statement is idempotent, so re-running the whole output is safe.
+
+With --inherit, also print the one-off statements that switch existing
+profiles to the shared default pricebook (copy-on-write): columns still equal
+to the default are reset to NULL, like those of new profiles.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.repositories.defaults import default_pricebook, inherit_sql, profile_schema_sql
+from app.repositories.pricebook import PRICEBOOK_PATCH_SQL
+from app.repositories.quote_copy import QUOTES_DUPLICATE_SQL
+from app.repositories.quote_patch import QUOTES_PATCH_SQL
+from app.repositories.quote_pricing import QUOTES_APPLY_PRICING_SQL, QUOTES_REPRICING_DRAFTS_SQL
+from app.repositories.quote_revisions import QUOTE_REVISIONS_SQL
+from app.repositories.quote_stats import QUOTE_STATS_SQL
+from app.repositories.search import SEARCH_SQL
+
+
+if __name__ == "__main__":
+    print(profile_schema_sql())
+    print()
+    print(PRICEBOOK_PATCH_SQL.strip())
+    print()
+    print(QUOTES_APPLY_PRICING_SQL.strip())
+    print()
+    print(QUOTES_REPRICING_DRAFTS_SQL.strip())
+    print()
+    print(QUOTES_PATCH_SQL.strip())
+    print()
+    print(QUOTES_DUPLICATE_SQL.strip())
+    print()
+    print(QUOTE_REVISIONS_SQL.strip())
+    print()
+    print(QUOTE_STATS_SQL.strip())
+    print()
+    print(SEARCH_SQL.strip())
+    if "--inherit" in sys.argv:
+        print()
+        print(inherit_sql(default_pricebook))
@@ -1,10 +1,12 @@
 from datetime import datetime
 from app.database import get_supabase_admin, get_supabase
-from app.models.user import UserCreate, UserLogin, Token
+from app.models.user import UserCreate, UserLogin, Token, PROFILE_CORE_FIELDS, PROFILE_SECTIONS
+from app.repositories import profile_cache, user_profiles_repo
+from app.repositories.defaults import PRICEBOOK_COLUMNS, SECTIONS, default_pricebook
+from typing import List, Optional
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 import logging
-import json
-import os
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +15,8 @@ logger = logging.getLogger(__name__)
 # - Backend endpoints below are kept for compatibility but may not be actively used
 # - Supabase handles password hashing, token generation, and session management
 # - Tokens are issued by Supabase and validated in auth_middleware.py
+# - Table access goes through the async repository layer; the sync Supabase Auth
+#   calls run in the threadpool so they don't block the event loop
 
 
 async def register_user(user_data: UserCreate) -> dict:
@@ -25,8 +29,8 @@ async def register_user(user_data: UserCreate) -> dict:
 
     try:
         # Check if user already exists
-        existing = supabase.table("user_profiles").select("*").eq("email", user_data.email).execute()
-        if existing.data:
+        existing = await user_profiles_repo.find_one("id", email=user_data.email)
+        if existing:
             logger.warning(f"Registration attempt for existing email: {user_data.email}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -35,7 +39,7 @@ async def register_user(user_data: UserCreate) -> dict:
 
         # Create user in Supabase Auth
         logger.info(f"Creating new user in Supabase Auth: {user_data.email}")
-        auth_response = supabase.auth.sign_up({
+        auth_response = await run_in_threadpool(supabase.auth.sign_up, {
             "email": user_data.email,
             "password": user_data.password
         })
@@ -50,18 +54,7 @@ async def register_user(user_data: UserCreate) -> dict:
         user_id = auth_response.user.id
         logger.info(f"User created successfully in Auth: {user_id}")
 
-        # Load default pricing data for new users
-        try:
-            default_data_path = os.path.join(os.path.dirname(__file__), '../data/default_user_data.json')
-            with open(default_data_path, 'r', encoding='utf-8') as f:
-                default_data = json.load(f)
-            logger.info(f"Loaded default user data from {default_data_path}")
-        except Exception as e:
-            logger.error(f"Failed to load default user data: {e}")
-            # Continue with empty defaults if file is not available
-            default_data = {}
-
-        # Create user profile in user_profiles table with default pricing data
+        # Create user profile in user_profiles table
         user_profile = {
             "auth_user_id": user_id,
             "email": user_data.email,
@@ -71,28 +64,20 @@ async def register_user(user_data: UserCreate) -> dict:
             "contract_template": "",
             "contractor_commitments": "",
             "client_commitments": "",
-            # Add default pricing data for all categories
-            "plumbing_subcontractor_items": default_data.get("plumbing_subcontractor_items", []),
-            "plumbing_defaults": default_data.get("plumbing_defaults", {"desiredProfitPercent": 30}),
-            "electrical_subcontractor_items": default_data.get("electrical_subcontractor_items", []),
-            "electrical_defaults": default_data.get("electrical_defaults", {"desiredProfitPercent": 40}),
-            "construction_subcontractor_items": default_data.get("construction_subcontractor_items", []),
-            "construction_defaults": default_data.get("construction_defaults", {"desiredProfitPercent": 30, "workerCostPerUnit": 1000}),
-            "demolition_items": default_data.get("demolition_items", []),
-            "demolition_defaults": default_data.get("demolition_defaults", {"laborCostPerDay": 1000, "profitPercent": 40}),
-            "tiling_items": default_data.get("tiling_items", []),
-            "tiling_user_defaults": default_data.get("tiling_user_defaults", {}),
-            "paint_items": default_data.get("paint_items", []),
-            "paint_user_defaults": default_data.get("paint_user_defaults", {})
+            # Inherit the shared default pricebook (NULL columns, filled in by merge())
+            **dict.fromkeys(PRICEBOOK_COLUMNS),
+            "defaults_version": default_pricebook.version
         }
 
-        profile_response = supabase.table("user_profiles").insert(user_profile).execute()
-        logger.info(f"User profile created for: {user_id} with default data - {len(default_data.get('plumbing_subcontractor_items', []))} plumbing items, {len(default_data.get('electrical_subcontractor_items', []))} electrical items, {len(default_data.get('construction_subcontractor_items', []))} construction items, {len(default_data.get('demolition_items', []))} demolition items, {len(default_data.get('tiling_items', []))} tiling items, {len(default_data.get('paint_items', []))} paint items")
+        created_profiles = await user_profiles_repo.insert(user_profile)
+        if created_profiles:
+            profile_cache.put(created_profiles[0])
+        logger.info(f"User profile created for: {user_id} (default pricebook v{default_pricebook.version})")
 
         # Return Supabase session tokens (if available from auth_response)
         # Note: Supabase returns session with access_token and refresh_token
         session_data = {
-            "user": profile_response.data[0] if profile_response.data else user_profile,
+            "user": default_pricebook.merge(created_profiles[0] if created_profiles else user_profile),
             "token_type": "bearer"
         }
 
@@ -128,7 +113,7 @@ async def login_user(credentials: UserLogin) -> Token:
     try:
         # Use Supabase Auth for login (it handles password verification)
         logger.info(f"Attempting login for user: {credentials.email}")
-        auth_response = supabase.auth.sign_in_with_password({
+        auth_response = await run_in_threadpool(supabase.auth.sign_in_with_password, {
             "email": credentials.email,
             "password": credentials.password
         })
@@ -143,10 +128,10 @@ async def login_user(credentials: UserLogin) -> Token:
         user_id = auth_response.user.id
         logger.info(f"User authenticated successfully: {user_id}")
 
-        # Get user profile from database
-        response = supabase.table("user_profiles").select("*").eq("auth_user_id", user_id).execute()
+        # Get user profile (cached - the frontend fetches /me right after login)
+        profile = await profile_cache.get(user_id)
 
-        if not response.data:
+        if not profile:
             logger.error(f"User profile not found for authenticated user: {user_id}")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -154,9 +139,9 @@ async def login_user(credentials: UserLogin) -> Token:
             )
 
         # Update last login date
-        supabase.table("user_profiles").update({
+        await profile_cache.update(user_id, {
             "last_login_date": datetime.utcnow().isoformat()
-        }).eq("auth_user_id", user_id).execute()
+        })
 
         # Return Supabase session tokens
         if not hasattr(auth_response, 'session') or not auth_response.session:
@@ -193,16 +178,16 @@ async def get_user_by_id(user_id: str, auto_create: bool = False) -> dict:
     supabase = get_supabase_admin()  # Use admin client
 
     try:
-        response = supabase.table("user_profiles").select("*").eq("auth_user_id", user_id).execute()
+        user = await profile_cache.get(user_id)
 
-        if not response.data:
+        if not user:
             # If auto_create is enabled, create a basic profile
             if auto_create:
                 logger.info(f"Auto-creating profile for user: {user_id}")
                 
                 # Get user data from Supabase Auth
                 try:
-                    auth_user = supabase.auth.admin.get_user_by_id(user_id)
+                    auth_user = await run_in_threadpool(supabase.auth.admin.get_user_by_id, user_id)
                     email = auth_user.user.email if auth_user and auth_user.user else None
                 except Exception as auth_error:
                     logger.warning(f"Could not fetch auth user details: {auth_error}")
@@ -215,17 +200,7 @@ async def get_user_by_id(user_id: str, auto_create: bool = False) -> dict:
                         detail="User not found and cannot be auto-created (missing email)"
                     )
 
-                # Load default pricing data for new users
-                try:
-                    default_data_path = os.path.join(os.path.dirname(__file__), '../data/default_user_data.json')
-                    with open(default_data_path, 'r', encoding='utf-8') as f:
-                        default_data = json.load(f)
-                    logger.info(f"Loaded default user data for auto-created profile")
-                except Exception as e:
-                    logger.error(f"Failed to load default user data: {e}")
-                    default_data = {}
-
-                # Create basic user profile with default pricing data
+                # Create basic user profile
                 user_profile = {
                     "auth_user_id": user_id,
                     "email": email,
@@ -235,26 +210,17 @@ async def get_user_by_id(user_id: str, auto_create: bool = False) -> dict:
                     "contract_template": "",
                     "contractor_commitments": "",
                     "client_commitments": "",
-                    # Add default pricing data for all categories
-                    "plumbing_subcontractor_items": default_data.get("plumbing_subcontractor_items", []),
-                    "plumbing_defaults": default_data.get("plumbing_defaults", {"desiredProfitPercent": 30}),
-                    "electrical_subcontractor_items": default_data.get("electrical_subcontractor_items", []),
-                    "electrical_defaults": default_data.get("electrical_defaults", {"desiredProfitPercent": 40}),
-                    "construction_subcontractor_items": default_data.get("construction_subcontractor_items", []),
-                    "construction_defaults": default_data.get("construction_defaults", {"desiredProfitPercent": 30, "workerCostPerUnit": 1000}),
-                    "demolition_items": default_data.get("demolition_items", []),
-                    "demolition_defaults": default_data.get("demolition_defaults", {"laborCostPerDay": 1000, "profitPercent": 40}),
-                    "tiling_items": default_data.get("tiling_items", []),
-                    "tiling_user_defaults": default_data.get("tiling_user_defaults", {}),
-                    "paint_items": default_data.get("paint_items", []),
-                    "paint_user_defaults": default_data.get("paint_user_defaults", {})
+                    # Inherit the shared default pricebook (NULL columns, filled in by merge())
+                    **dict.fromkeys(PRICEBOOK_COLUMNS),
+                    "defaults_version": default_pricebook.version
                 }
                 
-                profile_response = supabase.table("user_profiles").insert(user_profile).execute()
+                created_profiles = await user_profiles_repo.insert(user_profile)
                 
-                if profile_response.data:
+                if created_profiles:
+                    profile_cache.put(created_profiles[0])
                     logger.info(f"Profile auto-created successfully for: {user_id}")
-                    return profile_response.data[0]
+                    return default_pricebook.merge(created_profiles[0])
                 else:
                     logger.error(f"Failed to auto-create profile for: {user_id}")
                     raise HTTPException(
@@ -267,7 +233,6 @@ async def get_user_by_id(user_id: str, auto_create: bool = False) -> dict:
                     detail="User not found"
                 )
 
-        user = response.data[0]
         return user
 
     except HTTPException:
@@ -280,15 +245,82 @@ async def get_user_by_id(user_id: str, auto_create: bool = False) -> dict:
         )
 
 
+def profile_columns(sections: Optional[str]) -> Optional[List[str]]:
+    """Columns for a `sections=` list - the core plus each section's columns
+
+    Returns None for `all` (the whole row). Unknown sections are a 400.
+    """
+    groups = {
+        **PROFILE_SECTIONS,
+        "pricebook": list(PRICEBOOK_COLUMNS),
+        **{name: list(columns) for name, columns in SECTIONS.items()}
+    }
+
+    columns = list(PROFILE_CORE_FIELDS)
+    for name in (s.strip() for s in (sections or "").split(",")):
+        if not name:
+            continue
+        if name == "all":
+            return None
+        if name not in groups:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown profile section '{name}'"
+            )
+        columns.extend(groups[name])
+
+    return list(dict.fromkeys(columns))
+
+
+async def get_profile_sections(user_id: str, sections: Optional[str] = None) -> dict:
+    """Current user's profile: the compact core plus any requested sections
+
+    Sections without pricebook columns are projected from a cached profile
+    when there is one. Pricebook sections are always read fresh: they can be
+    written outside this process's cache (other workers, the database
+    functions), and editors re-read them right after saving. Profiles that
+    don't exist yet (auto-create) or still need a defaults upgrade take the
+    full get_user_by_id path once.
+    """
+    columns = profile_columns(sections)
+    if columns is None:
+        # The whole row includes the pricebook - refresh the cached copy
+        profile_cache.invalidate(user_id)
+        return await get_user_by_id(user_id, auto_create=True)
+
+    try:
+        needs_pricebook = any(column in PRICEBOOK_COLUMNS for column in columns)
+        profile = None if needs_pricebook else profile_cache.peek(user_id)
+
+        if profile is None:
+            select = columns + ["defaults_version"] if needs_pricebook else columns
+            row = await user_profiles_repo.find_one(",".join(select), auth_user_id=user_id)
+
+            outdated = needs_pricebook and row and (row.get("defaults_version") or 0) < default_pricebook.version
+            if row is None or outdated:
+                profile = await get_user_by_id(user_id, auto_create=True)
+            else:
+                profile = default_pricebook.merge(row)
+
+        return {column: profile[column] for column in columns if column in profile}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get profile sections error: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get user"
+        )
+
+
 async def list_users() -> list:
     """List all user profiles"""
-    supabase = get_supabase_admin()  # Use admin client for consistent database access
-
     try:
         logger.debug("Fetching all user profiles")
-        response = supabase.table("user_profiles").select("*").order("created_at", desc=True).execute()
+        response = await user_profiles_repo.query().select("*").order("created_at", desc=True).execute()
         logger.info(f"Retrieved {len(response.data) if response.data else 0} user profiles")
-        return response.data or []
+        return [default_pricebook.merge(profile) for profile in response.data or []]
 
     except Exception as e:
         logger.error(f"List users error: {e}", exc_info=True)
@@ -300,35 +332,15 @@ async def list_users() -> list:
 
 async def update_user_profile(user_id: str, user_data: dict) -> dict:
     """Update user profile"""
-    supabase = get_supabase_admin()  # Use admin client
-
     try:
-        # Check if user exists
-        existing = supabase.table("user_profiles").select("*").eq("auth_user_id", user_id).execute()
-
-        if not existing.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-
         # Remove sensitive fields that shouldn't be updated via this endpoint
         update_data = {k: v for k, v in user_data.items() if k not in ['id', 'auth_user_id', 'created_at']}
 
         if not update_data:
-            return existing.data[0]
+            return await profile_cache.get_or_404(user_id, not_found="User not found")
 
-        # Update user
-        response = supabase.table("user_profiles").update(update_data).eq("auth_user_id", user_id).execute()
-
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update user"
-            )
-
-        user = response.data[0]
-        return user
+        # Update user - 404 if no profile matched; the returned row refreshes the cache
+        return await profile_cache.update(user_id, update_data, not_found="User not found", columns="*")
 
     except HTTPException:
         raise
@@ -342,22 +354,12 @@ async def update_user_profile(user_id: str, user_data: dict) -> dict:
 
 async def delete_user(user_id: str) -> None:
     """Delete user profile"""
-    supabase = get_supabase_admin()  # Use admin client for database operations
-
     try:
-        # Check if user exists
         logger.info(f"Attempting to delete user: {user_id}")
-        existing = supabase.table("user_profiles").select("*").eq("auth_user_id", user_id).execute()
-
-        if not existing.data:
-            logger.warning(f"Delete attempt for non-existent user: {user_id}")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
 
-        # Delete user profile
-        supabase.table("user_profiles").delete().eq("auth_user_id", user_id).execute()
+        # Delete user profile - 404 if no profile matched
+        await user_profiles_repo.delete_one(not_found="User not found", auth_user_id=user_id)
+        profile_cache.invalidate(user_id)
         logger.info(f"User profile deleted successfully: {user_id}")
 
         # Note: Deleting from Supabase Auth requires admin privileges
@@ -0,0 +1,126 @@
+from app.repositories.pagination import iter_pages
+from app.services import pdf_service
+from app.utils.responses import dumps
+from typing import Any, AsyncIterator, Callable, Dict, List
+import asyncio
+import csv
+import io
+import re
+import time
+import zipfile
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Columns of the CSV export (one row per quote, totals only)
+CSV_COLUMNS = [
+    "quote_number", "created_at", "status", "title",
+    "client_name", "client_email", "client_phone",
+    "project_name", "project_address",
+    "total_amount", "discount_percent", "discount_amount", "price_increase",
+    "final_amount", "tax_percentage", "tax_amount", "total_cost", "profit_amount",
+]
+
+# Rows per database page: PDFs are rendered a page at a time, so keep those
+# pages about as large as the worker pool
+PAGE_SIZE = {"ndjson": 100, "csv": 100, "zip": 8}
+
+_UNSAFE_FILENAME = re.compile(r"[^\w.-]+", re.UNICODE)
+
+
+class _Buffer(io.RawIOBase):
+    """Write-only, unseekable sink that the caller drains after each write
+
+    zipfile writes data descriptors instead of seeking back when the output
+    isn't seekable, so a ZIP can be produced front to back like this.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def ndjson_rows(build_query: Callable[[], Any]) -> AsyncIterator[bytes]:
+    """One JSON object per line, one chunk per database page"""
+    async for rows in iter_pages(build_query, PAGE_SIZE["ndjson"]):
+        yield b"".join(dumps(row) + b"\n" for row in rows)
+
+
+async def csv_rows(build_query: Callable[[], Any]) -> AsyncIterator[bytes]:
+    """CSV with a header row; BOM first so Excel reads the Hebrew as UTF-8"""
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+    out.write("\ufeff")
+    writer.writeheader()
+    async for rows in iter_pages(build_query, PAGE_SIZE["csv"]):
+        writer.writerows(rows)
+        yield out.getvalue().encode("utf-8")
+        out.seek(0)
+        out.truncate()
+    if out.tell():
+        yield out.getvalue().encode("utf-8")
+
+
+async def _pdf(quote: Dict[str, Any]) -> bytes:
+    # Served from the download cache when present; exports don't fill it, so a
+    # year of quotes doesn't evict the PDFs people are actually opening
+    cached = pdf_service.pdf_cache.get((quote["id"], quote.get("updated_at")))
+    return cached if cached is not None else await pdf_service.render_pdf(quote)
+
+
+def _pdf_name(quote: Dict[str, Any]) -> str:
+    name = _UNSAFE_FILENAME.sub("_", str(quote.get("quote_number") or quote["id"])).strip("_")
+    return f"{name or quote['id']}.pdf"
+
+
+async def zip_of_pdfs(build_query: Callable[[], Any]) -> AsyncIterator[bytes]:
+    """A ZIP with one PDF per quote, rendered a page at a time in the PDF worker pool
+
+    Each page's PDFs render in parallel and are written out (stored, they're
+    already compressed) before the next page is fetched.
+    """
+    sink = _Buffer()
+    names = set()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        async for rows in iter_pages(build_query, PAGE_SIZE["zip"]):
+            pdfs = await asyncio.gather(*(_pdf(row) for row in rows))
+            for row, pdf in zip(rows, pdfs):
+                name = _pdf_name(row)
+                if name in names:
+                    name = f"{name[:-4]}_{row['id']}.pdf"
+                names.add(name)
+                info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+                archive.writestr(info, pdf)
+                yield sink.drain()
+    # Central directory, written on close
+    yield sink.drain()
+
+
+async def started(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Run an export up to its first chunk before the response starts
+
+    Errors reading the first page (bad filters, database down) then surface
+    as a normal error response instead of a truncated 200.
+    """
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = b""
+
+    async def stream() -> AsyncIterator[bytes]:
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return stream()
@@ -3,15 +3,93 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer
 from reportlab.lib.units import inch
 from reportlab.lib import colors
+from app.config import settings
+from app.utils.cache import TTLCache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
+from typing import Dict, Hashable, Optional
+import asyncio
+import multiprocessing
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Rendered PDFs by (quote id, updated_at) - a saved quote gets a new key, so
+# entries never go stale; bounded by total size as well as count
+pdf_cache = TTLCache(
+    "quote_pdfs",
+    maxsize=settings.PDF_CACHE_SIZE,
+    ttl=settings.PDF_CACHE_TTL,
+    max_bytes=settings.PDF_CACHE_MAX_BYTES
+)
+
+# reportlab is pure-Python CPU work: render in worker processes so neither
+# the event loop nor (through the GIL) the threadpool stalls behind it
+_pool: Optional[ProcessPoolExecutor] = None
+
+# Renders in progress, so concurrent downloads of one quote render it once
+_rendering: Dict[Hashable, "asyncio.Task[bytes]"] = {}
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: forking a process that runs threads (httpx, anyio) isn't safe
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.PDF_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def render_pdf(quote_data: dict) -> bytes:
+    """Render a quote PDF in the process pool"""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_pool(), render_quote_pdf, quote_data)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed) - start a fresh pool next time
+        logger.error("PDF worker pool broke, recreating it")
+        shutdown_pool()
+        raise
+
+
+async def _render_and_cache(key: Hashable, quote_data: dict) -> bytes:
+    pdf = await render_pdf(quote_data)
+    pdf_cache.set(key, pdf)
+    return pdf
+
+
+async def get_quote_pdf(quote_data: dict) -> bytes:
+    """PDF of a saved quote, from the cache or rendered once for all concurrent callers
+
+    `quote_data` must include `id` and `updated_at`. The render runs as its own
+    task, so a client disconnecting doesn't cancel it for the others.
+    """
+    key = (quote_data["id"], quote_data.get("updated_at"))
+    pdf = pdf_cache.get(key)
+    if pdf is not None:
+        return pdf
+
+    task = _rendering.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_render_and_cache(key, quote_data))
+        _rendering[key] = task
+        task.add_done_callback(lambda _: _rendering.pop(key, None))
+    return await asyncio.shield(task)
+
 
 async def generate_quote_pdf(quote_data: dict) -> BytesIO:
     """
-    Generate PDF for quote
+    Generate PDF for quote (rendered in the process pool)
 
     Args:
         quote_data: Quote data dictionary containing all quote information
@@ -19,6 +97,19 @@ async def generate_quote_pdf(quote_data: dict) -> BytesIO:
     Returns:
         BytesIO: PDF file as bytes
     """
+    return BytesIO(await render_pdf(quote_data))
+
+
+def render_quote_pdf(quote_data: dict) -> bytes:
+    """
+    Render the quote PDF (CPU-bound - call through render_pdf/get_quote_pdf)
+
+    Args:
+        quote_data: Quote data dictionary containing all quote information
+
+    Returns:
+        bytes: PDF file
+    """
     try:
         # Create PDF buffer
         buffer = BytesIO()
@@ -48,12 +139,15 @@ async def generate_quote_pdf(quote_data: dict) -> BytesIO:
             table_data = [['Item', 'Quantity', 'Unit', 'Unit Price', 'Total']]
 
             for item in items:
+                # Quote builder items are camelCase, API-created ones snake_case
+                unit_price = item.get('unit_price', item.get('unitPrice')) or 0
+                total_price = item.get('total_price', item.get('totalPrice')) or 0
                 table_data.append([
-                    item.get('name', ''),
+                    item.get('name') or item.get('description', ''),
                     str(item.get('quantity', 0)),
                     item.get('unit', ''),
-                    f"₪{item.get('unit_price', 0):.2f}",
-                    f"₪{item.get('total_price', 0):.2f}"
+                    f"₪{float(unit_price):.2f}",
+                    f"₪{float(total_price):.2f}"
                 ])
 
             # Create table
@@ -73,10 +167,10 @@ async def generate_quote_pdf(quote_data: dict) -> BytesIO:
 
         # Totals
         totals_text = f"""
-        <b>Subtotal:</b> ₪{quote_data.get('total_cost', 0):.2f}<br/>
-        <b>Tax ({quote_data.get('tax_percentage', 17)}%):</b> ₪{quote_data.get('tax_amount', 0):.2f}<br/>
-        <b>Discount:</b> ₪{quote_data.get('discount_amount', 0):.2f}<br/>
-        <b>Total:</b> ₪{quote_data.get('total_price', 0):.2f}<br/>
+        <b>Subtotal:</b> ₪{quote_data.get('total_amount') or 0:.2f}<br/>
+        <b>Tax ({quote_data.get('tax_percentage') or 17}%):</b> ₪{quote_data.get('tax_amount') or 0:.2f}<br/>
+        <b>Discount:</b> ₪{quote_data.get('discount_amount') or 0:.2f}<br/>
+        <b>Total:</b> ₪{quote_data.get('final_amount') or quote_data.get('total_price') or 0:.2f}<br/>
         """
         elements.append(Paragraph(totals_text, styles['Normal']))
 
@@ -93,11 +187,8 @@ async def generate_quote_pdf(quote_data: dict) -> BytesIO:
         # Build PDF
         doc.build(elements)
 
-        # Reset buffer position
-        buffer.seek(0)
-
         logger.info(f"PDF generated successfully for quote {quote_data.get('quote_number')}")
-        return buffer
+        return buffer.getvalue()
 
     except Exception as e:
         logger.error(f"Error generating PDF: {e}", exc_info=True)
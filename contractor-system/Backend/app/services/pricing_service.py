@@ -0,0 +1,142 @@
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Quote columns the totals are derived from
+PRICING_INPUT_FIELDS = [
+    "items", "project_complexities",
+    "discount_percent", "price_increase", "tax_percentage"
+]
+
+# Quote columns written by price_quote() - client-sent values for these are ignored
+PRICED_FIELDS = [
+    "total_amount", "final_amount", "discount_percentage", "discount_amount",
+    "tax_amount", "total_cost", "total_price", "profit_amount", "profit_margin",
+    "estimated_cost", "estimated_profit_percent", "estimated_work_days"
+]
+
+# Cart rows that only summarise other items (counted through those items)
+SUMMARY_SOURCES = {"paint_plaster_category_summary"}
+
+DEFAULT_TAX_PERCENTAGE = 17  # Israeli VAT
+
+
+def _number(value: Any) -> float:
+    """JSON value as a number (strings from form inputs, None/garbage -> 0)"""
+    if value is None or isinstance(value, bool):
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _first(row: Dict[str, Any], keys: Iterable[str]) -> Any:
+    """First key present (not None) - items use camelCase, older rows snake_case"""
+    for key in keys:
+        value = row.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def _money(value: float) -> float:
+    return round(value, 2)
+
+
+def additional_cost_rows(quote: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Project-level additional costs: `project_complexities.additionalCostDetails`
+
+    The only list the quote builder fills and totals. The `additional_costs`
+    column is not a pricing input - the builder never counts it, and totals
+    must match what it showed.
+    """
+    complexities = quote.get("project_complexities") or {}
+    return complexities.get("additionalCostDetails") or []
+
+
+def price_quote(quote: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive every quote total from the pricing inputs
+
+    Mirrors the quote builder: item prices are taken before adjustments
+    (`basePrice`, else `totalPrice`), the price increase is applied to the
+    subtotal first and the discount to the increased amount, and profit is the
+    final amount minus the contractor's cost. Category summary rows are skipped
+    so nothing is counted twice. VAT (`tax_percentage`) is reported separately;
+    `final_amount` is before VAT, as shown to the client.
+
+    One pass over the items; returns the derived columns plus a breakdown.
+    """
+    items_price = items_cost = work_days = 0.0
+    item_count = 0
+    for item in quote.get("items") or []:
+        if not isinstance(item, dict) or item.get("source") in SUMMARY_SOURCES:
+            continue
+        item_count += 1
+        items_price += _number(_first(item, ("basePrice", "totalPrice", "base_price", "total_price", "total")))
+        items_cost += _number(_first(item, ("baseCost", "totalCost", "base_cost", "total_cost")))
+        work_days += _number(_first(item, ("workDuration", "work_duration")))
+
+    additional_price = additional_cost = 0.0
+    for cost in additional_cost_rows(quote):
+        if isinstance(cost, dict):
+            additional_price += _number(cost.get("cost"))
+            additional_cost += _number(_first(cost, ("contractorCost", "contractor_cost")))
+
+    price_increase = _number(quote.get("price_increase"))
+    discount_percent = _number(quote.get("discount_percent"))
+    tax_percentage = quote.get("tax_percentage")
+    tax_percentage = DEFAULT_TAX_PERCENTAGE if tax_percentage is None else _number(tax_percentage)
+
+    base_amount = items_price + additional_price
+    price_increase_amount = base_amount * price_increase / 100
+    before_discount = base_amount + price_increase_amount
+    discount_amount = before_discount * discount_percent / 100
+    final_amount = before_discount - discount_amount
+
+    total_cost = items_cost + additional_cost
+    profit = final_amount - total_cost
+    profit_percent = profit / total_cost * 100 if total_cost > 0 else 0.0
+    tax_amount = final_amount * tax_percentage / 100
+
+    return {
+        # Stored columns
+        "total_amount": _money(base_amount),
+        "final_amount": _money(final_amount),
+        "discount_percentage": discount_percent,
+        "discount_amount": _money(discount_amount),
+        "tax_amount": _money(tax_amount),
+        "total_cost": _money(total_cost),
+        "total_price": _money(final_amount),
+        "profit_amount": _money(profit),
+        "profit_margin": round(profit_percent, 2),
+        "estimated_cost": _money(total_cost),
+        "estimated_profit_percent": round(profit_percent, 2),
+        "estimated_work_days": round(work_days, 2),
+        # Breakdown (preview only)
+        "items_amount": _money(items_price),
+        "additional_costs_amount": _money(additional_price),
+        "price_increase_amount": _money(price_increase_amount),
+        "total_before_discount": _money(before_discount),
+        "total_with_tax": _money(final_amount + tax_amount),
+        "item_count": item_count,
+    }
+
+
+def priced_fields(quote: Dict[str, Any]) -> Dict[str, Any]:
+    """Just the stored columns of price_quote(), for inserts and updates"""
+    pricing = price_quote(quote)
+    return {field: pricing[field] for field in PRICED_FIELDS}
+
+
+def touches_pricing(data: Dict[str, Any]) -> bool:
+    """Whether an update changes any pricing input"""
+    return any(field in data for field in PRICING_INPUT_FIELDS)
+
+
+def merge_pricing_inputs(stored: Optional[Dict[str, Any]], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Pricing inputs after an update: the stored inputs overlaid with the new ones"""
+    inputs = {field: (stored or {}).get(field) for field in PRICING_INPUT_FIELDS}
+    inputs.update({field: data[field] for field in PRICING_INPUT_FIELDS if field in data})
+    return inputs
@@ -0,0 +1,250 @@
+from app.config import settings
+from app.repositories import pricebook as pricebook_repo, quote_pricing
+from app.repositories.defaults import SECTIONS
+from app.services import pricing_service
+from app.utils.cache import TTLCache
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, List, Optional, Set, Tuple
+import asyncio
+import re
+import time
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sections whose quote items can be re-priced from the pricebook alone.
+# Tiling and paint items are priced from areas, coverage and material inputs
+# entered in the quote builder, so they are left to it.
+REPRICEABLE_SECTIONS = ("demolition", "plumbing", "electrical", "construction")
+
+# Cart item `source` -> pricebook section
+_CATALOG_SOURCES = {
+    "demolition_calculator": "demolition",
+    "plumbing_catalog": "plumbing",
+    "electrical_catalog": "electrical",
+    "construction_catalog": "construction",
+}
+
+# Cart ids built as `<prefix>_<pricebook id>_<timestamp>` by older builders
+_LEGACY_ID = re.compile(r"^(?:pl|el|construction)_(?P<id>.+)_\d+$")
+
+# Demolition difficulty multipliers (DemolitionItemManager.difficultyLevels)
+DIFFICULTY_MULTIPLIERS = {"easy": 1.0, "medium": 1.25, "hard": 1.5, "very_hard": 2.0}
+
+_JOB_COLUMNS = "id,updated_at," + ",".join(pricing_service.PRICING_INPUT_FIELDS)
+
+# Re-pricing jobs by id (status polled by the client, kept for an hour)
+jobs = TTLCache("repricing_jobs", maxsize=1000, ttl=3600)
+
+# Running job tasks (the event loop only keeps weak references)
+_tasks: Set[asyncio.Task] = set()
+
+
+def item_ref(item: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """(section, pricebook item id) a cart item was priced from, or None"""
+    section = _CATALOG_SOURCES.get(item.get("source"))
+    if section is None or item.get("isCustomEdited"):
+        return None
+
+    ref = item.get("pricebookItemId")
+    if not ref and section == "demolition":
+        ref = item.get("demolitionItemId")
+    if not ref and section == "construction":
+        ref = (item.get("meta") or {}).get("subcontractorItemId")
+    if not ref:
+        match = _LEGACY_ID.match(str(item.get("id") or ""))
+        ref = match.group("id") if match else None
+    return (section, ref) if ref else None
+
+
+def _number(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value) if value is not None else default
+    except (TypeError, ValueError):
+        return default
+
+
+def _set_totals(item: Dict[str, Any], total_price: float, total_cost: float) -> None:
+    item["totalPrice"] = total_price
+    item["totalCost"] = total_cost
+    item["profit"] = total_price - total_cost
+    # basePrice/baseCost take precedence in the quote totals
+    if "basePrice" in item:
+        item["basePrice"] = total_price
+    if "baseCost" in item:
+        item["baseCost"] = total_cost
+
+
+def reprice_item(item: Dict[str, Any], section: str, source: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """A copy of a cart item priced from its current pricebook item
+
+    Same formulas as the quote builder's category editors, so opening the
+    quote afterwards doesn't change the numbers again.
+    """
+    item = dict(item)
+    quantity = _number(item.get("quantity"))
+
+    if section == "demolition":
+        multiplier = DIFFICULTY_MULTIPLIERS.get(item.get("difficultyLevel"), 1.0)
+        hours_per_unit = _number(source.get("hoursPerUnit"), 1.0) or 1.0
+        labor_cost_per_day = _number(defaults.get("laborCostPerDay")) or 1000
+        profit_percent = _number(defaults.get("profitPercent")) or 40
+
+        cost_per_unit = labor_cost_per_day / 8 * hours_per_unit * multiplier
+        price_per_unit = cost_per_unit * (1 + profit_percent / 100)
+        item.update(
+            baseHoursPerUnit=hours_per_unit,
+            baseLaborCostPerDay=labor_cost_per_day,
+            baseProfitPercent=profit_percent,
+            unitPrice=round(price_per_unit),
+            workDuration=round(hours_per_unit * multiplier * quantity / 8, 1),
+        )
+        _set_totals(item, round(price_per_unit * quantity), round(cost_per_unit * quantity))
+        return item
+
+    unit_cost = _number(source.get("contractorCostPerUnit"))
+    unit_price = _number(source.get("clientPricePerUnit"))
+    if not unit_price and section == "electrical":
+        profit_percent = _number(source.get("desiredProfitPercent"), _number(defaults.get("desiredProfitPercent"), 40))
+        unit_price = unit_cost * (1 + profit_percent / 100)
+
+    units = 1 if item.get("ignoreQuantity") else quantity
+    total_price, total_cost = unit_price * units, unit_cost * units
+    item["unitPrice"] = unit_price
+    if "contractorCostPerUnit" in item:
+        item["contractorCostPerUnit"] = unit_cost
+    if "clientPricePerUnit" in item:
+        item["clientPricePerUnit"] = unit_price
+
+    if section == "construction":
+        meta = dict(item.get("meta") or {})
+        original_hours = _number(meta.get("originalLaborHoursPerUnit"))
+        multiplier = _number(meta.get("laborHoursPerUnit")) / original_hours if original_hours else 1.0
+        hours_per_unit = _number(source.get("laborHoursPerUnit"))
+        meta.update(originalLaborHoursPerUnit=hours_per_unit, laborHoursPerUnit=hours_per_unit * multiplier)
+        item["meta"] = meta
+        item["workDuration"] = hours_per_unit * multiplier * quantity / 8
+        total_price, total_cost = round(total_price), round(total_cost)
+
+    _set_totals(item, total_price, total_cost)
+    return item
+
+
+def reprice_quote(
+    quote: Dict[str, Any],
+    pricebook: Dict[str, Dict[str, Dict[str, Any]]],
+    defaults: Dict[str, Dict[str, Any]],
+    item_ids: Optional[Set[Tuple[str, str]]] = None
+) -> Optional[Dict[str, Any]]:
+    """Re-price a draft quote's pricebook items; None if nothing changed
+
+    `pricebook` is section -> item id -> pricebook item. With `item_ids`, only
+    items priced from those (section, id) pairs are touched.
+    """
+    changed = False
+    items = []
+    for item in quote.get("items") or []:
+        ref = item_ref(item) if isinstance(item, dict) else None
+        source = pricebook.get(ref[0], {}).get(ref[1]) if ref else None
+        if source is None or (item_ids is not None and ref not in item_ids):
+            items.append(item)
+            continue
+        repriced = reprice_item(item, ref[0], source, defaults.get(ref[0]) or {})
+        changed = changed or repriced != item
+        items.append(repriced)
+
+    if not changed:
+        return None
+    return {
+        "id": quote["id"],
+        "updated_at": quote.get("updated_at"),
+        "items": items,
+        **pricing_service.priced_fields({**quote, "items": items}),
+    }
+
+
+def _reprice_batch(quotes, pricebook, defaults, item_ids) -> List[Dict[str, Any]]:
+    rows = (reprice_quote(quote, pricebook, defaults, item_ids) for quote in quotes)
+    return [row for row in rows if row is not None]
+
+
+def start_job(user_id: str, sections: List[str], item_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Queue a re-pricing job and return its status record"""
+    job = {
+        "id": uuid.uuid4().hex,
+        "user_id": user_id,
+        "status": "pending",
+        "sections": sections,
+        "item_ids": item_ids,
+        "scanned": 0,
+        "affected": 0,
+        "updated": 0,
+        "conflicts": 0,
+        "error": None,
+        "created_at": time.time(),
+        "finished_at": None,
+    }
+    jobs.set(job["id"], job)
+    task = asyncio.create_task(_run_job(job))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+def get_job(job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    job = jobs.get(job_id)
+    return job if job and job["user_id"] == user_id else None
+
+
+async def _run_job(job: Dict[str, Any]) -> None:
+    """Scan the user's drafts in batches, re-price on the threadpool, write each batch in one call"""
+    user_id = job["user_id"]
+    job["status"] = "running"
+    try:
+        # Fresh from the database - the job usually follows a pricebook edit
+        profile = await pricebook_repo.read_sections(user_id, job["sections"])
+        pricebook = {
+            section: {item.get("id"): item for item in profile.get(SECTIONS[section][0]) or [] if isinstance(item, dict)}
+            for section in job["sections"]
+        }
+        defaults = {section: profile.get(SECTIONS[section][1]) or {} for section in job["sections"]}
+        item_ids = None
+        if job["item_ids"] is not None:
+            item_ids = {(section, item_id) for section in job["sections"] for item_id in job["item_ids"]}
+
+        after_id = None
+        while True:
+            quotes = await quote_pricing.find_drafts(
+                user_id, _JOB_COLUMNS, after_id, settings.REPRICE_BATCH_SIZE, job["item_ids"]
+            )
+            if not quotes:
+                break
+            after_id = quotes[-1]["id"]
+            job["scanned"] += len(quotes)
+
+            rows = await run_in_threadpool(_reprice_batch, quotes, pricebook, defaults, item_ids)
+            if rows:
+                written = await quote_pricing.apply_pricing(user_id, rows)
+                job["affected"] += len(rows)
+                job["updated"] += written
+                job["conflicts"] += len(rows) - written
+
+            if len(quotes) < settings.REPRICE_BATCH_SIZE:
+                break
+
+        job["status"] = "completed"
+        logger.info(
+            f"Re-priced drafts for {user_id}: scanned={job['scanned']} updated={job['updated']} conflicts={job['conflicts']}"
+        )
+    except asyncio.CancelledError:
+        # Server shutting down - drafts not reached yet keep their prices
+        job["status"] = "failed"
+        job["error"] = "Cancelled before completion"
+        raise
+    except Exception as e:
+        logger.error(f"Re-pricing job {job['id']} failed: {e}", exc_info=True)
+        job["status"] = "failed"
+        job["error"] = str(e)
+    finally:
+        job["finished_at"] = time.time()
@@ -0,0 +1,56 @@
+from app.services import pricing_service
+from typing import Any, Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cart item `source` of items that came from a quote template
+TEMPLATE_ITEM_SOURCE = "quote_template"
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value) if value is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def quote_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """A `template_items` row as a quote cart item (the quote builder's camelCase shape)"""
+    quantity = _number(item.get("quantity"))
+    unit_price = _number(item.get("unit_price"))
+    unit_cost = _number(item.get("contractor_unit_cost"))
+    total_price, total_cost = quantity * unit_price, quantity * unit_cost
+    return {
+        "id": f"template_{item['id']}",
+        "name": item.get("name"),
+        "description": item.get("description") or item.get("name"),
+        "categoryId": item.get("category_id"),
+        "catalogItemId": item.get("catalog_item_id"),
+        "templateItemId": item["id"],
+        "unit": item.get("unit"),
+        "quantity": quantity,
+        "unitPrice": unit_price,
+        "contractorCostPerUnit": unit_cost,
+        "totalPrice": total_price,
+        "totalCost": total_cost,
+        "profit": total_price - total_cost,
+        "source": TEMPLATE_ITEM_SOURCE,
+    }
+
+
+def quote_from_template(template: Dict[str, Any], items: List[Dict[str, Any]], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Insert payload of a new draft quote started from a template
+
+    Items keep the template's order; totals are derived like any other quote.
+    """
+    quote = {
+        "title": template.get("name"),
+        "description": template.get("description"),
+        "status": "draft",
+        "tax_percentage": pricing_service.DEFAULT_TAX_PERCENTAGE,
+        "items": [quote_item(item) for item in sorted(items, key=lambda i: i.get("item_order") or 0)],
+        **overrides,
+    }
+    quote.update(pricing_service.priced_fields(quote))
+    return quote
@@ -0,0 +1,178 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# All caches by name, for the /api/debug/caches stats endpoint
+_registry: Dict[str, "TTLCache"] = {}
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded, thread-safe LRU cache with a per-entry expiry time
+
+    Entries expire at an absolute epoch timestamp (so callers can use a JWT's
+    `exp` directly) or after the cache's default TTL. When full, the least
+    recently used entry is evicted. Hit/miss/eviction counters are kept for
+    monitoring.
+
+    Sync dependencies run in the threadpool, so all access is guarded by a lock.
+
+    With `max_bytes`, values must be bytes-like and the cache is also bounded
+    by their total length (for rendered files rather than rows).
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            name: Name shown in cache stats
+            maxsize: Maximum number of entries before LRU eviction
+            ttl: Default time-to-live in seconds (None = only explicit expiry)
+            max_bytes: Maximum total length of the (bytes) values before LRU eviction
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _registry[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                self._discard(key)
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        expires_at: Optional[float] = None
+    ) -> None:
+        """Store a value
+
+        Args:
+            ttl: Seconds until expiry (defaults to the cache TTL)
+            expires_at: Absolute epoch expiry; takes precedence over ttl
+        """
+        if expires_at is None:
+            ttl = self.ttl if ttl is None else ttl
+            expires_at = time.time() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._discard(key)
+            if self.max_bytes is not None:
+                if len(value) > self.max_bytes:
+                    return  # Would evict everything else and still not fit
+                self.bytes += len(value)
+            self._data[key] = (value, expires_at)
+            while len(self._data) > self.maxsize or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                self._discard(next(iter(self._data)))
+                self.evictions += 1
+
+    def _discard(self, key: Hashable) -> Any:
+        """Remove an entry (lock held), keeping the byte count in step"""
+        entry = self._data.pop(key, _MISSING)
+        if entry is not _MISSING and self.max_bytes is not None:
+            self.bytes -= len(entry[0])
+        return entry
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value"""
+        with self._lock:
+            entry = self._discard(key)
+        return default if entry is _MISSING else entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            **({"bytes": self.bytes, "max_bytes": self.max_bytes} if self.max_bytes is not None else {}),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+class _Call:
+    """An in-flight SingleFlight call"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into a single execution
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running wait for it and share its result (or exception). Thread-based,
+    for sync code running in the threadpool.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every cache created in the process"""
+    return {name: cache.stats() for name, cache in _registry.items()}
@@ -0,0 +1,45 @@
+from fastapi.responses import JSONResponse
+from app.config import settings
+from typing import Any, Dict, Optional
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON with orjson (stdlib json if it isn't installed)
+
+    Hebrew text is written as-is, not \\u-escaped.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response serialized with `dumps()`"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def trusted_response(content: Any, headers: Optional[Dict[str, str]] = None) -> Any:
+    """Return database rows without re-validating them against the response_model
+
+    FastAPI validates whatever a route returns through its `response_model`
+    (for quotes: 60+ fields plus the JSONB item arrays) and then serializes it
+    with `jsonable_encoder` - a second full walk of the data. Rows read straight
+    from PostgREST are already JSON, so with FAST_JSON_RESPONSES enabled they go
+    out through `FastJSONResponse` instead; returning a Response skips both
+    steps, while the route's response_model still documents the OpenAPI schema.
+
+    Only use it for content that is plain JSON data (no models, no datetimes
+    that need the response_model's formatting). `headers` are only applied on
+    the fast path - routes still set them on their injected `Response` too.
+    """
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(content, headers=headers)
+    return content
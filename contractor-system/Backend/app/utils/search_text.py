@@ -0,0 +1,47 @@
+from typing import List
+import re
+
+# Same rules as search_normalize() / search_digits() in the database
+# (app/repositories/search.py) - the two must fold text identically.
+
+# Niqqud and cantillation marks, plus quote marks inside words (צה"ל, ג'ירפה)
+_DROPPED = re.compile("[\u0591-\u05bd\u05bf\u05c1\u05c2\u05c4\u05c5\u05c7'\"`\u05f3\u05f4]")
+
+# Everything that isn't a Latin letter, digit or Hebrew letter separates words
+_SEPARATORS = re.compile("[^0-9a-z\u05d0-\u05ea]+")
+
+# Final letters fold to their regular forms (ך->כ, ם->מ, ן->נ, ף->פ, ץ->צ)
+_FINALS = str.maketrans("ךםןףץ", "כמנפצ")
+
+_NON_DIGITS = re.compile("[^0-9]")
+
+# A query without letters is treated as a phone number
+_LETTERS = re.compile("[A-Za-z\u05d0-\u05ea]")
+
+# Shortest digit run matched against phone numbers
+MIN_PHONE_DIGITS = 3
+
+
+def normalize(text: str) -> str:
+    """Fold text for searching: lowercase, final letters folded, niqqud and punctuation stripped"""
+    text = (text or "").lower().translate(_FINALS)
+    return _SEPARATORS.sub(" ", _DROPPED.sub("", text)).strip()
+
+
+def tokens(text: str) -> List[str]:
+    """Normalized words of a query, each matched as a substring"""
+    return normalize(text).split()
+
+
+def phone_digits(text: str) -> str:
+    """Digits of a phone number, with the +972 country code turned into the local 0"""
+    digits = _NON_DIGITS.sub("", text or "")
+    return "0" + digits[3:] if digits.startswith("972") else digits
+
+
+def phone_query(text: str) -> str:
+    """The digits to match against phone numbers, or "" if the query isn't a phone number"""
+    if _LETTERS.search(text or ""):
+        return ""
+    digits = phone_digits(text)
+    return digits if len(digits) >= MIN_PHONE_DIGITS else ""
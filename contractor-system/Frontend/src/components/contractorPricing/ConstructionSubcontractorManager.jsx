@@ -1,6 +1,6 @@
 
 import React from "react";
-import { supabase } from "@/lib/supabase";
+import { pricebookAPI } from "@/lib/api";
 import { useUser } from "@/components/utils/UserContext";
 import { Card, CardHeader, CardTitle, CardContent, CardDescription } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
@@ -263,14 +263,12 @@ export default function ConstructionSubcontractorManager() {
     const load = async () => {
       if (!user) return;
 
-      // Load data from user_profiles table instead of user_metadata
-      const { data: profile, error: profileError } = await supabase
-        .from('user_profiles')
-        .select('construction_defaults, construction_subcontractor_items')
-        .eq('auth_user_id', user.id)
-        .single();
-
-      if (profileError) {
+      // Load through the pricebook API (fills in columns inherited from the shared default pricebook)
+      let profile;
+      try {
+        const section = await pricebookAPI.get('construction');
+        profile = { construction_defaults: section.defaults, construction_subcontractor_items: section.items };
+      } catch (profileError) {
         console.error('Error loading construction data:', profileError);
         return;
       }
@@ -292,13 +290,10 @@ export default function ConstructionSubcontractorManager() {
             desiredProfitPercent: undefined
           };
         });
-        await supabase
-          .from('user_profiles')
-          .update({
-            construction_defaults: { desiredProfitPercent: desired, workerCostPerUnit: worker },
-            construction_subcontractor_items: seeded
-          })
-          .eq('auth_user_id', user.id);
+        await pricebookAPI.update('construction', {
+          defaults: { desiredProfitPercent: desired, workerCostPerUnit: worker },
+          items: seeded
+        }).catch((error) => console.error('[ConstructionSubcontractorManager] Failed to save seeded items:', error));
         setItems(seeded);
         setDefaults({ desiredProfitPercent: desired, workerCostPerUnit: worker });
         return;
@@ -400,13 +395,10 @@ export default function ConstructionSubcontractorManager() {
 
       // היה שינוי כלשהו? נשמור אוטומטית (גם אם לא נוספו פריטים)
       if (didMerge || changedDuringEnrich) {
-        await supabase
-          .from('user_profiles')
-          .update({
-            construction_defaults: { desiredProfitPercent: desired, workerCostPerUnit: worker },
-            construction_subcontractor_items: merged
-          })
-          .eq('auth_user_id', user.id);
+        await pricebookAPI.update('construction', {
+          defaults: { desiredProfitPercent: desired, workerCostPerUnit: worker },
+          items: merged
+        }).catch((error) => console.error('[ConstructionSubcontractorManager] Failed to save seeded items:', error));
       }
 
       setItems(merged);
@@ -420,12 +412,9 @@ export default function ConstructionSubcontractorManager() {
     setDefaults((prev) => {
       const next = { ...prev, ...patch };
       // שמירה אסינכרונית (אין צורך לחכות)
-      supabase
-        .from('user_profiles')
-        .update({
-          construction_defaults: next
-        })
-        .eq('auth_user_id', user.id);
+      pricebookAPI.update('construction', {
+        defaults: next
+      }).catch((error) => console.error('[ConstructionSubcontractorManager] Failed to save defaults:', error));
       return next;
     });
   };
@@ -462,12 +451,9 @@ export default function ConstructionSubcontractorManager() {
     const exists = items.some(i => i.id === itemToSave.id);
     const newList = exists ? items.map(i => (i.id === itemToSave.id ? itemToSave : i)) : [...items, itemToSave];
 
-    await supabase
-      .from('user_profiles')
-      .update({
-        construction_subcontractor_items: newList
-      })
-      .eq('auth_user_id', user.id);
+    await pricebookAPI.update('construction', {
+      items: newList
+    });
     setItems(newList);
     setIsDialogOpen(false);
     setEditingItem(null);
@@ -475,12 +461,9 @@ export default function ConstructionSubcontractorManager() {
 
   const removeItem = async (id) => {
     const newList = items.filter(i => i.id !== id);
-    await supabase
-      .from('user_profiles')
-      .update({
-        construction_subcontractor_items: newList
-      })
-      .eq('auth_user_id', user.id);
+    await pricebookAPI.update('construction', {
+      items: newList
+    });
     setItems(newList);
   };
 
@@ -512,23 +495,19 @@ export default function ConstructionSubcontractorManager() {
       workerCost: defaults.workerCostPerUnit
     });
 
-    const { data, error } = await supabase
-      .from('user_profiles')
-      .update({
-        construction_defaults: defaults,
-        construction_subcontractor_items: updated,
-      })
-      .eq('auth_user_id', user.id);
-
-    if (error) {
-      console.error('[ConstructionSubcontractorManager] Save error:', error);
-    } else {
+    try {
+      const data = await pricebookAPI.update('construction', {
+        defaults: defaults,
+        items: updated,
+      });
       console.log('[ConstructionSubcontractorManager] Save successful:', data);
       // Refresh user data in context so QuoteCreate components get updated data
       if (refreshUser) {
         await refreshUser();
         console.log('[ConstructionSubcontractorManager] User data refreshed');
       }
+    } catch (error) {
+      console.error('[ConstructionSubcontractorManager] Save error:', error);
     }
 
     setItems(updated);
@@ -1,6 +1,6 @@
 
 import React, { useEffect, useMemo, useState } from "react";
-import { supabase } from "@/lib/supabase";
+import { pricebookAPI } from "@/lib/api";
 import { useUser } from "@/components/utils/UserContext";
 import { User } from '@/lib/entities';
 import { Button } from "@/components/ui/button";
@@ -143,14 +143,12 @@ export default function ElectricalSubcontractorManager() {
 
       setLoading(true);
       
-      // Load data from user_profiles table instead of user_metadata
-      const { data: profile, error: profileError } = await supabase
-        .from('user_profiles')
-        .select('electrical_defaults, electrical_subcontractor_items')
-        .eq('auth_user_id', user.id)
-        .single();
-
-      if (profileError) {
+      // Load through the pricebook API (fills in columns inherited from the shared default pricebook)
+      let profile;
+      try {
+        const section = await pricebookAPI.get('electrical');
+        profile = { electrical_defaults: section.defaults, electrical_subcontractor_items: section.items };
+      } catch (profileError) {
         console.error('Error loading electrical data:', profileError);
         setLoading(false);
         return;
@@ -170,13 +168,10 @@ export default function ElectricalSubcontractorManager() {
           ...DEFAULT_REPAIRS,
           ...DEFAULT_INSTALLATIONS, // Add new category defaults
         ].map((it) => ({ ...it, clientPricePerUnit: calcClientPrice(it.contractorCostPerUnit, profit) }));
-        await supabase
-          .from('user_profiles')
-          .update({
-            electrical_subcontractor_items: its,
-            electrical_defaults: d
-          })
-          .eq('auth_user_id', user.id);
+        await pricebookAPI.update('electrical', {
+          items: its,
+          defaults: d
+        }).catch((error) => console.error('[ElectricalSubcontractorManager] Failed to save seeded items:', error));
       } else {
         // השלמת פריטים חסרים מכל תתי־הקטגוריות בלי כפילויות (גם אם כבר יש פריטים בתת־קטגוריה)
         const existingIds = new Set(its.map((x) => x.id));
@@ -197,13 +192,10 @@ export default function ElectricalSubcontractorManager() {
 
         if (toAdd.length) {
           its = [...its, ...toAdd];
-          await supabase
-            .from('user_profiles')
-            .update({
-              electrical_subcontractor_items: its,
-              electrical_defaults: d
-            })
-            .eq('auth_user_id', user.id);
+          await pricebookAPI.update('electrical', {
+            items: its,
+            defaults: d
+          }).catch((error) => console.error('[ElectricalSubcontractorManager] Failed to save seeded items:', error));
         }
       }
 
@@ -258,13 +250,10 @@ export default function ElectricalSubcontractorManager() {
     const exists = items.some((x) => x.id === newItem.id);
     const updated = exists ? items.map((x) => (x.id === newItem.id ? newItem : x)) : [...items, newItem];
     setItems(updated);
-    await supabase
-      .from('user_profiles')
-      .update({
-        electrical_subcontractor_items: updated,
-        electrical_defaults: defaults
-      })
-      .eq('auth_user_id', user.id);
+    await pricebookAPI.update('electrical', {
+      items: updated,
+      defaults: defaults
+    });
     closeDialog();
   };
 
@@ -272,13 +261,10 @@ export default function ElectricalSubcontractorManager() {
     if (!window.confirm("למחוק את הפריט הזה?")) return;
     const updated = items.filter((x) => x.id !== id);
     setItems(updated);
-    await supabase
-      .from('user_profiles')
-      .update({
-        electrical_subcontractor_items: updated,
-        electrical_defaults: defaults
-      })
-      .eq('auth_user_id', user.id);
+    await pricebookAPI.update('electrical', {
+      items: updated,
+      defaults: defaults
+    });
   };
 
   const handleSaveAll = async () => {
@@ -292,23 +278,16 @@ export default function ElectricalSubcontractorManager() {
     });
 
     try {
-      const { data, error } = await supabase
-        .from('user_profiles')
-        .update({
-          electrical_subcontractor_items: items,
-          electrical_defaults: defaults
-        })
-        .eq('auth_user_id', user.id);
-
-      if (error) {
-        console.error('[ElectricalSubcontractorManager] Save error:', error);
-      } else {
-        console.log('[ElectricalSubcontractorManager] Save successful:', data);
-        // Refresh user data in context so QuoteCreate components get updated data
-        if (refreshUser) {
-          await refreshUser();
-          console.log('[ElectricalSubcontractorManager] User data refreshed');
-        }
+      const data = await pricebookAPI.update('electrical', {
+        items: items,
+        defaults: defaults
+      });
+
+      console.log('[ElectricalSubcontractorManager] Save successful:', data);
+      // Refresh user data in context so QuoteCreate components get updated data
+      if (refreshUser) {
+        await refreshUser();
+        console.log('[ElectricalSubcontractorManager] User data refreshed');
       }
     } catch (error) {
       console.error('[ElectricalSubcontractorManager] Failed to save electrical subcontractor data:', error);
@@ -1,8 +1,7 @@
 
 import React, { useEffect, useMemo, useState } from "react";
 import { useUser } from '@/components/utils/UserContext';
-import { supabase } from '@/lib/supabase';
-import { userProfileAPI } from '@/lib/api';
+import { userProfileAPI, pricebookAPI } from '@/lib/api';
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Textarea } from "@/components/ui/textarea";
@@ -162,14 +161,12 @@ export default function PlumbingSubcontractorManager() {
 
       setLoading(true);
       
-      // Load data from user_profiles table instead of user_metadata
-      const { data: profile, error: profileError } = await supabase
-        .from('user_profiles')
-        .select('plumbing_defaults, plumbing_subcontractor_items')
-        .eq('auth_user_id', user.id)
-        .single();
-
-      if (profileError) {
+      // Load through the pricebook API (fills in columns inherited from the shared default pricebook)
+      let profile;
+      try {
+        const section = await pricebookAPI.get('plumbing');
+        profile = { plumbing_defaults: section.defaults, plumbing_subcontractor_items: section.items };
+      } catch (profileError) {
         console.error('Error loading plumbing data:', profileError);
         setLoading(false);
         return;
@@ -195,13 +192,10 @@ export default function PlumbingSubcontractorManager() {
           clientPricePerUnit: calcClientPrice(item.contractorCostPerUnit, profit),
           // לא שומרים desiredProfitPercent בפריט – משתמשים בברירת המחדל
         }));
-        await supabase
-          .from('user_profiles')
-          .update({
-            plumbing_subcontractor_items: seeded,
-            plumbing_defaults: d
-          })
-          .eq('auth_user_id', user.id);
+        await pricebookAPI.update('plumbing', {
+          items: seeded,
+          defaults: d
+        }).catch((error) => console.error('[PlumbingSubcontractorManager] Failed to save seeded items:', error));
         setItems(seeded);
       } else {
         // NEW: השלמה אוטומטית לתת־קטגוריות שחסרות אצל המשתמש
@@ -224,13 +218,10 @@ export default function PlumbingSubcontractorManager() {
           });
 
           if (mergedItems.length !== its.length) {
-            await supabase
-              .from('user_profiles')
-              .update({
-                plumbing_subcontractor_items: mergedItems,
-                plumbing_defaults: d
-              })
-              .eq('auth_user_id', user.id);
+            await pricebookAPI.update('plumbing', {
+              items: mergedItems,
+              defaults: d
+            }).catch((error) => console.error('[PlumbingSubcontractorManager] Failed to save seeded items:', error));
           }
         }
         setItems(mergedItems);
@@ -252,23 +243,19 @@ export default function PlumbingSubcontractorManager() {
       defaultsProfit: defaults.desiredProfitPercent
     });
 
-    const { data, error } = await supabase
-      .from('user_profiles')
-      .update({
-        plumbing_defaults: defaults,
-        plumbing_subcontractor_items: items,
-      })
-      .eq('auth_user_id', user.id);
-
-    if (error) {
-      console.error('[PlumbingSubcontractorManager] Save error:', error);
-    } else {
+    try {
+      const data = await pricebookAPI.update('plumbing', {
+        defaults: defaults,
+        items: items,
+      });
       console.log('[PlumbingSubcontractorManager] Save successful:', data);
       // Refresh user data in context so QuoteCreate components get updated data
       if (refreshUser) {
         await refreshUser();
         console.log('[PlumbingSubcontractorManager] User data refreshed');
       }
+    } catch (error) {
+      console.error('[PlumbingSubcontractorManager] Save error:', error);
     }
     
     setSaving(false);
@@ -19,7 +19,7 @@ import {
 } from "@/components/ui/tooltip";
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogFooter, DialogTrigger, DialogClose } from "@/components/ui/dialog";
 import { User as UserEntity } from '@/lib/entities';
-import { useUser } from '@/components/utils/UserContext';
+import { useUserSections } from '@/components/utils/UserContext';
 import { cn } from "@/lib/utils";
 import { AnimatePresence } from "framer-motion";
 import { Checkbox } from "@/components/ui/checkbox";
@@ -321,7 +321,7 @@ const CategoryHeader = ({ number, title, colorScheme }) => {
 };
 
 export default function PaintForm({ onSubmit, onCancel, editItem, userPaintDefaults, presetCategory }) {
-  const { user } = useUser();
+  const { user } = useUserSections();
   const initialLayersCount = editItem?.layerSettings?.length > 0 ? editItem.layerSettings.length : 3;
   
   const initialLayerSettings = useMemo(() => {
@@ -20,11 +20,11 @@ import {
   TableRow,
 } from "@/components/ui/table";
 import { Plus, Trash2, Save, X } from 'lucide-react';
-import { useUser } from '@/components/utils/UserContext';
+import { useUserSections } from '@/components/utils/UserContext';
 import { User } from '@/lib/entities/user';
 
 export default function RoomEstimatesSettings({ isOpen, onClose, onSave }) {
-  const { user } = useUser();
+  const { user } = useUserSections();
   const [roomEstimates, setRoomEstimates] = useState([]);
   const [loading, setLoading] = useState(true);
   const [saving, setSaving] = useState(false);
@@ -19,7 +19,7 @@ import {
   TableRow,
 } from "@/components/ui/table";
 import { User } from '@/lib/entities';
-import { useUser } from '@/components/utils/UserContext';
+import { useUserSections } from '@/components/utils/UserContext';
 import {
   Popover,
   PopoverContent,
@@ -240,7 +240,7 @@ const calculateMetrics = (area, formData, tierPrice = null, defaults = {}) => {
 };
 
 export default function TilingForm({ editItem, onSubmit, onCancel, defaults, userTilingDefaults }) {
-  const { user } = useUser();
+  const { user } = useUserSections();
   const [formData, setFormData] = useState({
     id: editItem?.id || `tiling_${Date.now()}`,
     tileName: editItem?.tileName || '',
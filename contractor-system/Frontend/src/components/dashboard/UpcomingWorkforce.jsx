@@ -2,7 +2,7 @@
 import React, { useState, useEffect } from 'react';
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Quote } from '@/lib/entities';
-import { useUser } from '@/components/utils/UserContext';
+import { useUserSections } from '@/components/utils/UserContext';
 import { Users, Calendar, Clock, AlertTriangle, Package, ShoppingCart, DollarSign, Lightbulb, Landmark } from 'lucide-react'; // Added Landmark
 import { format, differenceInDays, addWeeks, addDays } from 'date-fns';
 import { he } from 'date-fns/locale';
@@ -87,7 +87,7 @@ const calculateCategoryDetails = (categoryItems, userPriceList) => {
 };
 
 export default function UpcomingWorkforce() {
-  const { user } = useUser();
+  const { user } = useUserSections('paint,tiling');
   const [upcomingWork, setUpcomingWork] = useState([]);
   const [loading, setLoading] = useState(true);
 
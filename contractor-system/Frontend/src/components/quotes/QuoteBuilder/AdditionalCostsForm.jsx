@@ -20,7 +20,7 @@ const defaultCosts = [
 ];
 
 export default function AdditionalCostsForm({ projectComplexities = {}, onUpdateProjectComplexities, onBack, onNext, onSaveDraft, isSaving = false }) {
-    const { user, loading: userLoading } = useSafeUser();
+    const { user, loading: userLoading } = useSafeUser({ sections: 'quote_settings' });
     const [userDefaults, setUserDefaults] = useState(null);
     const [loadingDefaults, setLoadingDefaults] = useState(true);
     
@@ -22,7 +22,7 @@ import ConstructionManualItemDialog from "./ConstructionManualItemDialog";
 import { getCategoryTheme } from "./categoryTheme";
 import CategoryFloatingAddButton from './CategoryFloatingAddButton';
 import { Collapsible, CollapsibleContent, CollapsibleTrigger } from "@/components/ui/collapsible";
-import { supabase } from "@/lib/supabase";
+import { pricebookAPI } from "@/lib/api";
 
 
 const formatPrice = (n) =>
@@ -149,19 +149,11 @@ export default function ConstructionCategory({
 
     const loadConstructionData = async () => {
       try {
-        console.log('[ConstructionCategory] Loading construction data from user_profiles');
-
-        // Load data from user_profiles table
-        const { data: profile, error: profileError } = await supabase
-          .from('user_profiles')
-          .select('construction_defaults, construction_subcontractor_items')
-          .eq('auth_user_id', currentUser.id)
-          .single();
-
-        if (profileError) {
-          console.error('[ConstructionCategory] Error loading construction data:', profileError);
-          return;
-        }
+        console.log('[ConstructionCategory] Loading construction data from the pricebook API');
+
+        // Read through the backend, which fills in columns inherited from the shared default pricebook
+        const section = await pricebookAPI.get('construction');
+        const profile = { construction_defaults: section.defaults, construction_subcontractor_items: section.items };
 
         const d = profile?.construction_defaults || {};
         const rawItems = profile?.construction_subcontractor_items || [];
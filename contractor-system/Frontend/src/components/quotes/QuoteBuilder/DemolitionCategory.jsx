@@ -18,7 +18,7 @@ import { createPageUrl } from "@/utils";
 import DemolitionItemDialog from "./DemolitionItemDialog";
 import { getCategoryTheme } from "./categoryTheme";
 import CategoryFloatingAddButton from './CategoryFloatingAddButton';
-import { supabase } from "@/lib/supabase";
+import { pricebookAPI } from "@/lib/api";
 
 const formatNis = (n) => `₪${(Number(n) || 0).toLocaleString("he-IL")}`;
 const formatNum = (n) => (Number(n) || 0).toLocaleString("he-IL");
@@ -68,20 +68,11 @@ export default function DemolitionCategory({
     const loadDemolitionData = async () => {
       setLoading(true);
       try {
-        console.log('[DemolitionCategory] Loading demolition data from user_profiles');
-
-        // Load data from user_profiles table
-        const { data: profile, error: profileError } = await supabase
-          .from('user_profiles')
-          .select('demolition_defaults, demolition_items')
-          .eq('auth_user_id', currentUser.id)
-          .single();
-
-        if (profileError) {
-          console.error('[DemolitionCategory] Error loading demolition data:', profileError);
-          setLoading(false);
-          return;
-        }
+        console.log('[DemolitionCategory] Loading demolition data from the pricebook API');
+
+        // Read through the backend, which fills in columns inherited from the shared default pricebook
+        const section = await pricebookAPI.get('demolition');
+        const profile = { demolition_defaults: section.defaults, demolition_items: section.items };
 
         const demolitionItems = profile?.demolition_items || [];
         const demolitionDefaults = profile?.demolition_defaults || { laborCostPerDay: 1000, profitPercent: 30 };
@@ -17,7 +17,7 @@ import { createPageUrl } from "@/utils";
 import ElectricalManualItemDialog from "./ElectricalManualItemDialog";
 import ElectricalItemDialog from "./ElectricalItemDialog";
 import CategoryFloatingAddButton from './CategoryFloatingAddButton';
-import { supabase } from "@/lib/supabase";
+import { pricebookAPI } from "@/lib/api";
 
 const SUBCATS = [
   { key: "points", label: "נקודות חשמל" },
@@ -74,20 +74,11 @@ export default function ElectricalCategory({
     const loadElectricalData = async () => {
       setLoading(true);
       try {
-        console.log('[ElectricalCategory] Loading electrical data from user_profiles');
+        console.log('[ElectricalCategory] Loading electrical data from the pricebook API');
 
-        // Load data from user_profiles table
-        const { data: profile, error: profileError } = await supabase
-          .from('user_profiles')
-          .select('electrical_defaults, electrical_subcontractor_items')
-          .eq('auth_user_id', user.id)
-          .single();
-
-        if (profileError) {
-          console.error('[ElectricalCategory] Error loading electrical data:', profileError);
-          setLoading(false);
-          return;
-        }
+        // Read through the backend, which fills in columns inherited from the shared default pricebook
+        const section = await pricebookAPI.get('electrical');
+        const profile = { electrical_defaults: section.defaults, electrical_subcontractor_items: section.items };
 
         const electricalItems = profile?.electrical_subcontractor_items || [];
         const electricalDefaults = profile?.electrical_defaults || { desiredProfitPercent: 40 };
@@ -160,6 +151,7 @@ export default function ElectricalCategory({
       categoryId,
       categoryName: "חשמל",
       source: it.source || "electrical_catalog",
+      pricebookItemId: it.id, // lets the backend re-price drafts when this pricebook item changes
       name: it.name || "",
       description: it.description || "",
       quantity: qty, // This now correctly reflects the actual quantity
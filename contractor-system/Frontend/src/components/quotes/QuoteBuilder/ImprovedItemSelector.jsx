@@ -1,6 +1,6 @@
 
 import React, { useState, useEffect, useCallback } from 'react';
-import { useUser } from '@/components/utils/UserContext';
+import { useUserSections } from '@/components/utils/UserContext';
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Card, CardContent, CardHeader, CardTitle, CardDescription, CardFooter } from "@/components/ui/card";
@@ -30,7 +30,7 @@ export default function ImprovedItemSelector({
   categoriesNav, // New prop
   onSelectCategory // New prop
 }) {
-  const { user, loading: userLoading } = useUser();
+  const { user, loading: userLoading } = useUserSections();
   const [catalogItems, setCatalogItems] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
@@ -40,7 +40,7 @@ export default function ManualCalcDialog() {
   });
 
   // 🆕 Use useSafeUser hook to get current user data
-  const { user } = useSafeUser();
+  const { user } = useSafeUser({ sections: 'paint' });
 
   // 🆕 Load defaults from user whenever user changes or dialog opens
   React.useEffect(() => {
@@ -25,12 +25,12 @@ import {
 } from "@/components/ui/table";
 import { Checkbox } from "@/components/ui/checkbox";
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogFooter } from "@/components/ui/dialog";
-import { useUser } from '@/components/utils/UserContext';
+import { useUserSections } from '@/components/utils/UserContext';
 import { supabase } from '@/lib/supabase';
 import { userProfileAPI } from '@/lib/api';
 
 export default function PaintSimulator({ onAddToQuote }) {
-  const { user } = useUser();
+  const { user } = useUserSections();
   const [settings, setSettings] = useState({
     additionalLayerDiscount: 15, // אחוז הנחה לשכבות נוספות
     baseLaborCost: 60, // עלות עבודה בסיסית למ"ר
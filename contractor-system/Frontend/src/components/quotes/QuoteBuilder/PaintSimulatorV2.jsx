@@ -8,14 +8,14 @@ import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@
 import { Paintbrush, Plus, Layers, ChevronDown, ChevronUp, Trash2, Calculator } from 'lucide-react';
 import { Collapsible, CollapsibleContent, CollapsibleTrigger } from "@/components/ui/collapsible";
 import RoomEstimatesCalculator from './RoomEstimatesCalculator';
-import { useUser } from '@/components/utils/UserContext';
+import { useUserSections } from '@/components/utils/UserContext';
 
 export default function PaintSimulatorV2({
   onAddItemToQuote,
   projectComplexities,
   onUpdateRoomBreakdown,
 }) {
-  const { user: ctxUser } = useUser();
+  const { user: ctxUser } = useUserSections();
   const [user, setUser] = React.useState(null);
   const [paintItems, setPaintItems] = React.useState([]);
 
@@ -17,7 +17,7 @@ import { cn } from "@/lib/utils";
 import PlumbingItemDialog from "./PlumbingItemDialog";
 import { getCategoryTheme } from "./categoryTheme";
 import CategoryFloatingAddButton from './CategoryFloatingAddButton';
-import { supabase } from "@/lib/supabase";
+import { pricebookAPI } from "@/lib/api";
 
 const SUBCATS = [
   { key: "infrastructure", label: "תשתיות וצנרת" },
@@ -68,20 +68,11 @@ export default function PlumbingCategory({
     const loadPlumbingData = async () => {
       setLoading(true);
       try {
-        console.log('[PlumbingCategory] Loading plumbing data from user_profiles');
-
-        // Load data from user_profiles table
-        const { data: profile, error: profileError } = await supabase
-          .from('user_profiles')
-          .select('plumbing_defaults, plumbing_subcontractor_items')
-          .eq('auth_user_id', currentUser.id)
-          .single();
-
-        if (profileError) {
-          console.error('[PlumbingCategory] Error loading plumbing data:', profileError);
-          setLoading(false);
-          return;
-        }
+        console.log('[PlumbingCategory] Loading plumbing data from the pricebook API');
+
+        // Read through the backend, which fills in columns inherited from the shared default pricebook
+        const section = await pricebookAPI.get('plumbing');
+        const profile = { plumbing_defaults: section.defaults, plumbing_subcontractor_items: section.items };
 
         const plumbingItems = profile?.plumbing_subcontractor_items || [];
         const plumbingDefaults = profile?.plumbing_defaults || { desiredProfitPercent: 30 };
@@ -368,6 +359,7 @@ export default function PlumbingCategory({
       categoryId,
       categoryName: "אינסטלציה",
       source: it.source || "plumbing_catalog",
+      pricebookItemId: it.id, // lets the backend re-price drafts when this pricebook item changes
       description: (it.name || "") + (it.description ? ` — ${it.description}` : ""),
       quantity: q, // This now correctly reflects the actual quantity
       unit,
@@ -19,7 +19,7 @@ import {
 } from "@/components/ui/select";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
-import { useUser } from '@/components/utils/UserContext';
+import { useUserSections } from '@/components/utils/UserContext';
 import { supabase } from '@/lib/supabase';
 import { userProfileAPI } from '@/lib/api';
 import { 
@@ -151,7 +151,7 @@ const getRoomSizeStyles = (size) => {
 };
 
 export default function RoomEstimatesCalculator({ isOpen, onClose, onCalculate, workType = '', initialRoomData, paintItemData, plasterItemData, userDefaults }) {
-  const { user } = useUser();
+  const { user } = useUserSections();
   const [roomEstimatesData, setRoomEstimatesData] = useState([]);
   const [loading, setLoading] = useState(true);
   const [calculatedArea, setCalculatedArea] = useState(0);
@@ -10,7 +10,7 @@ import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@
 import { Check, Calculator, Plus, Settings, Package, TrendingUp, Loader2 } from 'lucide-react'; // Added Package, TrendingUp, and Loader2
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogFooter } from "@/components/ui/dialog";
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
-import { useUser } from '@/components/utils/UserContext';
+import { useUserSections } from '@/components/utils/UserContext';
 import {
   Table,
   TableBody,
@@ -37,7 +37,7 @@ export default function TilingSimulator({
     categoryTimings = {}, // Ensure default value to prevent undefined errors
     onCategoryTimingChange
 }) {
-  const { user } = useUser();
+  const { user } = useUserSections();
   // NEW: internal loading state
   const [isLoadingData, setIsLoadingData] = useState(true);
 
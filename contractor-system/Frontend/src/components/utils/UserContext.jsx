@@ -1,7 +1,7 @@
 
 import React, { createContext, useEffect, useContext } from 'react';
 import { supabase } from '@/lib/supabase';
-import { useUserStore } from '@/stores/userStore';
+import { useUserStore, PROFILE_DETAIL_SECTIONS } from '@/stores/userStore';
 
 const UserContext = createContext({ user: null, loading: true, error: null, isOnline: true, refresh: () => {} });
 
@@ -41,3 +41,23 @@ export const UserProvider = ({ children }) => {
 };
 
 export const useUser = () => useContext(UserContext);
+
+// useUser() for components that read the profile sections in user_metadata
+// (pricebook items and defaults, commitments, company, quote settings). They
+// are fetched on first use rather than with the identity; until they arrive
+// `user` is null and `loading` true, so pages don't act on empty data.
+export const useUserSections = (sections = PROFILE_DETAIL_SECTIONS) => {
+  const context = useUser();
+  const loadSections = useUserStore((state) => state.loadSections);
+  const loaded = useUserStore((state) =>
+    sections.split(',').every((name) => state.loadedSections.includes(name.trim()))
+  );
+  const userId = context.user?.id;
+
+  useEffect(() => {
+    if (userId) loadSections(sections);
+  }, [userId, sections, loadSections]);
+
+  if (!context.user || loaded) return context;
+  return { ...context, user: null, loading: true };
+};
@@ -14,6 +14,8 @@ const CACHE_KEY = "b44_user_cache_v2"; // v2: Added additional_cost_defaults sup
  * - מזהה אופליין ומציג cache (אם קיים) במקום להפיל את האפליקציה
  * - לא "זורק" שגיאות החוצה – מחזיר error state בלבד
  * - משתמש ב-Supabase Auth במקום User.me()
+ * - options.sections: profile sections to load (GET /api/auth/me?sections=, e.g.
+ *   'paint' or 'quote_settings'); the compact identity without it
  */
 export default function useSafeUser(options = {}) {
   const {
@@ -21,7 +23,9 @@ export default function useSafeUser(options = {}) {
     retryDelayMs = 1000,
     enableCache = true,
     suppressConsole = false,
+    sections,
   } = options;
+  const cacheKey = sections ? `${CACHE_KEY}:${sections}` : CACHE_KEY;
 
   const [user, setUser] = useState(null);
   const [loading, setLoading] = useState(true);
@@ -36,7 +40,7 @@ export default function useSafeUser(options = {}) {
   const loadFromCache = () => {
     if (!enableCache) return null;
     try {
-      const raw = localStorage.getItem(CACHE_KEY);
+      const raw = localStorage.getItem(cacheKey);
       if (!raw) return null;
       return JSON.parse(raw);
     } catch {
@@ -47,7 +51,7 @@ export default function useSafeUser(options = {}) {
   const saveToCache = (u) => {
     if (!enableCache) return;
     try {
-      localStorage.setItem(CACHE_KEY, JSON.stringify(u || null));
+      localStorage.setItem(cacheKey, JSON.stringify(u || null));
     } catch {}
   };
 
@@ -93,7 +97,7 @@ export default function useSafeUser(options = {}) {
         if (supabaseUser) {
           try {
             // Call backend API - bypasses PostgREST/RLS issues completely
-            profileData = await userAPI.me();
+            profileData = await userAPI.me(sections ? { sections } : undefined);
 
             // Only log errors, not successful operations
             if (!suppressConsole && !profileData) {
@@ -374,10 +374,25 @@ export const api = new APIClient();
 // NOTE: quotes router uses trailing slashes for root paths (/api/quotes/) but not for parameter paths (/api/quotes/{id})
 export const quotesAPI = {
   list: (params) => api.get('/api/quotes/', params),
+  // Counts per status, total and average value (no need to load every quote)
+  summary: () => api.get('/api/quotes/summary'),
   get: (id) => api.get(`/api/quotes/${id}`),
   create: (data) => api.post('/api/quotes/', data),
   update: (id, data) => api.put(`/api/quotes/${id}`, data),
+  // JSON Patch ops on the JSONB columns, e.g. [{ op: 'replace', path: '/items/3/quantity', value: 2 }]
+  patch: (id, ops) => api.patch(`/api/quotes/${id}`, ops),
   delete: (id) => api.delete(`/api/quotes/${id}`),
+  // Copy as a new draft; overrides: { title, client_*, project_* } (optional)
+  duplicate: (id, overrides = {}) => api.post(`/api/quotes/${id}/duplicate`, overrides),
+  // Totals preview (server-side pricing) - send items, project_complexities (additionalCostDetails), discount_percent, price_increase, tax_percentage
+  price: (data) => api.post('/api/quotes/price', data),
+};
+
+// Ranked search ({ q, skip, limit } -> { results, has_more }); Hebrew-aware, phone numbers in any format
+export const searchAPI = {
+  quotes: (params) => api.get('/api/search/quotes', params),
+  clients: (params) => api.get('/api/search/clients', params),
+  catalog: (params) => api.get('/api/search/catalog', params),
 };
 
 export const clientsAPI = {
@@ -411,6 +426,8 @@ export const templatesAPI = {
   create: (data) => api.post('/api/templates/', data),
   update: (id, data) => api.put(`/api/templates/${id}`, data),
   delete: (id) => api.delete(`/api/templates/${id}`),
+  // New draft quote from the template; overrides as for quotesAPI.duplicate
+  instantiate: (id, overrides = {}) => api.post(`/api/templates/${id}/instantiate`, overrides),
 };
 
 export const financialAPI = {
@@ -443,6 +460,20 @@ export const contractorPricingAPI = {
   delete: (id) => api.delete(`/api/contractor-pricing/${id}`),
 };
 
+// Pricebook sections: plumbing, electrical, construction, demolition, tiling, paint.
+// Read and write them here rather than through user_profiles: the backend fills in
+// columns inherited from the shared default pricebook and keeps its profile cache current.
+export const pricebookAPI = {
+  // { [section]: { version, items, defaults } } for a comma-separated list (default: all)
+  list: (sections) => api.get('/api/pricebook/', sections ? { sections } : {}),
+  // { version, items, defaults }
+  get: (section) => api.get(`/api/pricebook/${section}`),
+  // Either or both of { items, defaults }, replaced in one write
+  update: (section, data) => api.put(`/api/pricebook/${section}`, data),
+  // Item ops applied atomically, e.g. [{ op: 'update', id, item: { clientPrice: 120 } }]
+  patchItems: (section, ops) => api.patch(`/api/pricebook/${section}/items`, { ops }),
+};
+
 export const inquiriesAPI = {
   list: (params) => api.get('/api/inquiries/', params),
   get: (id) => api.get(`/api/inquiries/${id}`),
@@ -452,7 +483,8 @@ export const inquiriesAPI = {
 };
 
 export const userAPI = {
-  me: () => api.get('/api/auth/me'),
+  // Compact identity core by default; pass { sections: 'pricebook,company' } or 'all' for more
+  me: (params) => api.get('/api/auth/me', params),
   updateProfile: (data) => api.patch('/api/auth/me', data),
   register: (data) => api.post('/api/auth/register', data),
   login: (data) => api.post('/api/auth/login', data),
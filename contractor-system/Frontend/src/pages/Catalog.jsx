@@ -3,7 +3,7 @@ import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { createPageUrl } from '@/utils';
 import { User } from '@/lib/entities';
-import { useUser } from '@/components/utils/UserContext';
+import { useUserSections } from '@/components/utils/UserContext';
 import { supabase } from '@/lib/supabase';
 import {
   Calculator,
@@ -561,7 +561,7 @@ const TilingForm = ({ item, onSave, onCancel }) => {
 
 
 export default function Catalog() {
-  const { user, loading: userLoading } = useUser();
+  const { user, loading: userLoading } = useUserSections();
   const [items, setItems] = useState([]);
   const [loading, setLoading] = useState(true);
   const [searchQuery, setSearchQuery] = useState('');
@@ -16,13 +16,12 @@ import RoomEstimatesSettings from '@/components/costCalculator/RoomEstimatesSett
 import TilingDefaultsSettings from '@/components/costCalculator/TilingDefaultsSettings';
 import TilingQuickDefaults from '@/components/costCalculator/TilingQuickDefaults';
 import PaintQuickDefaults from '@/components/costCalculator/PaintQuickDefaults';
-import { supabase } from '@/lib/supabase';
-import { userProfileAPI } from '@/lib/api';
+import { userProfileAPI, pricebookAPI } from '@/lib/api';
 import { Category, User } from '@/lib/entities';
 import { cn } from '@/lib/utils';
 import CategorySwitcher from "@/components/common/CategorySwitcher";
 import { Popover, PopoverContent, PopoverTrigger } from "@/components/ui/popover";
-import { useUser } from '@/components/utils/UserContext';
+import { useUserSections } from '@/components/utils/UserContext';
 
 // Consts
 const PAINT_TYPES = [
@@ -142,7 +141,7 @@ const DEFAULT_PAINT_ITEMS = [
 export default function CostCalculator() {
     const navigate = useNavigate();
     const location = useLocation();
-    const { user: userData, loading: userLoading } = useUser();
+    const { user: userData, loading: userLoading } = useUserSections();
 
     // State management
     const [activeTab, setActiveTab] = useState(null); // 'tiling', 'paint_plaster', or null for landing
@@ -737,19 +736,8 @@ export default function CostCalculator() {
         try {
             console.log('[CostCalculator] 💾 Saving advanced tiling defaults to user_profiles:', defaults);
 
-            // ✅ FIXED: Save to user_profiles table instead of user_metadata
-            const { error } = await supabase
-                .from('user_profiles')
-                .update({
-                    tiling_user_defaults: defaults
-                })
-                .eq('auth_user_id', userData.id);
-
-            if (error) {
-                console.error('[CostCalculator] ❌ Error saving tiling defaults:', error);
-                alert('שגיאה בשמירת ברירות המחדל: ' + error.message);
-                return;
-            }
+            // Save through the pricebook API (keeps the backend's profile cache current)
+            await pricebookAPI.update('tiling', { defaults: defaults });
 
             console.log('[CostCalculator] ✅ Advanced tiling defaults saved successfully');
             setUserTilingDefaults(defaults);
@@ -772,20 +760,9 @@ export default function CostCalculator() {
 
         console.log('[CostCalculator] 🔀 Merged tiling data:', merged);
 
-        // ✅ FIXED: Save to user_profiles table instead of user_metadata
+        // Save through the pricebook API (keeps the backend's profile cache current)
         try {
-            const { error } = await supabase
-                .from('user_profiles')
-                .update({
-                    tiling_user_defaults: merged
-                })
-                .eq('auth_user_id', userData.id);
-
-            if (error) {
-                console.error('[CostCalculator] ❌ Error saving tiling defaults:', error);
-                alert('שגיאה בשמירת הגדרות ריצוף: ' + error.message);
-                return;
-            }
+            await pricebookAPI.update('tiling', { defaults: merged });
 
             console.log('[CostCalculator] ✅ Tiling defaults saved successfully to user_profiles');
         } catch (error) {
@@ -851,20 +828,9 @@ export default function CostCalculator() {
 
         console.log('[CostCalculator] 💾 Saving paint defaults to user_profiles:', merged);
 
-        // ✅ FIXED: Save to user_profiles table instead of user_metadata
+        // Save through the pricebook API (keeps the backend's profile cache current)
         try {
-            const { error } = await supabase
-                .from('user_profiles')
-                .update({
-                    paint_user_defaults: merged
-                })
-                .eq('auth_user_id', userData.id);
-
-            if (error) {
-                console.error('[CostCalculator] ❌ Error saving paint defaults:', error);
-                alert('שגיאה בשמירת הגדרות: ' + error.message);
-                return;
-            }
+            await pricebookAPI.update('paint', { defaults: merged });
 
             console.log('[CostCalculator] ✅ Paint defaults saved successfully');
             setUserPaintDefaults(merged);
@@ -1155,14 +1121,12 @@ export default function CostCalculator() {
                     }
                 }
 
-                // ✅ FIX: Load user defaults from user_profiles table (same as PriceBookSettings)
-                const { data: profile, error: profileError } = await supabase
-                    .from('user_profiles')
-                    .select('*')
-                    .eq('auth_user_id', userData.id)
-                    .single();
-
-                if (profileError) {
+                // Load user defaults through the pricebook API (fills in the shared defaults for inherited sections)
+                let profile = null;
+                try {
+                    const sections = await pricebookAPI.list('tiling,paint');
+                    profile = { tiling_user_defaults: sections.tiling?.defaults, paint_user_defaults: sections.paint?.defaults };
+                } catch (profileError) {
                     console.error('Error loading profile:', profileError);
                 }
 
@@ -3,9 +3,8 @@ import React, { useState, useEffect, useCallback } from 'react';
 import { useNavigate } from 'react-router-dom';
 import CategorySwitcher from "@/components/common/CategorySwitcher";
 import { createPageUrl } from '@/utils';
-import { supabase } from '@/lib/supabase';
-import { userProfileAPI } from '@/lib/api';
-import { useUser } from '@/components/utils/UserContext';
+import { userProfileAPI, pricebookAPI } from '@/lib/api';
+import { useUserSections } from '@/components/utils/UserContext';
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
@@ -314,7 +313,7 @@ const DemolitionItemForm = ({ isOpen, onClose, onSubmit, itemToEdit, defaults })
 // Main Component
 export default function DemolitionCalculator() {
     const navigate = useNavigate();
-    const { user, loading: userLoading } = useUser();
+    const { user, loading: userLoading } = useUserSections();
     const [demolitionItems, setDemolitionItems] = useState([]);
     const [demolitionDefaults, setDemolitionDefaults] = useState(null);
     const [loading, setLoading] = useState(true);
@@ -351,14 +350,12 @@ export default function DemolitionCalculator() {
 
             setLoading(true);
             try {
-                // ✅ FIX: Load from user_profiles table (same as PriceBookSettings)
-                const { data: profile, error: profileError } = await supabase
-                    .from('user_profiles')
-                    .select('*')
-                    .eq('auth_user_id', user.id)
-                    .single();
-
-                if (profileError) {
+                // Read through the backend, which fills in columns inherited from the shared default pricebook
+                let profile = null;
+                try {
+                    const section = await pricebookAPI.get('demolition');
+                    profile = { demolition_defaults: section.defaults };
+                } catch (profileError) {
                     console.error('Error loading profile:', profileError);
                 }
 
@@ -7,7 +7,7 @@ import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
 import { Separator } from '@/components/ui/separator';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
-import { useUser } from '@/components/utils/UserContext';
+import { useUserSections } from '@/components/utils/UserContext';
 import {
   Select,
   SelectContent,
@@ -45,7 +45,7 @@ import { supabase } from '@/lib/supabase';
 
 export default function PaintCalculator() {
   const navigate = useNavigate();
-  const { user, loading: userLoading } = useUser();
+  const { user, loading: userLoading } = useUserSections();
   const [loading, setLoading] = useState(true);
   const [calculations, setCalculations] = useState([]);
   const [currentCalculation, setCurrentCalculation] = useState({
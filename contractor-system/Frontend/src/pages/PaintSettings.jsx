@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { supabase } from '@/lib/supabase';
 import { userProfileAPI } from '@/lib/api';
-import { useUser } from '@/components/utils/UserContext';
+import { useUserSections } from '@/components/utils/UserContext';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
@@ -21,7 +21,7 @@ const parseNumber = (value) => {
 };
 
 export default function PaintSettings() {
-    const { user, loading: userLoading } = useUser();
+    const { user, loading: userLoading } = useUserSections();
     const [paintItems, setPaintItems] = useState([]);
     const [isLoading, setIsLoading] = useState(true);
     const [isSaving, setIsSaving] = useState(false);
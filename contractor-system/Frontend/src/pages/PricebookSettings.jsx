@@ -1,7 +1,7 @@
 
 import React, { useEffect, useState, useMemo, useCallback } from "react";
-import { useUser } from '@/components/utils/UserContext';
-import { supabase } from '@/lib/supabase';
+import { useUserSections } from '@/components/utils/UserContext';
+import { userAPI, userProfileAPI } from '@/lib/api';
 import { User } from '@/lib/entities';
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card";
 import { Input } from "@/components/ui/input";
@@ -37,7 +37,7 @@ const CATS = [
 ];
 
 export default function PricebookSettings() {
-  const { user, loading: userLoading } = useUser();
+  const { user, loading: userLoading } = useUserSections();
   const [loading, setLoading] = useState(true);
 
   const [generalSettings, setGeneralSettings] = useState({
@@ -144,14 +144,12 @@ export default function PricebookSettings() {
     (async () => {
       setLoading(true);
 
-      // Fetch user profile from user_profiles table
-      const { data: profile, error } = await supabase
-        .from('user_profiles')
-        .select('*')
-        .eq('auth_user_id', user.id)
-        .single();
-
-      if (error) {
+      // Fetch the whole profile through the backend, which fills in columns
+      // inherited from the shared default pricebook
+      let profile;
+      try {
+        profile = await userAPI.me({ sections: 'all' });
+      } catch (error) {
         console.error('Error loading profile:', error);
         setLoading(false);
         return;
@@ -449,24 +447,19 @@ export default function PricebookSettings() {
     };
 
     try {
-      // Update user profile in user_profiles table
-      const { error } = await supabase
-        .from('user_profiles')
-        .update({
-          desired_daily_profit: payload.desiredDailyProfit || null,
-          paint_user_defaults: payload.paintUserDefaults,
-          tiling_user_defaults: payload.tilingUserDefaults,
-          demolition_defaults: payload.demolitionDefaults,
-          construction_defaults: payload.constructionDefaults,
-          plumbing_defaults: payload.plumbingDefaults,
-          electrical_defaults: payload.electricalDefaults,
-          additional_cost_defaults: payload.additionalCostDefaults,
-          pricebook_general_notes: payload.pricebookGeneralNotes,
-          category_active_map: payload.categoryActiveMap,
-        })
-        .eq('auth_user_id', user.id);
-
-      if (error) throw error;
+      // Update user profile through the backend (keeps its profile cache current)
+      await userProfileAPI.updateMe({
+        desired_daily_profit: payload.desiredDailyProfit || null,
+        paint_user_defaults: payload.paintUserDefaults,
+        tiling_user_defaults: payload.tilingUserDefaults,
+        demolition_defaults: payload.demolitionDefaults,
+        construction_defaults: payload.constructionDefaults,
+        plumbing_defaults: payload.plumbingDefaults,
+        electrical_defaults: payload.electricalDefaults,
+        additional_cost_defaults: payload.additionalCostDefaults,
+        pricebook_general_notes: payload.pricebookGeneralNotes,
+        category_active_map: payload.categoryActiveMap,
+      });
 
       // Check if worker cost or profit percent changed for paint items
       if (paintItems.length > 0 && (payload.paintUserDefaults.workerDailyCost || payload.paintUserDefaults.desiredProfitPercent)) {
@@ -56,7 +56,7 @@ import ManualCalcInjector from "@/components/quotes/QuoteBuilder/ManualCalcInjec
 import ShareQuoteDialog from "@/components/quotes/QuoteBuilder/ShareQuoteDialog";
 import ItemsDebugPanel from '@/components/utils/ItemsDebugPanel';
 import ErrorBoundary from '@/components/utils/ErrorBoundary';
-import { useUser } from '@/components/utils/UserContext';
+import { useUserSections } from '@/components/utils/UserContext';
 import CategoryStepper from '@/components/quotes/QuoteBuilder/CategoryStepper';
 import QuotePreviewSnapshot from '@/components/quotes/QuoteBuilder/QuotePreviewSnapshot';
 import ContractorCostBreakdown from '@/components/quotes/QuoteBuilder/ContractorCostBreakdown';
@@ -433,7 +433,7 @@ function PersistedStep3({
 export default function QuoteCreate() {
   const navigate = useNavigate();
   const location = useLocation();
-  const { user, refresh: refreshUser } = useUser();
+  const { user, loading: userLoading, refresh: refreshUser } = useUserSections();
   const [currentUser, setCurrentUser] = useState(null);
   const [isLoadingUser, setIsLoadingUser] = useState(true); // Renamed from 'isLoading'
   const [currentStep, setCurrentStep] = useState(1);
@@ -1359,7 +1359,8 @@ export default function QuoteCreate() {
 
 
   useEffect(() => {
-    if (didInitRef.current) return;
+    // Wait for the profile sections (commitments, payment terms, tiling items)
+    if (didInitRef.current || userLoading) return;
     didInitRef.current = true;
 
     const fetchUser = async () => {
@@ -1396,7 +1397,7 @@ export default function QuoteCreate() {
       }
     };
     fetchUser();
-  }, [user, loadExistingQuote, resetQuoteData, setPaymentTerms, setIsLoadingUser, setCurrentUser, setCategoryCommitments, setTilingWorkTypes, setUserTilingItems]);
+  }, [user, userLoading, loadExistingQuote, resetQuoteData, setPaymentTerms, setIsLoadingUser, setCurrentUser, setCategoryCommitments, setTilingWorkTypes, setUserTilingItems]);
 
   // REMOVED: visibilitychange handler that was causing data loss when minimizing tab
   // The useSafeUser hook already handles connectivity with online/offline events
@@ -6,6 +6,54 @@ const CACHE_KEY = "b44_user_cache_v2"; // Changed from v1 to v2 to invalidate ol
 const MAX_RETRIES = 3;
 const RETRY_DELAY_MS = 1000;
 
+// GET /api/auth/me?sections= groups behind user_metadata. The identity load
+// uses the compact default /me; pages that need these call useUserSections()
+export const PROFILE_DETAIL_SECTIONS = 'pricebook,commitments,company,quote_settings';
+
+// user_metadata key -> [profile column, value when missing]
+const USER_METADATA_FIELDS = {
+  paintItems: ['paint_items', []],
+  tilingItems: ['tiling_items', []],
+  roomEstimates: ['room_estimates', []],
+  paintUserDefaults: ['paint_user_defaults', {}],
+  tilingUserDefaults: ['tiling_user_defaults', {}],
+  customPaintTypes: ['custom_paint_types', null],
+  customPlasterTypes: ['custom_plaster_types', null],
+  constructionDefaults: ['construction_defaults', {}],
+  constructionSubcontractorItems: ['construction_subcontractor_items', []],
+  electricalDefaults: ['electrical_defaults', {}],
+  electricalSubcontractorItems: ['electrical_subcontractor_items', []],
+  plumbingDefaults: ['plumbing_defaults', {}],
+  plumbingSubcontractorItems: ['plumbing_subcontractor_items', []],
+  demolitionItems: ['demolition_items', []],
+  demolitionDefaults: ['demolition_defaults', {}],
+  // ✅ ADD: Missing commitment and company data for quotes
+  contractorCommitments: ['contractor_commitments', ''],
+  clientCommitments: ['client_commitments', ''],
+  companyInfo: ['company_info', {}],
+  categoryCommitments: ['category_commitments', {}],
+  categoryActiveMap: ['category_active_map', {}],
+  tilingWorkTypes: ['tiling_work_types', []],
+  defaultPaymentTerms: ['default_payment_terms', []],
+};
+
+// user_metadata from the profile columns present in profileData (all keys, with
+// their empty values, when `complete`)
+const toUserMetadata = (profileData, complete = false) => {
+  const metadata = {};
+  for (const [key, [column, missing]] of Object.entries(USER_METADATA_FIELDS)) {
+    if (complete || (profileData && column in profileData)) {
+      metadata[key] = profileData?.[column] || missing;
+    }
+  }
+  return metadata;
+};
+
+const splitSections = (sections) => sections.split(',').map((s) => s.trim()).filter(Boolean);
+
+// Section loads in flight, by section name
+const pendingSections = new Map();
+
 function sleep(ms) {
   return new Promise((r) => setTimeout(r, ms));
 }
@@ -35,6 +83,8 @@ export const useUserStore = create((set, get) => ({
   isOnline: typeof navigator !== "undefined" ? navigator.onLine : true,
   attempts: 0,
   initialized: false,
+  // Profile sections merged into user_metadata so far (see loadSections)
+  loadedSections: [],
 
   // Actions
   setUser: (user) => {
@@ -52,7 +102,8 @@ export const useUserStore = create((set, get) => ({
     set({
       user: null,
       error: null,
-      loading: false
+      loading: false,
+      loadedSections: []
     });
     saveToCache(null);
   },
@@ -101,7 +152,9 @@ export const useUserStore = create((set, get) => ({
         let profileData = null;
         if (supabaseUser) {
           try {
-            profileData = await userAPI.me();
+            // Compact identity; on a refresh also the sections pages have loaded since
+            const { loadedSections } = get();
+            profileData = await userAPI.me(loadedSections.length ? { sections: loadedSections.join(',') } : undefined);
 
             if (!profileData) {
               console.warn('[userStore] Profile is NULL from backend API', supabaseUser.id);
@@ -120,31 +173,7 @@ export const useUserStore = create((set, get) => ({
           role: profileData?.role || 'user',
           isActive: profileData?.is_active !== false,
           created_at: supabaseUser.created_at,
-          user_metadata: {
-            paintItems: profileData?.paint_items || [],
-            tilingItems: profileData?.tiling_items || [],
-            roomEstimates: profileData?.room_estimates || [],
-            paintUserDefaults: profileData?.paint_user_defaults || {},
-            tilingUserDefaults: profileData?.tiling_user_defaults || {},
-            customPaintTypes: profileData?.custom_paint_types || null,
-            customPlasterTypes: profileData?.custom_plaster_types || null,
-            constructionDefaults: profileData?.construction_defaults || {},
-            constructionSubcontractorItems: profileData?.construction_subcontractor_items || [],
-            electricalDefaults: profileData?.electrical_defaults || {},
-            electricalSubcontractorItems: profileData?.electrical_subcontractor_items || [],
-            plumbingDefaults: profileData?.plumbing_defaults || {},
-            plumbingSubcontractorItems: profileData?.plumbing_subcontractor_items || [],
-            demolitionItems: profileData?.demolition_items || [],
-            demolitionDefaults: profileData?.demolition_defaults || {},
-            // ✅ ADD: Missing commitment and company data for quotes
-            contractorCommitments: profileData?.contractor_commitments || '',
-            clientCommitments: profileData?.client_commitments || '',
-            companyInfo: profileData?.company_info || {},
-            categoryCommitments: profileData?.category_commitments || {},
-            categoryActiveMap: profileData?.category_active_map || {},
-            tilingWorkTypes: profileData?.tiling_work_types || [],
-            defaultPaymentTerms: profileData?.default_payment_terms || []
-          }
+          user_metadata: toUserMetadata(profileData, true)
         } : null;
 
         set({
@@ -234,6 +263,39 @@ export const useUserStore = create((set, get) => ({
     };
   },
 
+  // Merge profile sections (GET /api/auth/me?sections=) into user_metadata,
+  // once per section; a failed load falls back to the cached user's data
+  loadSections: async (sections = PROFILE_DETAIL_SECTIONS) => {
+    const { user, loadedSections } = get();
+    if (!user) return;
+
+    const names = splitSections(sections);
+    const missing = names.filter((name) => !loadedSections.includes(name) && !pendingSections.has(name));
+    if (missing.length) {
+      const request = (async () => {
+        let metadata;
+        try {
+          metadata = toUserMetadata(await userAPI.me({ sections: missing.join(',') }));
+        } catch (err) {
+          console.error('[userStore] Failed to load profile sections:', err.message || err);
+          const cached = loadFromCache();
+          metadata = cached?.id === user.id ? cached.user_metadata : {};
+        }
+
+        const current = get().user;
+        if (current?.id === user.id) {
+          const merged = { ...current, user_metadata: { ...current.user_metadata, ...metadata } };
+          set({ user: merged, loadedSections: [...new Set([...get().loadedSections, ...missing])] });
+          saveToCache(merged);
+        }
+      })();
+      missing.forEach((name) => pendingSections.set(name, request));
+      request.finally(() => missing.forEach((name) => pendingSections.delete(name)));
+    }
+
+    await Promise.all(names.map((name) => pendingSections.get(name)).filter(Boolean));
+  },
+
   // Manual refresh
   refresh: () => {
     get().fetchUser();